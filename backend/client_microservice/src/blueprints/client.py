@@ -5,6 +5,7 @@ from ..commands.view_all import GetAllClients
 from flask_cognito import cognito_auth_required, current_cognito_jwt, cognito_group_permissions
 from ..models.client import NewClientJsonSchema
 from ..errors.errors import ParamError, ApiError
+from ..utils.streaming import wants_ndjson, ndjson_response
 
 
 clients_blueprint = Blueprint("client", __name__)
@@ -45,6 +46,9 @@ def create_client():
 @cognito_auth_required
 def list_clients():
     try:
+        if wants_ndjson(request):
+            return ndjson_response(GetAllClients().stream())
+
         result = GetAllClients().execute()
         return jsonify(result), 200
     except ApiError as e:
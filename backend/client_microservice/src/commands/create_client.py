@@ -1,4 +1,3 @@
-import boto3
 import re
 import hashlib
 import logging
@@ -6,7 +5,7 @@ from botocore.exceptions import ClientError
 from .base_command import BaseCommannd
 from ..utils.user_requests import create_user
 from ..errors.errors import ParamError, ApiError
-from ..models.db import REGION, TABLE_NAME, DYNAMODB_ENDPOINT
+from ..models.db import get_table
 
 logger = logging.getLogger(__name__)
 
@@ -23,21 +22,8 @@ class CreateClient(BaseCommannd):
         self.tax_id_encrypted = None
         self.cognito_id = None
 
-        # Inicializar conexión DynamoDB
-        if DYNAMODB_ENDPOINT:
-            logger.info(f"🔗 Conectando a DynamoDB local en {DYNAMODB_ENDPOINT}")
-            self.dynamodb = boto3.resource(
-                "dynamodb",
-                region_name=REGION,
-                endpoint_url=DYNAMODB_ENDPOINT,
-                aws_access_key_id="dummy",
-                aws_secret_access_key="dummy"
-            )
-        else:
-            logger.info(f"🌍 Conectando a DynamoDB real en AWS región {REGION}")
-            self.dynamodb = boto3.resource("dynamodb", region_name=REGION)
-
-        self.table = self.dynamodb.Table(TABLE_NAME)
+        # Conexión DynamoDB compartida por el worker
+        self.table = get_table()
 
     # ----------------------------------------------------------
     def execute(self):
@@ -82,3 +82,33 @@ class TestGetAllClientsCommand:
 
         with pytest.raises(ApiError, match="Error al obtener la lista de clientes"):
             command.fetch_all()
+
+    # 📤 Test: exportación en streaming página a página
+    @patch("boto3.resource")
+    def test_stream_recorre_todas_las_paginas(self, mock_dynamodb):
+        mock_table = MagicMock()
+        mock_dynamodb.return_value.Table.return_value = mock_table
+        mock_table.scan.side_effect = [
+            {"Items": [{"name": "B"}], "LastEvaluatedKey": {"id": "next"}},
+            {"Items": [{"name": "A"}]},
+        ]
+
+        stream = GetAllClients().stream()
+
+        # No se consulta DynamoDB hasta que se consume el generador
+        mock_table.scan.assert_not_called()
+        assert list(stream) == [{"name": "B"}, {"name": "A"}]
+        assert mock_table.scan.call_count == 2
+        mock_table.scan.assert_called_with(ExclusiveStartKey={"id": "next"})
+
+    # ⚡ Test: ClientError durante el streaming -> ApiError
+    @patch("boto3.resource")
+    def test_stream_lanza_apierror_en_falla(self, mock_dynamodb):
+        mock_table = MagicMock()
+        mock_dynamodb.return_value.Table.return_value = mock_table
+        mock_table.scan.side_effect = ClientError(
+            {"Error": {"Message": "Acceso denegado"}}, "Scan"
+        )
+
+        with pytest.raises(ApiError, match="Error al exportar la lista"):
+            list(GetAllClients().stream())
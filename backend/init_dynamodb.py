@@ -30,6 +30,14 @@ WAREHOUSES_TABLE = os.getenv("WAREHOUSES_TABLE", "Warehouses")
 ORDERS_TABLE = os.getenv("ORDERS_TABLE", "Orders")
 SALES_PLANS_TABLE = os.getenv("SALES_PLANS_TABLE", "SalesPlans")
 VISITS_TABLE = os.getenv("VISITS_TABLE", "Visits")
+VENDOR_SALES_ROLLUP_TABLE = os.getenv("VENDOR_SALES_ROLLUP_TABLE", "VendorSalesRollup")
+ORDER_IDEMPOTENCY_TABLE = os.getenv("ORDER_IDEMPOTENCY_TABLE", "OrderIdempotencyKeys")
+PROJECTOR_CHECKPOINTS_TABLE = os.getenv("PROJECTOR_CHECKPOINTS_TABLE", "ProjectorCheckpoints")
+PRODUCT_BULK_JOBS_TABLE = os.getenv("PRODUCT_BULK_JOBS_TABLE", "ProductBulkJobs")
+PROVIDER_BULK_JOBS_TABLE = os.getenv("PROVIDER_BULK_JOBS_TABLE", "ProviderBulkJobs")
+
+# Flujo de cambios que consume el proyector de ProductsMirror
+CHANGE_STREAM = {"StreamEnabled": True, "StreamViewType": "NEW_AND_OLD_IMAGES"}
 
 # Definición de tablas
 TABLES_CONFIG = {
@@ -47,11 +55,28 @@ TABLES_CONFIG = {
     },
     VENDORS_TABLE: {
         "AttributeDefinitions": [
-            {"AttributeName": "email", "AttributeType": "S"}
+            {"AttributeName": "email", "AttributeType": "S"},
+            {"AttributeName": "vendor_id", "AttributeType": "S"}
         ],
         "KeySchema": [
             {"AttributeName": "email", "KeyType": "HASH"}
         ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "vendor_id-index",
+                "KeySchema": [
+                    {"AttributeName": "vendor_id", "KeyType": "HASH"}
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["institutions"]
+                },
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 5,
+                    "WriteCapacityUnits": 5
+                }
+            }
+        ],
         "ProvisionedThroughput": {
             "ReadCapacityUnits": 5,
             "WriteCapacityUnits": 5
@@ -78,6 +103,7 @@ TABLES_CONFIG = {
             {"AttributeName": "warehouse", "KeyType": "HASH"},
             {"AttributeName": "sku", "KeyType": "RANGE"}
         ],
+        "StreamSpecification": CHANGE_STREAM,
         "ProvisionedThroughput": {
             "ReadCapacityUnits": 5,
             "WriteCapacityUnits": 5
@@ -85,11 +111,27 @@ TABLES_CONFIG = {
     },
     PRODUCTS_MIRROR_TABLE: {
         "AttributeDefinitions": [
-            {"AttributeName": "id", "AttributeType": "S"}
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "sku", "AttributeType": "S"},
+            {"AttributeName": "name", "AttributeType": "S"}
         ],
         "KeySchema": [
             {"AttributeName": "id", "KeyType": "HASH"}
         ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "sku-name-index",
+                "KeySchema": [
+                    {"AttributeName": "sku", "KeyType": "HASH"},
+                    {"AttributeName": "name", "KeyType": "RANGE"}
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 5,
+                    "WriteCapacityUnits": 5
+                }
+            }
+        ],
         "ProvisionedThroughput": {
             "ReadCapacityUnits": 5,
             "WriteCapacityUnits": 5
@@ -102,6 +144,7 @@ TABLES_CONFIG = {
         "KeySchema": [
             {"AttributeName": "id", "KeyType": "HASH"}
         ],
+        "StreamSpecification": CHANGE_STREAM,
         "ProvisionedThroughput": {
             "ReadCapacityUnits": 5,
             "WriteCapacityUnits": 5
@@ -109,11 +152,27 @@ TABLES_CONFIG = {
     },
     ORDERS_TABLE: {
         "AttributeDefinitions": [
-            {"AttributeName": "id", "AttributeType": "S"}
+            {"AttributeName": "id", "AttributeType": "S"},
+            {"AttributeName": "id_client", "AttributeType": "S"},
+            {"AttributeName": "created_at", "AttributeType": "S"}
         ],
         "KeySchema": [
             {"AttributeName": "id", "KeyType": "HASH"}
         ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "id_client-created_at-index",
+                "KeySchema": [
+                    {"AttributeName": "id_client", "KeyType": "HASH"},
+                    {"AttributeName": "created_at", "KeyType": "RANGE"}
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 5,
+                    "WriteCapacityUnits": 5
+                }
+            }
+        ],
         "ProvisionedThroughput": {
             "ReadCapacityUnits": 5,
             "WriteCapacityUnits": 5
@@ -121,11 +180,30 @@ TABLES_CONFIG = {
     },
     SALES_PLANS_TABLE: {
         "AttributeDefinitions": [
-            {"AttributeName": "plan_id", "AttributeType": "S"}
+            {"AttributeName": "plan_id", "AttributeType": "S"},
+            {"AttributeName": "vendor_id", "AttributeType": "S"},
+            {"AttributeName": "period", "AttributeType": "S"}
         ],
         "KeySchema": [
             {"AttributeName": "plan_id", "KeyType": "HASH"}
         ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "vendor_id-period-index",
+                "KeySchema": [
+                    {"AttributeName": "vendor_id", "KeyType": "HASH"},
+                    {"AttributeName": "period", "KeyType": "RANGE"}
+                ],
+                "Projection": {
+                    "ProjectionType": "INCLUDE",
+                    "NonKeyAttributes": ["products"]
+                },
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 5,
+                    "WriteCapacityUnits": 5
+                }
+            }
+        ],
         "ProvisionedThroughput": {
             "ReadCapacityUnits": 5,
             "WriteCapacityUnits": 5
@@ -133,11 +211,91 @@ TABLES_CONFIG = {
     },
     VISITS_TABLE: {
         "AttributeDefinitions": [
-            {"AttributeName": "visit_id", "AttributeType": "S"}
+            {"AttributeName": "visit_id", "AttributeType": "S"},
+            {"AttributeName": "vendor_id", "AttributeType": "S"},
+            {"AttributeName": "visit_datetime", "AttributeType": "S"}
         ],
         "KeySchema": [
             {"AttributeName": "visit_id", "KeyType": "HASH"}
         ],
+        "GlobalSecondaryIndexes": [
+            {
+                "IndexName": "vendor_id-visit_datetime-index",
+                "KeySchema": [
+                    {"AttributeName": "vendor_id", "KeyType": "HASH"},
+                    {"AttributeName": "visit_datetime", "KeyType": "RANGE"}
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+                "ProvisionedThroughput": {
+                    "ReadCapacityUnits": 5,
+                    "WriteCapacityUnits": 5
+                }
+            }
+        ],
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 5,
+            "WriteCapacityUnits": 5
+        }
+    },
+    VENDOR_SALES_ROLLUP_TABLE: {
+        "AttributeDefinitions": [
+            {"AttributeName": "id_vendor", "AttributeType": "S"},
+            {"AttributeName": "period", "AttributeType": "S"}
+        ],
+        "KeySchema": [
+            {"AttributeName": "id_vendor", "KeyType": "HASH"},
+            {"AttributeName": "period", "KeyType": "RANGE"}
+        ],
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 5,
+            "WriteCapacityUnits": 5
+        }
+    },
+    ORDER_IDEMPOTENCY_TABLE: {
+        "AttributeDefinitions": [
+            {"AttributeName": "key", "AttributeType": "S"}
+        ],
+        "KeySchema": [
+            {"AttributeName": "key", "KeyType": "HASH"}
+        ],
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 5,
+            "WriteCapacityUnits": 5
+        }
+    },
+    PROJECTOR_CHECKPOINTS_TABLE: {
+        "AttributeDefinitions": [
+            {"AttributeName": "source", "AttributeType": "S"},
+            {"AttributeName": "shard_id", "AttributeType": "S"}
+        ],
+        "KeySchema": [
+            {"AttributeName": "source", "KeyType": "HASH"},
+            {"AttributeName": "shard_id", "KeyType": "RANGE"}
+        ],
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 5,
+            "WriteCapacityUnits": 5
+        }
+    },
+    PRODUCT_BULK_JOBS_TABLE: {
+        "AttributeDefinitions": [
+            {"AttributeName": "job_id", "AttributeType": "S"}
+        ],
+        "KeySchema": [
+            {"AttributeName": "job_id", "KeyType": "HASH"}
+        ],
+        "ProvisionedThroughput": {
+            "ReadCapacityUnits": 5,
+            "WriteCapacityUnits": 5
+        }
+    },
+    PROVIDER_BULK_JOBS_TABLE: {
+        "AttributeDefinitions": [
+            {"AttributeName": "job_id", "AttributeType": "S"}
+        ],
+        "KeySchema": [
+            {"AttributeName": "job_id", "KeyType": "HASH"}
+        ],
         "ProvisionedThroughput": {
             "ReadCapacityUnits": 5,
             "WriteCapacityUnits": 5
@@ -145,6 +303,13 @@ TABLES_CONFIG = {
     }
 }
 
+# Atributo TTL (epoch en segundos) de las tablas que expiran ítems
+TTL_ATTRIBUTES = {
+    ORDER_IDEMPOTENCY_TABLE: "expires_at",
+    PRODUCT_BULK_JOBS_TABLE: "expires_at",
+    PROVIDER_BULK_JOBS_TABLE: "expires_at"
+}
+
 
 def get_dynamodb_client():
     """Crea cliente de DynamoDB con configuración local"""
@@ -213,6 +378,87 @@ def create_table(dynamodb, table_name, table_config):
             return False
 
 
+def wait_for_index(dynamodb, table_name, index_name):
+    """Espera a que un índice global quede activo"""
+    while True:
+        table = dynamodb.describe_table(TableName=table_name)["Table"]
+        indexes = table.get("GlobalSecondaryIndexes", [])
+        status = next((i["IndexStatus"] for i in indexes if i["IndexName"] == index_name), None)
+        if status == "ACTIVE":
+            return
+        time.sleep(2)
+
+
+def ensure_indexes(dynamodb, table_name, table_config):
+    """Crea los índices globales que falten en una tabla ya existente"""
+    expected = table_config.get("GlobalSecondaryIndexes", [])
+    if not expected:
+        return True
+
+    try:
+        table = dynamodb.describe_table(TableName=table_name)["Table"]
+        existing = {i["IndexName"] for i in table.get("GlobalSecondaryIndexes", [])}
+
+        for index in expected:
+            if index["IndexName"] in existing:
+                continue
+
+            logger.info(f"🚀 Creando índice {index['IndexName']} en {table_name}...")
+            key_names = {k["AttributeName"] for k in index["KeySchema"]}
+            dynamodb.update_table(
+                TableName=table_name,
+                AttributeDefinitions=[
+                    a for a in table_config["AttributeDefinitions"]
+                    if a["AttributeName"] in key_names
+                ],
+                GlobalSecondaryIndexUpdates=[{"Create": index}]
+            )
+            # DynamoDB solo permite crear un índice a la vez por tabla
+            wait_for_index(dynamodb, table_name, index["IndexName"])
+            logger.info(f"✅ Índice {index['IndexName']} creado en {table_name}")
+
+        return True
+
+    except ClientError as e:
+        logger.error(f"❌ Error al crear índices de {table_name}: {e}")
+        return False
+
+
+def ensure_ttl(dynamodb, table_name, attribute_name):
+    """Activa el TTL de una tabla si aún no está activo"""
+    try:
+        description = dynamodb.describe_time_to_live(TableName=table_name)["TimeToLiveDescription"]
+        if description.get("TimeToLiveStatus") in ("ENABLED", "ENABLING"):
+            return True
+
+        dynamodb.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": attribute_name}
+        )
+        logger.info(f"⏱️ TTL activado en {table_name} ({attribute_name})")
+        return True
+
+    except ClientError as e:
+        logger.error(f"❌ Error al activar el TTL de {table_name}: {e}")
+        return False
+
+
+def ensure_stream(dynamodb, table_name, stream_specification):
+    """Activa DynamoDB Streams en una tabla ya existente si aún no está activo"""
+    try:
+        table = dynamodb.describe_table(TableName=table_name)["Table"]
+        if table.get("StreamSpecification", {}).get("StreamEnabled"):
+            return True
+
+        dynamodb.update_table(TableName=table_name, StreamSpecification=stream_specification)
+        logger.info(f"🌊 Streams activado en {table_name}")
+        return True
+
+    except ClientError as e:
+        logger.error(f"❌ Error al activar Streams en {table_name}: {e}")
+        return False
+
+
 def init_all_tables():
     """Inicializa todas las tablas necesarias"""
     logger.info("🏁 Iniciando creación de tablas DynamoDB...")
@@ -226,14 +472,20 @@ def init_all_tables():
 
     for table_name, table_config in TABLES_CONFIG.items():
         if table_exists(dynamodb, table_name):
-            logger.info(f"ℹ️ La tabla {table_name} ya existe, saltando...")
-            success_count += 1
-            continue
+            logger.info(f"ℹ️ La tabla {table_name} ya existe, verificando índices...")
+            ready = ensure_indexes(dynamodb, table_name, table_config)
+            if ready and "StreamSpecification" in table_config:
+                ready = ensure_stream(dynamodb, table_name, table_config["StreamSpecification"])
+        else:
+            ready = create_table(dynamodb, table_name, table_config)
+            if not ready:
+                logger.error(f"❌ Falló la creación de la tabla {table_name}")
 
-        if create_table(dynamodb, table_name, table_config):
+        if ready and table_name in TTL_ATTRIBUTES:
+            ready = ensure_ttl(dynamodb, table_name, TTL_ATTRIBUTES[table_name])
+
+        if ready:
             success_count += 1
-        else:
-            logger.error(f"❌ Falló la creación de la tabla {table_name}")
 
     total_tables = len(TABLES_CONFIG)
     logger.info(f"📊 Resumen: {success_count}/{total_tables} tablas creadas/verificadas")
@@ -3,16 +3,31 @@ from datetime import date
 from flask import jsonify, Blueprint, request
 from ..commands.ping import PingCommand
 from ..models.order import NewOrderJsonSchema
-from ..errors.errors import ParamError, ApiError
+from ..errors.errors import ParamError, ApiError, ConflictError, InsufficientStockError
 from ..commands.create_order import CreateOrder
 from ..commands.view_all import GetAllOrders
 from ..commands.get_order_id import GetOrderById
 from ..commands.get_orders_by_client import GetOrdersByClient
+from ..utils.streaming import wants_ndjson, ndjson_response
 
 from flask_cognito import cognito_auth_required, current_cognito_jwt
 
 orders_blueprint = Blueprint("orders", __name__)
 
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def idempotency_key_from(req):
+    """Llave de idempotencia del request, acotada al usuario autenticado."""
+    key = (req.headers.get(IDEMPOTENCY_HEADER) or "").strip()
+    if not key:
+        return None
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        raise ParamError(f"El encabezado '{IDEMPOTENCY_HEADER}' admite máximo {MAX_IDEMPOTENCY_KEY_LENGTH} caracteres.")
+    caller = current_cognito_jwt.get("sub") or current_cognito_jwt.get("username") or ""
+    return f"{caller}#{key}"
+
 
 @orders_blueprint.get("/ping")
 def ping():
@@ -25,11 +40,17 @@ def create_order():
     try:
         json_data = request.get_json()
         NewOrderJsonSchema.check(json_data)
-        create_order_response = CreateOrder(json_data).execute()
-        return jsonify(create_order_response), 201
+        command = CreateOrder(json_data, idempotency_key=idempotency_key_from(request))
+        create_order_response = command.execute()
+        headers = {"Idempotent-Replayed": "true"} if command.replayed else {}
+        return jsonify(create_order_response), 201, headers
 
     except ParamError as e:
         return jsonify({"error": str(e)}), 400
+    except InsufficientStockError as e:
+        return jsonify({"error": str(e), "failed_lines": e.failed_lines}), 409
+    except ConflictError as e:
+        return jsonify({"error": str(e)}), 409
     except ApiError as e:
         return jsonify({"error": str(e)}), 500
     except Exception as e:
@@ -41,8 +62,16 @@ def create_order():
 @cognito_auth_required
 def get_all_orders():
     try:
-        orders = GetAllOrders().execute()
+        if wants_ndjson(request):
+            return ndjson_response(GetAllOrders().stream())
+
+        orders = GetAllOrders(
+            limit=request.args.get("limit"),
+            cursor=request.args.get("cursor"),
+        ).execute()
         return jsonify(orders), 200
+    except ParamError as e:
+        return jsonify({"error": str(e)}), 400
     except ApiError as e:
         return jsonify({"error": str(e)}), 500
     except Exception as e:
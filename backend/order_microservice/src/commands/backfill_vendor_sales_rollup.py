@@ -0,0 +1,45 @@
+"""
+Reconstruye VendorSalesRollup a partir de la tabla Orders:
+
+    python -m src.commands.backfill_vendor_sales_rollup
+
+Reemplaza los acumulados de cada vendedor con totales absolutos, así que se puede
+repetir sin duplicar. Las órdenes creadas mientras corre pueden quedar fuera o
+pisarse: se ejecuta con la creación de órdenes detenida (p. ej. justo después del despliegue).
+"""
+import logging
+from dotenv import load_dotenv
+
+# Los modelos leen la configuración de DynamoDB al importarse
+load_dotenv()
+
+from .base_command import BaseCommannd  # noqa: E402
+from ..errors.errors import ApiError  # noqa: E402
+from ..models.order import OrderModel  # noqa: E402
+from ..models.vendor_sales_rollup import VendorSalesRollupModel  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Solo los atributos que alimentan los acumulados
+ROLLUP_ATTRIBUTES = ["id", "id_vendor", "id_client", "products", "created_at"]
+
+
+class BackfillVendorSalesRollup(BaseCommannd):
+
+    def execute(self):
+        try:
+            logger.info("📊 Reconstruyendo acumulados de ventas por vendedor desde Orders...")
+            result = VendorSalesRollupModel.rebuild(OrderModel.scan(attributes_to_get=ROLLUP_ATTRIBUTES))
+            logger.info(
+                f"✅ Acumulados reconstruidos: {result['vendors']} vendedores, "
+                f"{result['written']} ítems escritos, {result['deleted']} eliminados"
+            )
+            return result
+        except Exception as e:
+            logger.error(f"❌ Error al reconstruir los acumulados: {e}")
+            raise ApiError(f"Error al reconstruir los acumulados: {str(e)}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    BackfillVendorSalesRollup().execute()
@@ -1,8 +1,9 @@
 import logging
 import datetime
 from .base_command import BaseCommannd
-from ..errors.errors import ApiError
+from ..errors.errors import ApiError, ParamError, ConflictError
 from ..models.order import OrderModel
+from ..models.idempotency_key import IdempotencyKeyModel, COMPLETED, request_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -10,10 +11,14 @@ logger = logging.getLogger(__name__)
 class CreateOrder(BaseCommannd):
     """
     Crea una nueva orden en DynamoDB.
+    Con `idempotency_key`, los reintentos de un mismo request devuelven la
+    respuesta original sin crear otra orden.
     """
 
-    def __init__(self, body: dict):
+    def __init__(self, body: dict, idempotency_key: str = None):
         self.body = body
+        self.idempotency_key = idempotency_key
+        self.replayed = False
 
     def execute(self):
         """Crea la orden usando los datos ya validados."""
@@ -24,16 +29,60 @@ class CreateOrder(BaseCommannd):
             if isinstance(self.body.get("date_estimated"), datetime.date):
                 self.body["date_estimated"] = self.body["date_estimated"].isoformat()
 
-            # Crear y guardar la orden
-            order = OrderModel.create(**self.body)
+            if not self.idempotency_key:
+                return self._create()
 
-            logger.info(f"✅ Orden creada correctamente: {order.id}")
+            request_hash = request_fingerprint(self.body)
 
-            return {
-                "message": "Orden creada exitosamente.",
-                "order": order.to_dict()
-            }
+            # Reintento: un GetItem y se devuelve la respuesta guardada
+            entry = IdempotencyKeyModel.find(self.idempotency_key)
+            # Una llave abandonada (lease vencido) se vuelve a reclamar con el mismo cuerpo
+            if entry is None or (entry.request_hash == request_hash and entry.lease_expired()):
+                claimed = IdempotencyKeyModel.claim(self.idempotency_key, request_hash)
+                if claimed is not None:
+                    return self._create_claimed(claimed)
+                # Otro request reclamó la llave entre la lectura y el put
+                entry = IdempotencyKeyModel.find(self.idempotency_key)
 
+            return self._replay(entry, request_hash)
+
+        except (ParamError, ConflictError):
+            raise
         except Exception as e:
             logger.error(f"Error al crear orden: {e}")
             raise ApiError(f"Error al crear orden: {str(e)}")
+
+    def _create(self):
+        order = OrderModel.create(**self.body)
+
+        logger.info(f"✅ Orden creada correctamente: {order.id}")
+
+        return {
+            "message": "Orden creada exitosamente.",
+            "order": order.to_dict()
+        }
+
+    def _create_claimed(self, entry):
+        try:
+            response = self._create()
+        except Exception:
+            entry.release()
+            raise
+        try:
+            entry.complete(response["order"]["id"], response)
+        except Exception as e:
+            # La orden ya existe: los reintentos recibirán 409 hasta que venza el lease
+            logger.error(f"❌ No se pudo guardar la respuesta de la llave de idempotencia: {e}")
+        return response
+
+    def _replay(self, entry, request_hash):
+        if entry is None:
+            raise ConflictError("La solicitud con esta llave de idempotencia se está procesando, intenta de nuevo.")
+        if entry.request_hash != request_hash:
+            raise ParamError("La llave de idempotencia ya se usó con un cuerpo diferente.")
+        if entry.status != COMPLETED:
+            raise ConflictError("La solicitud con esta llave de idempotencia se está procesando, intenta de nuevo.")
+
+        logger.info(f"♻️ Reintento con llave de idempotencia, orden {entry.order_id}")
+        self.replayed = True
+        return entry.stored_response()
@@ -1,18 +1,27 @@
 import logging
 from .base_command import BaseCommannd
-from ..errors.errors import ApiError
+from ..errors.errors import ApiError, ParamError
 from ..models.order import OrderModel
+from ..utils.pagination import parse_limit, encode_cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
 
 
 class GetAllOrders(BaseCommannd):
     """
-    Obtiene todas las órdenes almacenadas en DynamoDB.
+    Obtiene las órdenes almacenadas en DynamoDB.
+    Si se envía `limit` o `cursor`, devuelve una sola página con `next_cursor`.
     """
 
+    def __init__(self, limit=None, cursor=None):
+        self.limit = limit
+        self.cursor = cursor
+
     def execute(self):
         try:
+            if self.limit is not None or self.cursor is not None:
+                return self.fetch_page()
+
             logger.info("📦 Obteniendo todas las órdenes...")
 
             # Llama al método del modelo que escanea la tabla
@@ -25,6 +34,26 @@ class GetAllOrders(BaseCommannd):
 
             return orders_list
 
+        except ParamError:
+            raise
         except Exception as e:
             logger.error(f"❌ Error al obtener órdenes: {e}")
             raise ApiError(f"Error al obtener órdenes: {str(e)}")
+
+    def stream(self):
+        """Recorre la tabla de órdenes página a página sin materializarla."""
+        logger.info("📤 Exportando órdenes en streaming...")
+        return (order.to_dict() for order in OrderModel.scan())
+
+    def fetch_page(self):
+        """Obtiene una página de órdenes a partir del cursor recibido."""
+        limit = parse_limit(self.limit)
+        start_key = decode_cursor(self.cursor)
+
+        logger.info(f"📦 Obteniendo página de órdenes (limit={limit})...")
+        orders, last_key = OrderModel.get_page(limit, start_key)
+
+        return {
+            "items": orders,
+            "next_cursor": encode_cursor(last_key),
+        }
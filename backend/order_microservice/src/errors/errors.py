@@ -13,3 +13,18 @@ class ParamError(ApiError):
         (field, validations) = list(messages.items())[0]
         return ParamError(f"{field}: {validations[0]}")
 
+
+
+class ConflictError(ApiError):
+    code = 409
+
+    def __init__(self, description):
+        self.description = description
+
+
+class InsufficientStockError(ConflictError):
+
+    def __init__(self, failed_lines):
+        self.failed_lines = failed_lines
+        self.description = "No hay stock suficiente para algunos productos de la orden."
+        super().__init__(self.description)
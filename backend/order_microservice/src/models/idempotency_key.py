@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+import datetime
+from pynamodb.models import Model
+from pynamodb.exceptions import PutError
+from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute, TTLAttribute
+from .db import MAX_POOL_CONNECTIONS
+
+# Tiempo que se conserva la respuesta de una llave (DynamoDB borra el ítem al vencer el TTL)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("ORDER_IDEMPOTENCY_TTL_SECONDS", "86400"))
+
+# Tiempo que un request reserva la llave; si el worker muere, un reintento la puede reclamar al vencer
+IDEMPOTENCY_LEASE_SECONDS = int(os.getenv("ORDER_IDEMPOTENCY_LEASE_SECONDS", "30"))
+
+IN_PROGRESS = "IN_PROGRESS"
+COMPLETED = "COMPLETED"
+
+
+def request_fingerprint(body: dict) -> str:
+    """Hash estable del cuerpo, para detectar llaves reutilizadas con otro payload."""
+    raw = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class IdempotencyKeyModel(Model):
+    """
+    Modelo PynamoDB para la tabla de llaves de idempotencia de órdenes.
+    El primer request con una llave la reclama con un put condicional; los
+    reintentos leen la respuesta guardada con un solo GetItem.
+    Mientras está IN_PROGRESS la llave tiene un lease (`locked_until`): si el worker
+    muere antes de completarla, un reintento la reclama al vencer el lease. Si el worker
+    alcanzó a crear la orden, ese reintento crea otra (al menos una vez tras una caída).
+    """
+
+    class Meta:
+        table_name = os.getenv("DYNAMODB_TABLE_IDEMPOTENCY", "OrderIdempotencyKeys")
+        region = os.getenv("AWS_REGION", "us-east-1")
+        host = os.getenv("DYNAMODB_ENDPOINT") or None
+        max_pool_connections = MAX_POOL_CONNECTIONS
+        if os.getenv("APP_ENV") != "PROD":
+            aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
+            aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
+            aws_session_token = os.getenv("AWS_SESSION_TOKEN", None)
+
+    # Clave primaria
+    key = UnicodeAttribute(hash_key=True)
+
+    status = UnicodeAttribute(default=IN_PROGRESS)
+    request_hash = UnicodeAttribute()
+    order_id = UnicodeAttribute(null=True)
+    response = UnicodeAttribute(null=True)  # JSON de la respuesta original
+    locked_until = UTCDateTimeAttribute(null=True)
+    expires_at = TTLAttribute()
+
+    @classmethod
+    def find(cls, key: str):
+        """Retorna la llave vigente o None (el TTL de DynamoDB puede tardar en borrar las vencidas)."""
+        try:
+            entry = cls.get(key)
+        except cls.DoesNotExist:
+            return None
+        return entry if not entry.is_expired() else None
+
+    @classmethod
+    def claim(cls, key: str, request_hash: str):
+        """
+        Reclama la llave con un put condicional: si no existe, si venció o si quedó
+        IN_PROGRESS con el lease vencido. Retorna la entrada reclamada, o None si
+        otro request la tiene.
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        entry = cls(key, request_hash=request_hash, status=IN_PROGRESS)
+        entry.locked_until = now + datetime.timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+        entry.expires_at = datetime.timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+        abandoned = (cls.status == IN_PROGRESS) & (cls.locked_until < now)
+        try:
+            entry.save(condition=cls.key.does_not_exist() | (cls.expires_at < now) | abandoned)
+        except PutError as e:
+            if e.cause_response_code == "ConditionalCheckFailedException":
+                return None
+            raise
+        return entry
+
+    def complete(self, order_id: str, response: dict):
+        """Guarda la respuesta para devolverla en los reintentos (solo si el lease sigue siendo nuestro)."""
+        self.update(
+            actions=[
+                IdempotencyKeyModel.status.set(COMPLETED),
+                IdempotencyKeyModel.order_id.set(order_id),
+                IdempotencyKeyModel.response.set(json.dumps(response, default=str)),
+            ],
+            condition=IdempotencyKeyModel.locked_until == self.locked_until,
+        )
+
+    def release(self):
+        """Libera la llave si la creación falló, para que el cliente pueda reintentar."""
+        self.delete(
+            condition=(IdempotencyKeyModel.status == IN_PROGRESS)
+            & (IdempotencyKeyModel.locked_until == self.locked_until)
+        )
+
+    def lease_expired(self) -> bool:
+        """True si la llave quedó IN_PROGRESS y nadie renovó el lease (p. ej. el worker murió)."""
+        return (
+            self.status == IN_PROGRESS
+            and self.locked_until is not None
+            and self.locked_until < datetime.datetime.now(datetime.timezone.utc)
+        )
+
+    def is_expired(self) -> bool:
+        return self.expires_at <= datetime.datetime.now(datetime.timezone.utc)
+
+    def stored_response(self) -> dict:
+        return json.loads(self.response) if self.response else None
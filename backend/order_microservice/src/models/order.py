@@ -3,10 +3,21 @@ import datetime
 import random
 from enum import Enum
 from pynamodb.models import Model
+from pynamodb.transactions import TransactWrite
+from pynamodb.exceptions import TransactWriteError
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
 from uuid import uuid4
 from marshmallow import Schema, fields, validate, ValidationError
 from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute, ListAttribute
-from ..errors.errors import ParamError
+from ..errors.errors import ParamError, InsufficientStockError
+from .vendor_sales_rollup import VendorSalesRollupModel, CLIENT_INFIX
+from .product_stock import ProductStockModel
+from .db import MAX_POOL_CONNECTIONS
+
+# Límite de TransactWriteItems (orden + reservas de stock + acumulados del vendedor)
+MAX_TRANSACTION_ITEMS = 100
+# Reintentos cuando otra orden marca primero al mismo cliente nuevo del vendedor
+MAX_CLIENT_MARKER_ATTEMPTS = 3
 
 # Bodegas de despacho
 DISPATCH_WAREHOUSES = [
@@ -96,6 +107,20 @@ class NewOrderJsonSchema(Schema):
             raise ParamError.first_from(exception.messages)
 
 
+# 🔎 Índice de órdenes por cliente (ordenadas por fecha de creación)
+class ClientIndex(GlobalSecondaryIndex):
+    """GSI id_client + created_at para consultar el historial de un cliente"""
+
+    class Meta:
+        index_name = "id_client-created_at-index"
+        projection = AllProjection()
+        read_capacity_units = 5
+        write_capacity_units = 5
+
+    id_client = UnicodeAttribute(hash_key=True)
+    created_at = UTCDateTimeAttribute(range_key=True)
+
+
 # 📦 Modelo principal
 class OrderModel(Model):
     """ Modelo PynamoDB para la tabla Orders"""
@@ -104,6 +129,7 @@ class OrderModel(Model):
         table_name = os.getenv("DYNAMODB_TABLE", "Orders")
         region = os.getenv("AWS_REGION", "us-east-1")
         host = os.getenv("DYNAMODB_ENDPOINT") or None
+        max_pool_connections = MAX_POOL_CONNECTIONS
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
             aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
@@ -133,6 +159,9 @@ class OrderModel(Model):
     driver_name = UnicodeAttribute(null=True)
     delivery_vehicle = UnicodeAttribute(null=True)
 
+    # Índices
+    client_index = ClientIndex()
+
     # Métodos de clase
     @classmethod
     def create(cls, **kwargs):
@@ -154,8 +183,72 @@ class OrderModel(Model):
         order = OrderModel(**kwargs)
         order.id = str(uuid4())
         order.created_at = order.updated_at = now
-        order.save()
-        return order
+
+        reservations = ProductStockModel.reservations_for(order.products, now)
+        if not reservations and not order.id_vendor:
+            order.save()
+            return order
+
+        # Cada reserva es un ítem; el resto: la orden, los totales ("ALL" y el mes) y las marcas del cliente
+        limit = MAX_TRANSACTION_ITEMS - 1 - 2 * len(VendorSalesRollupModel.periods_for(now))
+        if len(reservations) > limit:
+            raise ParamError(f"products: La orden admite máximo {limit} productos distintos.")
+
+        new_client_periods = VendorSalesRollupModel.new_client_periods(order) if order.id_vendor else set()
+        for attempt in range(MAX_CLIENT_MARKER_ATTEMPTS):
+            updates, markers = (
+                VendorSalesRollupModel.increments_for(order, new_client_periods) if order.id_vendor else ([], [])
+            )
+            # La orden, la reserva de stock y los acumulados del vendedor se escriben en una sola transacción
+            try:
+                with TransactWrite(connection=cls._get_connection().connection) as transaction:
+                    transaction.save(order)
+                    for item, actions, condition, _ in reservations:
+                        transaction.update(item, actions=actions, condition=condition)
+                    for rollup, actions in updates:
+                        transaction.update(rollup, actions=actions)
+                    for marker, condition in markers:
+                        transaction.save(marker, condition=condition)
+                return order
+            except TransactWriteError as e:
+                failed_lines = cls._failed_stock_lines(e, reservations, order.products)
+                if failed_lines:
+                    raise InsufficientStockError(failed_lines)
+                # Otra orden del mismo cliente creó la marca primero: se reintenta sin contarlo de nuevo
+                marked = cls._failed_markers(e, markers, offset=1 + len(reservations) + len(updates))
+                if not marked or attempt == MAX_CLIENT_MARKER_ATTEMPTS - 1:
+                    raise
+                new_client_periods = new_client_periods - marked
+
+    @staticmethod
+    def _failed_markers(error, markers, offset):
+        """Periodos cuya marca de cliente ya existía al confirmar la transacción."""
+        reasons = (error.cancellation_reasons or [])[offset:offset + len(markers)]
+        return {
+            marker.period.split(CLIENT_INFIX, 1)[0]
+            for (marker, _), reason in zip(markers, reasons)
+            if reason is not None and reason.code == "ConditionalCheckFailed"
+        }
+
+    @staticmethod
+    def _failed_stock_lines(error, reservations, products):
+        """Traduce las razones de cancelación de la transacción a las líneas sin stock."""
+        # Los motivos vienen en el orden de los ítems: primero el put de la orden, luego las reservas
+        reasons = error.cancellation_reasons[1:1 + len(reservations)]
+        failed = []
+        for (_, _, _, lines), reason in zip(reservations, reasons):
+            if reason is None or reason.code != "ConditionalCheckFailed":
+                continue
+            for line in lines:
+                product = products[line]
+                failed.append({
+                    "line": line,
+                    "id": product.get("id"),
+                    "id_warehouse": product.get("id_warehouse"),
+                    "amount": product.get("amount"),
+                    "reason": "Stock insuficiente o producto inexistente",
+                })
+        return failed
 
     @classmethod
     def get_all(cls):
@@ -165,11 +258,21 @@ class OrderModel(Model):
         except Exception as e:
             raise Exception(f"Error retrieving orders: {str(e)}")
 
+    @classmethod
+    def get_page(cls, limit: int, last_evaluated_key: dict = None):
+        """Obtiene una página de órdenes y la llave para continuar el escaneo"""
+        try:
+            results = cls.scan(limit=limit, last_evaluated_key=last_evaluated_key)
+            orders = [order.to_dict() for order in results]
+            return orders, results.last_evaluated_key
+        except Exception as e:
+            raise Exception(f"Error retrieving orders: {str(e)}")
+
     @classmethod
     def get_by_client(cls, client_id: str):
-        """Obtiene órdenes por ID de cliente"""
+        """Obtiene órdenes por ID de cliente (más recientes primero)"""
         try:
-            orders = list(cls.scan(cls.id_client == client_id))
+            orders = cls.client_index.query(client_id, scan_index_forward=False)
             return [order.to_dict() for order in orders]
         except Exception as e:
             raise Exception(f"Error retrieving orders for client {client_id}: {str(e)}")
@@ -0,0 +1,52 @@
+import os
+import datetime
+from collections import OrderedDict
+from pynamodb.models import Model
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute, UTCDateTimeAttribute
+from .db import MAX_POOL_CONNECTIONS
+
+
+class ProductStockModel(Model):
+    """
+    Vista del servicio de órdenes sobre la tabla Products (solo llave y stock).
+    Se usa para reservar inventario dentro de la transacción que crea la orden.
+    """
+
+    class Meta:
+        table_name = os.getenv("DYNAMODB_TABLE_PRODUCTS", "Products")
+        region = os.getenv("AWS_REGION", "us-east-1")
+        host = os.getenv("DYNAMODB_ENDPOINT") or None
+        max_pool_connections = MAX_POOL_CONNECTIONS
+        if os.getenv("APP_ENV") != "PROD":
+            aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
+            aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
+            aws_session_token = os.getenv("AWS_SESSION_TOKEN", None)
+
+    # Clave primaria (misma que Products)
+    warehouse = UnicodeAttribute(hash_key=True)
+    sku = UnicodeAttribute(range_key=True)
+
+    stock = NumberAttribute()
+    updated_at = UTCDateTimeAttribute(null=True)
+
+    @classmethod
+    def reservations_for(cls, products, now=None):
+        """
+        Agrupa las líneas de la orden por (bodega, sku) y retorna
+        [(item, actions, condition, lines)] para descontar el stock de forma condicional.
+        `lines` son los índices de las líneas originales que cubre cada reserva.
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        grouped = OrderedDict()
+        for index, product in enumerate(products or []):
+            key = (product.get("id_warehouse"), product.get("id"))
+            amount, lines = grouped.get(key, (0, []))
+            grouped[key] = (amount + int(product.get("amount", 0)), lines + [index])
+
+        reservations = []
+        for (warehouse, sku), (amount, lines) in grouped.items():
+            actions = [cls.stock.add(-amount), cls.updated_at.set(now)]
+            # El producto debe existir y tener stock suficiente
+            condition = cls.sku.exists() & (cls.stock >= amount)
+            reservations.append((cls(warehouse, sku), actions, condition, lines))
+        return reservations
@@ -0,0 +1,182 @@
+import os
+from collections import defaultdict
+from pynamodb.models import Model
+from pynamodb.expressions.operand import Path, Value
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute, UTCDateTimeAttribute
+from .db import MAX_POOL_CONNECTIONS
+
+# Periodo acumulado histórico; además cada orden suma a su mes ("YYYY-MM")
+ALL_TIME = "ALL"
+
+# Marca de cliente ya atendido en un periodo ("<periodo>#client#<id>")
+CLIENT_INFIX = "#client#"
+
+# Prefijos de los contadores por producto (atributos de primer nivel: ADD no admite rutas anidadas)
+UNITS_PREFIX = "units#"
+VALUE_PREFIX = "value#"
+NAME_PREFIX = "name#"
+
+
+def client_period(client_id: str, period: str = ALL_TIME) -> str:
+    return f"{period}{CLIENT_INFIX}{client_id}"
+
+
+class VendorSalesRollupModel(Model):
+    """
+    Modelo PynamoDB para la tabla VendorSalesRollup.
+    Cada vendedor tiene un ítem de totales por periodo ("ALL" y "YYYY-MM") con
+    órdenes, unidades, valor, clientes distintos (`customers`) y los contadores de
+    cada producto, así el reporte es un solo GetItem. Los clientes ya contados se
+    marcan con un ítem "<periodo>#client#<id>" que se crea de forma condicional en
+    la misma transacción que suma 1 a `customers`.
+    """
+
+    class Meta:
+        table_name = os.getenv("DYNAMODB_TABLE_VENDOR_SALES_ROLLUP", "VendorSalesRollup")
+        region = os.getenv("AWS_REGION", "us-east-1")
+        host = os.getenv("DYNAMODB_ENDPOINT") or None
+        max_pool_connections = MAX_POOL_CONNECTIONS
+        if os.getenv("APP_ENV") != "PROD":
+            aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
+            aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
+            aws_session_token = os.getenv("AWS_SESSION_TOKEN", None)
+
+    # Clave primaria
+    id_vendor = UnicodeAttribute(hash_key=True)
+    period = UnicodeAttribute(range_key=True)
+
+    # Totales del periodo (las marcas de cliente solo tienen la llave y updated_at)
+    order_count = NumberAttribute(null=True)
+    customers = NumberAttribute(null=True)
+    total_units = NumberAttribute(null=True)
+    total_value = NumberAttribute(null=True)
+
+    updated_at = UTCDateTimeAttribute(null=True)
+
+    def serialize(self, null_check=True):
+        """Agrega los contadores por producto que armó rebuild() como atributos de primer nivel."""
+        data = super().serialize(null_check=null_check)
+        for pid, product in getattr(self, "sold_products", {}).items():
+            data[UNITS_PREFIX + pid] = {"N": str(product["units"])}
+            data[VALUE_PREFIX + pid] = {"N": str(round(product["value"], 2))}
+            data[NAME_PREFIX + pid] = {"S": product["name"]}
+        return data
+
+    @staticmethod
+    def periods_for(created_at):
+        """Periodos que acumula una orden: el histórico y su mes de creación."""
+        return [ALL_TIME, created_at.strftime("%Y-%m")]
+
+    @staticmethod
+    def _sales(order):
+        """Unidades, valor y nombre por producto; un mismo producto puede repetirse en la orden."""
+        units = defaultdict(int)
+        values = defaultdict(float)
+        names = {}
+        for product in order.products or []:
+            pid = product.get("id")
+            amount = product.get("amount", 0)
+            units[pid] += amount
+            values[pid] += amount * product.get("unit_price", 0)
+            names[pid] = product.get("name", "")
+        return units, values, names
+
+    @classmethod
+    def new_client_periods(cls, order):
+        """Periodos de la orden en los que su cliente aún no tiene marca (un BatchGetItem)."""
+        if not order.id_client:
+            return set()
+        periods = cls.periods_for(order.created_at)
+        keys = [(order.id_vendor, client_period(order.id_client, period)) for period in periods]
+        marked = {marker.period for marker in cls.batch_get(keys, attributes_to_get=["id_vendor", "period"])}
+        return {period for period in periods if client_period(order.id_client, period) not in marked}
+
+    @classmethod
+    def increments_for(cls, order, new_client_periods=()):
+        """
+        Retorna (updates, markers) para sumar la orden a los totales del vendedor:
+        - updates: [(rollup, actions)] con ADD/SET sobre el ítem de cada periodo.
+        - markers: [(marker, condition)] con la marca del cliente en los periodos de
+          `new_client_periods`, que solo se crea si no existe; en esos periodos también se suma 1 a `customers`.
+        Los ítems se crean en la primera actualización.
+        """
+        units, values, names = cls._sales(order)
+        updates, markers = [], []
+        for period in cls.periods_for(order.created_at):
+            actions = [
+                cls.order_count.add(1),
+                cls.total_units.add(sum(units.values())),
+                cls.total_value.add(round(sum(values.values()), 2)),
+                cls.updated_at.set(order.created_at),
+            ]
+            for pid in units:
+                actions.append(Path([UNITS_PREFIX + pid]).add(Value(units[pid], attribute=NumberAttribute())))
+                actions.append(Path([VALUE_PREFIX + pid]).add(Value(round(values[pid], 2), attribute=NumberAttribute())))
+                actions.append(Path([NAME_PREFIX + pid]).set(names[pid]))
+            if period in new_client_periods:
+                actions.append(cls.customers.add(1))
+                marker = cls(order.id_vendor, client_period(order.id_client, period), updated_at=order.created_at)
+                markers.append((marker, cls.period.does_not_exist()))
+            updates.append((cls(order.id_vendor, period), actions))
+        return updates, markers
+
+    @classmethod
+    def rebuild(cls, orders):
+        """
+        Recalcula desde cero los acumulados de los vendedores de `orders` y los
+        reemplaza con BatchWriteItem; también borra los ítems que ya no corresponden
+        (p. ej. los de formatos anteriores). Retorna un resumen de lo escrito.
+        """
+        rollups = {}
+        clients = defaultdict(set)
+
+        def rollup_for(id_vendor, period):
+            rollup = rollups.get((id_vendor, period))
+            if rollup is None:
+                rollup = rollups[(id_vendor, period)] = cls(
+                    id_vendor, period, order_count=0, customers=0, total_units=0, total_value=0
+                )
+                rollup.sold_products = {}
+            return rollup
+
+        for order in orders:
+            if not order.id_vendor:
+                continue
+            units, values, names = cls._sales(order)
+            for period in cls.periods_for(order.created_at):
+                rollup = rollup_for(order.id_vendor, period)
+                rollup.order_count += 1
+                rollup.total_units += sum(units.values())
+                rollup.total_value = round(rollup.total_value + sum(values.values()), 2)
+                for pid in units:
+                    product = rollup.sold_products.setdefault(pid, {"units": 0, "value": 0.0, "name": ""})
+                    product["units"] += units[pid]
+                    product["value"] += values[pid]
+                    product["name"] = names[pid]
+                if order.id_client:
+                    clients[(order.id_vendor, period)].add(order.id_client)
+                if rollup.updated_at is None or order.created_at > rollup.updated_at:
+                    rollup.updated_at = order.created_at
+
+        markers = []
+        for (id_vendor, period), client_ids in clients.items():
+            rollups[(id_vendor, period)].customers = len(client_ids)
+            markers += [cls(id_vendor, client_period(client_id, period)) for client_id in client_ids]
+
+        written = {(id_vendor, period) for id_vendor, period in rollups}
+        written |= {(marker.id_vendor, marker.period) for marker in markers}
+        vendors = {id_vendor for id_vendor, _ in rollups}
+        stale = [
+            existing
+            for id_vendor in vendors
+            for existing in cls.query(id_vendor, attributes_to_get=["id_vendor", "period"])
+            if (existing.id_vendor, existing.period) not in written
+        ]
+
+        with cls.batch_write() as batch:
+            for item in list(rollups.values()) + markers:
+                batch.save(item)
+            for existing in stale:
+                batch.delete(existing)
+
+        return {"vendors": len(vendors), "written": len(written), "deleted": len(stale)}
@@ -0,0 +1,40 @@
+import json
+import base64
+from ..errors.errors import ParamError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def parse_limit(limit):
+    """Valida el parámetro `limit` y lo convierte a entero."""
+    if limit is None or limit == "":
+        return DEFAULT_PAGE_SIZE
+    try:
+        value = int(limit)
+    except (TypeError, ValueError):
+        raise ParamError("El parámetro 'limit' debe ser un número entero.")
+    if value < 1 or value > MAX_PAGE_SIZE:
+        raise ParamError(f"El parámetro 'limit' debe estar entre 1 y {MAX_PAGE_SIZE}.")
+    return value
+
+
+def encode_cursor(last_evaluated_key):
+    """Convierte el `LastEvaluatedKey` de DynamoDB en un cursor opaco."""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    """Convierte un cursor opaco en el `ExclusiveStartKey` de DynamoDB."""
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ParamError("El parámetro 'cursor' no es válido.")
+    if not isinstance(key, dict):
+        raise ParamError("El parámetro 'cursor' no es válido.")
+    return key
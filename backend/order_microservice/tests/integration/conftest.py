@@ -2,6 +2,9 @@ import pytest
 from uuid import uuid4
 from unittest.mock import patch
 from src.models.order import OrderModel
+from src.models.vendor_sales_rollup import VendorSalesRollupModel
+from src.models.idempotency_key import IdempotencyKeyModel
+from src.models.product_stock import ProductStockModel
 
 # --- Fixture de cliente Flask ---
 @pytest.fixture
@@ -29,8 +32,27 @@ def db_clearer():
     clear_db()
 
 
+@pytest.fixture()
+def stock():
+    """
+    Crea inventario en Products para las líneas de las órdenes de prueba.
+    La tabla es del servicio de productos: al terminar solo se borran los SKUs sembrados aquí.
+    """
+    seeded = set()
+
+    def _stock(warehouse, sku, units):
+        ProductStockModel(warehouse, sku, stock=units).save()
+        seeded.add((warehouse, sku))
+
+    yield _stock
+
+    with ProductStockModel.batch_write() as batch:
+        for warehouse, sku in seeded:
+            batch.delete(ProductStockModel(warehouse, sku))
+
+
 def clear_db():
-    models = [OrderModel]
+    models = [OrderModel, VendorSalesRollupModel, IdempotencyKeyModel]
     for model in models:
         with model.batch_write() as batch:
             for item in model.scan():
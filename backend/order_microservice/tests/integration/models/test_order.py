@@ -1,7 +1,10 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone
+from pynamodb.exceptions import TransactWriteError, CancellationReason
+from pynamodb.connection.base import VerboseClientError
 from src.models.order import OrderModel
+from src.errors.errors import ParamError, InsufficientStockError
 
 
 class TestFindExistingOrder:
@@ -53,12 +56,58 @@ class TestGetAllOrders:
             OrderModel.get_all()
 
 
+class TestGetPage:
+    """🧪 Pruebas unitarias para get_page()"""
+
+    @patch.object(OrderModel, "scan")
+    def test_should_return_page_and_last_key(self, mock_scan):
+        """✅ Debe devolver la página y la llave para continuar"""
+        mock_order = MagicMock()
+        mock_order.to_dict.return_value = {"id": "ORDER-1"}
+        mock_results = MagicMock()
+        mock_results.__iter__.return_value = iter([mock_order])
+        mock_results.last_evaluated_key = {"id": {"S": "ORDER-1"}}
+        mock_scan.return_value = mock_results
+
+        orders, last_key = OrderModel.get_page(1, {"id": {"S": "ORDER-0"}})
+
+        mock_scan.assert_called_once_with(limit=1, last_evaluated_key={"id": {"S": "ORDER-0"}})
+        assert orders == [{"id": "ORDER-1"}]
+        assert last_key == {"id": {"S": "ORDER-1"}}
+
+
+class TestGetByClient:
+    """🧪 Pruebas unitarias para get_by_client()"""
+
+    @patch.object(OrderModel.client_index, "query")
+    def test_should_query_client_index(self, mock_query):
+        """✅ Debe consultar el índice por cliente en orden descendente"""
+        mock_order = MagicMock()
+        mock_order.to_dict.return_value = {"id": "ORDER-1", "id_client": "CLIENT-1"}
+        mock_query.return_value = [mock_order]
+
+        result = OrderModel.get_by_client("CLIENT-1")
+
+        mock_query.assert_called_once_with("CLIENT-1", scan_index_forward=False)
+        assert result == [{"id": "ORDER-1", "id_client": "CLIENT-1"}]
+
+    @patch.object(OrderModel.client_index, "query", side_effect=Exception("DB Error"))
+    def test_should_raise_exception_on_failure(self, mock_query):
+        """❌ Debe lanzar excepción si la consulta falla"""
+        with pytest.raises(Exception, match="Error retrieving orders for client"):
+            OrderModel.get_by_client("CLIENT-1")
+
+
 class TestCreateOrder:
     """🧪 Pruebas unitarias para create()"""
 
-    @patch.object(OrderModel, "save")
-    def test_should_create_order_correctly(self, mock_save):
+    @patch("src.models.order.VendorSalesRollupModel.new_client_periods")
+    @patch("src.models.order.TransactWrite")
+    def test_should_create_order_correctly(self, mock_transact, mock_new_client_periods):
         """✅ Debe crear una orden y asignar campos automáticos"""
+        transaction = mock_transact.return_value.__enter__.return_value
+        mock_new_client_periods.return_value = {"ALL", datetime.now(timezone.utc).strftime("%Y-%m")}
+
         order = OrderModel.create(
             priority="HIGH",
             products=[{"id": "P1", "name": "Mouse", "amount": 1, "id_warehouse": "W-001"}],
@@ -77,7 +126,88 @@ class TestCreateOrder:
         assert order.updated_at is not None
         assert order.priority == "HIGH"
 
+        # 📊 La orden, la reserva de stock, los totales por periodo y las marcas del cliente van en la misma transacción
+        saved = [call.args[0] for call in transaction.save.call_args_list]
+        assert saved[0] is order
+        assert [marker.period for marker in saved[1:]] == [
+            "ALL#client#CLIENT-1",
+            f"{order.created_at:%Y-%m}#client#CLIENT-1",
+        ]
+        assert all(call.kwargs["condition"] is not None for call in transaction.save.call_args_list[1:])
+        updated = [call.args[0] for call in transaction.update.call_args_list]
+        assert (updated[0].warehouse, updated[0].sku) == ("W-001", "P1")
+        assert transaction.update.call_args_list[0].kwargs["condition"] is not None
+        assert [rollup.period for rollup in updated[1:]] == ["ALL", f"{order.created_at:%Y-%m}"]
+
+    @patch("src.models.order.VendorSalesRollupModel.new_client_periods")
+    @patch("src.models.order.TransactWrite")
+    def test_should_retry_without_client_marked_by_another_order(self, mock_transact, mock_new_client_periods):
+        """🔁 Si otra orden marcó primero al cliente, reintenta sin volver a contarlo"""
+        transaction = mock_transact.return_value.__enter__.return_value
+        month = datetime.now(timezone.utc).strftime("%Y-%m")
+        mock_new_client_periods.return_value = {"ALL", month}
+        # orden, reserva, 2 totales y 2 marcas: la marca del histórico ya existía
+        reasons = [None, None, None, None, CancellationReason(code="ConditionalCheckFailed"), None]
+        cause = VerboseClientError(
+            {"Error": {"Code": "TransactionCanceledException", "Message": "Transaction cancelled"}},
+            "TransactWriteItems",
+            cancellation_reasons=reasons,
+        )
+        mock_transact.return_value.__exit__.side_effect = [TransactWriteError("Failed to write transaction items", cause), None]
+
+        OrderModel.create(
+            priority="HIGH",
+            products=[{"id": "P1", "name": "Mouse", "amount": 1, "id_warehouse": "W-001"}],
+            id_client="CLIENT-1",
+            id_vendor="VENDOR-1",
+            date_estimated="2025-11-05",
+        )
+
+        assert mock_transact.call_count == 2
+        retried = [call.args[0].period for call in transaction.save.call_args_list[4:]]
+        assert retried == [f"{month}#client#CLIENT-1"]
+
+    @patch("src.models.order.VendorSalesRollupModel.new_client_periods", return_value=set())
+    @patch("src.models.order.TransactWrite")
+    def test_should_report_lines_without_stock(self, mock_transact, mock_new_client_periods):
+        """❌ Si una reserva falla, reporta las líneas sin stock y no crea la orden"""
+        reasons = [None, None, CancellationReason(code="ConditionalCheckFailed"), None, None]
+        cause = VerboseClientError(
+            {"Error": {"Code": "TransactionCanceledException", "Message": "Transaction cancelled"}},
+            "TransactWriteItems",
+            cancellation_reasons=reasons,
+        )
+        mock_transact.return_value.__exit__.side_effect = TransactWriteError("Failed to write transaction items", cause)
+
+        with pytest.raises(InsufficientStockError) as excinfo:
+            OrderModel.create(
+                priority="HIGH",
+                products=[
+                    {"id": "P1", "name": "Mouse", "amount": 1, "id_warehouse": "W-001"},
+                    {"id": "P2", "name": "Teclado", "amount": 5, "id_warehouse": "W-001"},
+                    {"id": "P2", "name": "Teclado", "amount": 1, "id_warehouse": "W-001"},
+                ],
+                id_vendor="VENDOR-1",
+                date_estimated="2025-11-05",
+            )
+
+        assert [line["line"] for line in excinfo.value.failed_lines] == [1, 2]
+        assert excinfo.value.failed_lines[0]["id"] == "P2"
+
+    def test_should_reject_orders_over_transaction_limit(self):
+        """❌ Rechaza órdenes que no caben en una sola transacción"""
+        products = [{"id": f"P{i}", "name": "X", "amount": 1, "id_warehouse": "W-001"} for i in range(96)]
+        with pytest.raises(ParamError, match="máximo 95 productos"):
+            OrderModel.create(priority="HIGH", products=products, id_vendor="V1", date_estimated="2025-11-05")
+
+    @patch("src.models.order.TransactWrite")
+    @patch.object(OrderModel, "save")
+    def test_should_skip_rollup_without_vendor(self, mock_save, mock_transact):
+        """✅ Sin vendedor se guarda la orden sin tocar los acumulados"""
+        OrderModel.create(priority="LOW", products=[], id_client="CLIENT-1", date_estimated="2025-11-05")
+
         mock_save.assert_called_once()
+        mock_transact.assert_not_called()
 
     @patch.object(OrderModel, "save", side_effect=Exception("Error DynamoDB"))
     def test_should_raise_exception_if_save_fails(self, mock_save):
@@ -3,13 +3,16 @@ import logging
 from datetime import date, timedelta
 from unittest.mock import patch
 from src.errors.errors import ApiError
+from src.models.product_stock import ProductStockModel
 
 @pytest.mark.usefixtures("client")
 class TestCreateOrderIntegration:
     """🧪 Test de integración para la creación de órdenes"""
 
-    def test_successful_order_creation(self, client):
+    def test_successful_order_creation(self, client, stock):
         """✅ Debe crear una orden exitosamente y devolver 201"""
+        stock("W-001", "P-1001", 10)
+        stock("W-002", "P-2002", 10)
         payload = {
             "priority": "HIGH",
             "products": [
@@ -112,3 +115,58 @@ class TestCreateOrderIntegration:
         assert response.status_code == 500
         assert "error" in json_data
         assert "Error inesperado" in json_data["error"]
+
+    # ♻️ Caso: reintento con Idempotency-Key
+    def test_idempotency_key_replays_original_order(self, client, stock):
+        """♻️ Un reintento con la misma llave devuelve la misma orden sin duplicarla"""
+        stock("W-001", "P-3", 1)
+        payload = {
+            "priority": "MEDIUM",
+            "products": [{"id": "P-3", "name": "Monitor", "amount": 1, "id_warehouse": "W-001", "unit_price": 300.0}],
+            "country": "Colombia",
+            "city": "Medellín",
+            "address": "Calle 10 #15-30",
+            "date_estimated": (date.today() + timedelta(days=4)).isoformat(),
+            "id_client": "CLIENT-777",
+            "id_vendor": "VENDOR-777"
+        }
+        headers = {"Idempotency-Key": "retry-123"}
+
+        first = client.post("/", json=payload, headers=headers)
+        second = client.post("/", json=payload, headers=headers)
+
+        assert first.status_code == 201
+        assert second.status_code == 201
+        assert second.headers.get("Idempotent-Replayed") == "true"
+        assert second.get_json()["order"]["id"] == first.get_json()["order"]["id"]
+
+        # Misma llave con otro cuerpo
+        payload["priority"] = "LOW"
+        conflict = client.post("/", json=payload, headers=headers)
+        assert conflict.status_code == 400
+
+    # 📦 Caso: stock insuficiente
+    def test_insufficient_stock_reports_failed_lines(self, client, stock):
+        """❌ Debe devolver 409 con las líneas sin stock y no descontar nada"""
+        stock("W-001", "P-1", 5)
+        stock("W-001", "P-2", 1)
+        payload = {
+            "priority": "HIGH",
+            "products": [
+                {"id": "P-1", "name": "Mouse", "amount": 2, "id_warehouse": "W-001", "unit_price": 25.0},
+                {"id": "P-2", "name": "Teclado", "amount": 3, "id_warehouse": "W-001", "unit_price": 45.0}
+            ],
+            "country": "Colombia",
+            "city": "Bogotá",
+            "address": "Cra 7 #26-20",
+            "date_estimated": (date.today() + timedelta(days=2)).isoformat(),
+            "id_client": "CLIENT-1",
+            "id_vendor": "VENDOR-1"
+        }
+
+        response = client.post("/", json=payload)
+        json_data = response.get_json()
+
+        assert response.status_code == 409
+        assert [line["id"] for line in json_data["failed_lines"]] == ["P-2"]
+        assert ProductStockModel.get("W-001", "P-1").stock == 5
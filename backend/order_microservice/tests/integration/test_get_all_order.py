@@ -16,6 +16,22 @@ class TestGetAllOrdersIntegration:
         assert response.status_code == 200
         assert isinstance(json_data, list)  # puede estar vacía, pero debe ser lista
 
+    def test_get_all_orders_paginated(self, client):
+        """📄 Con limit debe devolver items y next_cursor"""
+        response = client.get("/?limit=10")
+        json_data = response.get_json()
+
+        assert response.status_code == 200
+        assert isinstance(json_data["items"], list)
+        assert "next_cursor" in json_data
+
+    def test_get_all_orders_invalid_cursor(self, client):
+        """🚫 Un cursor corrupto debe devolver 400"""
+        response = client.get("/?cursor=no-es-un-cursor")
+
+        assert response.status_code == 400
+        assert "cursor" in response.get_json()["error"]
+
     # 🚫 Caso: ApiError lanzado por el comando
     @patch("src.commands.view_all.GetAllOrders.execute")
     def test_get_all_orders_api_error(self, mock_execute, client):
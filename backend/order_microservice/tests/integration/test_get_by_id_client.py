@@ -8,8 +8,10 @@ from unittest.mock import patch
 class TestGetOrdersByClientIntegration:
     """🧪 Test de integración para GET /client"""
 
-    def test_create_and_get_orders_by_client(self, client):
+    def test_create_and_get_orders_by_client(self, client, stock):
         """✅ Debe crear una orden y luego recuperarla usando el client_id del JWT"""
+        stock("W-001", "P-1001", 10)
+        stock("W-002", "P-2002", 10)
 
         # Patch del JWT para este test
         with patch("src.blueprints.orders.current_cognito_jwt", {"sub": "CLIENT-123"}):
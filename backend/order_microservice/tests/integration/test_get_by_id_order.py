@@ -8,8 +8,10 @@ from src.errors.errors import ApiError
 class TestGetOrderByIdIntegration:
     """🧪 Test de integración para obtener una orden por ID (rutas: '/' y '/<id>')"""
 
-    def test_get_order_by_id_success(self, client):
+    def test_get_order_by_id_success(self, client, stock):
         """✅ Crea una orden y luego la obtiene correctamente por ID"""
+        stock("W-001", "P-1001", 10)
+        stock("W-002", "P-2002", 10)
         # 1) Crear orden en "/"
         create_payload = {
             "priority": "HIGH",
@@ -0,0 +1,103 @@
+import json
+import datetime
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import PutError
+from pynamodb.expressions.update import Update
+from src.models.idempotency_key import (
+    IdempotencyKeyModel, COMPLETED, IN_PROGRESS, IDEMPOTENCY_LEASE_SECONDS, request_fingerprint,
+)
+
+
+def conditional_failure():
+    return PutError(cause=ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException", "Message": "The conditional request failed"}},
+        "PutItem",
+    ))
+
+
+class TestIdempotencyKeyModel:
+    """🧪 Pruebas unitarias para IdempotencyKeyModel"""
+
+    def test_fingerprint_ignora_orden_de_llaves(self):
+        assert request_fingerprint({"a": 1, "b": [1, 2]}) == request_fingerprint({"b": [1, 2], "a": 1})
+        assert request_fingerprint({"a": 1}) != request_fingerprint({"a": 2})
+
+    @patch.object(IdempotencyKeyModel, "save")
+    def test_claim_usa_put_condicional(self, mock_save):
+        entry = IdempotencyKeyModel.claim("user#abc", "hash")
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        assert entry.status == IN_PROGRESS
+        assert entry.expires_at > now
+        assert now < entry.locked_until <= now + datetime.timedelta(seconds=IDEMPOTENCY_LEASE_SECONDS)
+        names, values = {}, {}
+        condition = mock_save.call_args.kwargs["condition"].serialize(names, values)
+        # Libre, vencida o abandonada (IN_PROGRESS con el lease vencido)
+        assert condition == "((attribute_not_exists (#0) OR #1 < :0) OR (#2 = :1 AND #3 < :2))"
+        assert names == {"key": "#0", "expires_at": "#1", "status": "#2", "locked_until": "#3"}
+        assert values[":1"] == {"S": IN_PROGRESS}
+
+    @patch.object(IdempotencyKeyModel, "save", side_effect=conditional_failure())
+    def test_claim_retorna_none_si_la_llave_ya_existe(self, mock_save):
+        assert IdempotencyKeyModel.claim("user#abc", "hash") is None
+
+    @patch.object(IdempotencyKeyModel, "get")
+    def test_find_ignora_llaves_vencidas(self, mock_get):
+        entry = IdempotencyKeyModel("user#abc", request_hash="hash")
+        entry.expires_at = datetime.timedelta(seconds=-1)
+        mock_get.return_value = entry
+
+        assert IdempotencyKeyModel.find("user#abc") is None
+
+    @patch.object(IdempotencyKeyModel, "get", side_effect=IdempotencyKeyModel.DoesNotExist)
+    def test_find_retorna_none_si_no_existe(self, mock_get):
+        assert IdempotencyKeyModel.find("user#abc") is None
+
+    @patch.object(IdempotencyKeyModel, "update")
+    def test_complete_guarda_respuesta(self, mock_update):
+        entry = IdempotencyKeyModel("user#abc", request_hash="hash")
+        response = {"order": {"id": "ORDER-1"}}
+
+        entry.complete("ORDER-1", response)
+
+        names, values = {}, {}
+        Update(*mock_update.call_args.kwargs["actions"]).serialize(names, values)
+        assert {"S": COMPLETED} in values.values()
+        assert {"S": json.dumps(response)} in values.values()
+
+    @patch.object(IdempotencyKeyModel, "update")
+    def test_complete_exige_el_lease_propio(self, mock_update):
+        entry = IdempotencyKeyModel("user#abc", request_hash="hash")
+        entry.locked_until = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+        entry.complete("ORDER-1", {})
+
+        names, values = {}, {}
+        assert mock_update.call_args.kwargs["condition"].serialize(names, values) == "#0 = :0"
+        assert names == {"locked_until": "#0"}
+
+    @patch.object(IdempotencyKeyModel, "delete")
+    def test_release_solo_borra_el_lease_propio(self, mock_delete):
+        entry = IdempotencyKeyModel("user#abc", request_hash="hash")
+        entry.locked_until = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+        entry.release()
+
+        names, values = {}, {}
+        assert mock_delete.call_args.kwargs["condition"].serialize(names, values) == "(#0 = :0 AND #1 = :1)"
+        assert names == {"status": "#0", "locked_until": "#1"}
+
+    def test_lease_expired(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        entry = IdempotencyKeyModel("user#abc", request_hash="hash", status=IN_PROGRESS)
+
+        entry.locked_until = now - datetime.timedelta(seconds=1)
+        assert entry.lease_expired()
+
+        entry.locked_until = now + datetime.timedelta(seconds=30)
+        assert not entry.lease_expired()
+
+        entry.locked_until = now - datetime.timedelta(seconds=1)
+        entry.status = COMPLETED
+        assert not entry.lease_expired()
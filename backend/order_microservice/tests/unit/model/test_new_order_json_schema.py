@@ -26,8 +26,9 @@ class TestOrderModel:
         return base
 
     # ✅ Test de creación exitosa
-    @patch.object(OrderModel, "save")
-    def test_create_order_generates_expected_fields(self, mock_save):
+    @patch("src.models.order.VendorSalesRollupModel.new_client_periods", return_value=set())
+    @patch("src.models.order.TransactWrite")
+    def test_create_order_generates_expected_fields(self, mock_transact, mock_new_client_periods):
         """✅ Crea una orden correctamente con campos aleatorios"""
         data = self.build_valid_order_kwargs()
 
@@ -45,8 +46,8 @@ class TestOrderModel:
         assert isinstance(order.created_at, datetime.datetime)
         assert order.delivery_date > order.created_at
 
-        # save() debe haberse llamado una vez
-        mock_save.assert_called_once()
+        # La orden debe guardarse una vez dentro de la transacción
+        mock_transact.return_value.__enter__.return_value.save.assert_called_once_with(order)
 
     # ⚠️ Test cuando falta la fecha estimada
     def test_create_raises_error_on_invalid_date(self):
@@ -57,8 +58,9 @@ class TestOrderModel:
             OrderModel.create(**data)
 
     # 🧩 Test de to_dict()
-    @patch.object(OrderModel, "save")
-    def test_to_dict_returns_iso_dates(self, mock_save):
+    @patch("src.models.order.VendorSalesRollupModel.new_client_periods", return_value=set())
+    @patch("src.models.order.TransactWrite")
+    def test_to_dict_returns_iso_dates(self, mock_transact, mock_new_client_periods):
         """🧩 Convierte correctamente las fechas a ISO"""
         data = self.build_valid_order_kwargs()
         order = OrderModel.create(**data)
@@ -102,16 +104,16 @@ class TestOrderModel:
         assert result[0]["id"] == "1"
 
     # 👥 Test de get_by_client
-    @patch.object(OrderModel, "scan")
-    def test_get_by_client_filters_results(self, mock_scan):
-        """👥 Devuelve lista filtrada por cliente"""
+    @patch.object(OrderModel.client_index, "query")
+    def test_get_by_client_filters_results(self, mock_query):
+        """👥 Devuelve lista filtrada por cliente usando el índice"""
         fake_order = MagicMock()
         fake_order.to_dict.return_value = {"id": "1", "id_client": "CLIENT-123"}
-        mock_scan.return_value = [fake_order]
+        mock_query.return_value = [fake_order]
 
         result = OrderModel.get_by_client("CLIENT-123")
         assert result[0]["id_client"] == "CLIENT-123"
-        mock_scan.assert_called_once()
+        mock_query.assert_called_once()
 
 
 # --- Extra: Validación de enums ---
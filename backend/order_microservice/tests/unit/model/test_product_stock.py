@@ -0,0 +1,38 @@
+import datetime
+from pynamodb.expressions.update import Update
+from src.models.product_stock import ProductStockModel
+
+
+class TestReservationsFor:
+    """🧪 Pruebas unitarias para ProductStockModel.reservations_for()"""
+
+    NOW = datetime.datetime(2025, 11, 5, tzinfo=datetime.timezone.utc)
+
+    def test_should_group_lines_by_warehouse_and_sku(self):
+        """✅ Agrupa las líneas repetidas en una sola reserva"""
+        reservations = ProductStockModel.reservations_for([
+            {"id": "P1", "id_warehouse": "W1", "amount": 2},
+            {"id": "P2", "id_warehouse": "W1", "amount": 1},
+            {"id": "P1", "id_warehouse": "W1", "amount": 3},
+            {"id": "P1", "id_warehouse": "W2", "amount": 1},
+        ], now=self.NOW)
+
+        keys = [(item.warehouse, item.sku, lines) for item, _, _, lines in reservations]
+        assert keys == [("W1", "P1", [0, 2]), ("W1", "P2", [1]), ("W2", "P1", [3])]
+
+    def test_should_decrement_stock_with_condition(self):
+        """✅ Descuenta el stock con ADD negativo y exige stock suficiente"""
+        (_, actions, condition, _), = ProductStockModel.reservations_for(
+            [{"id": "P1", "id_warehouse": "W1", "amount": 5}], now=self.NOW
+        )
+
+        names, values = {}, {}
+        expression = Update(*actions).serialize(names, values)
+        assert "ADD" in expression and {"N": "-5"} in values.values()
+
+        names, values = {}, {}
+        assert condition.serialize(names, values) == "(attribute_exists (#0) AND #1 >= :0)"
+        assert values == {":0": {"N": "5"}}
+
+    def test_should_return_empty_without_products(self):
+        assert ProductStockModel.reservations_for([]) == []
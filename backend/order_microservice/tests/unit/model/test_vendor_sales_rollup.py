@@ -0,0 +1,132 @@
+import datetime
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+from pynamodb.expressions.update import Update
+from src.models.vendor_sales_rollup import VendorSalesRollupModel
+
+
+def serialize(actions):
+    names, values = {}, {}
+    expression = Update(*actions).serialize(names, values)
+    return expression, {v: k for k, v in names.items()}, values
+
+
+def build_order(**overrides):
+    base = {
+        "id_vendor": "VENDOR-1",
+        "id_client": "CLIENT-1",
+        "created_at": datetime.datetime(2025, 11, 5, tzinfo=datetime.timezone.utc),
+        "products": [
+            {"id": "P-1", "name": "Mouse", "amount": 2, "unit_price": 10.5},
+            {"id": "P-2", "name": "Keyboard", "amount": 1, "unit_price": 40.0},
+            {"id": "P-1", "name": "Mouse", "amount": 1, "unit_price": 10.5},
+        ],
+    }
+    base.update(overrides)
+    return SimpleNamespace(**base)
+
+
+def added(actions):
+    expression, names, values = serialize(actions)
+    adds = expression.split("ADD ")[1].split(" SET ")[0] if "ADD " in expression else ""
+    return {
+        names[name]: values[value]
+        for name, value in (pair.split(" ") for pair in adds.split(", ") if pair)
+    }
+
+
+class TestIncrementsFor:
+    """🧪 Pruebas unitarias para VendorSalesRollupModel.increments_for()"""
+
+    def test_should_target_all_time_and_month(self):
+        """✅ Un ítem de totales por periodo: el histórico y el mes de la orden"""
+        updates, markers = VendorSalesRollupModel.increments_for(build_order())
+
+        assert [(r.id_vendor, r.period) for r, _ in updates] == [("VENDOR-1", "ALL"), ("VENDOR-1", "2025-11")]
+        assert markers == []
+
+    def test_should_add_totals_and_group_repeated_products(self):
+        """✅ Usa ADD atómico sobre los totales y agrupa productos repetidos en la orden"""
+        updates, _ = VendorSalesRollupModel.increments_for(build_order())
+
+        for _, actions in updates:
+            assert added(actions) == {
+                "order_count": {"N": "1"},
+                "total_units": {"N": "4"},
+                "total_value": {"N": "71.5"},
+                "units#P-1": {"N": "3"},
+                "value#P-1": {"N": "31.5"},
+                "units#P-2": {"N": "1"},
+                "value#P-2": {"N": "40.0"},
+            }
+            _, names, values = serialize(actions)
+            assert "name#P-1" in names.values()
+            assert {"S": "Mouse"} in values.values()
+
+    def test_should_count_client_once_per_new_period(self):
+        """✅ Suma 1 a `customers` y crea la marca condicional solo en los periodos nuevos del cliente"""
+        updates, markers = VendorSalesRollupModel.increments_for(build_order(), new_client_periods={"2025-11"})
+
+        assert "customers" not in added(updates[0][1])
+        assert added(updates[1][1])["customers"] == {"N": "1"}
+        assert [(m.id_vendor, m.period) for m, _ in markers] == [("VENDOR-1", "2025-11#client#CLIENT-1")]
+        assert markers[0][1].operator == "attribute_not_exists"
+
+
+class TestNewClientPeriods:
+    """🧪 Pruebas unitarias para VendorSalesRollupModel.new_client_periods()"""
+
+    @patch.object(VendorSalesRollupModel, "batch_get")
+    def test_should_return_periods_without_marker(self, mock_batch_get):
+        """✅ Lee las marcas en un solo BatchGetItem y retorna los periodos sin marca"""
+        mock_batch_get.return_value = [VendorSalesRollupModel("VENDOR-1", "ALL#client#CLIENT-1")]
+
+        assert VendorSalesRollupModel.new_client_periods(build_order()) == {"2025-11"}
+        mock_batch_get.assert_called_once_with(
+            [("VENDOR-1", "ALL#client#CLIENT-1"), ("VENDOR-1", "2025-11#client#CLIENT-1")],
+            attributes_to_get=["id_vendor", "period"],
+        )
+
+    @patch.object(VendorSalesRollupModel, "batch_get")
+    def test_should_skip_lookup_without_client(self, mock_batch_get):
+        """✅ Sin cliente no hay nada que contar"""
+        assert VendorSalesRollupModel.new_client_periods(build_order(id_client=None)) == set()
+        mock_batch_get.assert_not_called()
+
+
+class TestRebuild:
+    """🧪 Pruebas unitarias para VendorSalesRollupModel.rebuild()"""
+
+    @patch.object(VendorSalesRollupModel, "query")
+    @patch.object(VendorSalesRollupModel, "batch_write")
+    def test_should_replace_rollups_with_absolute_totals(self, mock_batch_write, mock_query):
+        """✅ Recalcula los totales por periodo y borra los ítems que ya no corresponden"""
+        batch = MagicMock()
+        mock_batch_write.return_value.__enter__.return_value = batch
+        mock_query.return_value = [
+            VendorSalesRollupModel("VENDOR-1", "ALL"),
+            VendorSalesRollupModel("VENDOR-1", "ALL#product#P-1"),
+        ]
+        orders = [
+            build_order(),
+            build_order(id_client="CLIENT-2", products=[{"id": "P-2", "name": "Keyboard", "amount": 2, "unit_price": 40.0}]),
+            build_order(created_at=datetime.datetime(2025, 12, 1, tzinfo=datetime.timezone.utc)),
+            build_order(id_vendor=None),
+        ]
+
+        result = VendorSalesRollupModel.rebuild(orders)
+
+        saved = {r.period: r for r in (call.args[0] for call in batch.save.call_args_list)}
+        assert set(saved) == {
+            "ALL", "2025-11", "2025-12",
+            "ALL#client#CLIENT-1", "ALL#client#CLIENT-2", "2025-11#client#CLIENT-1",
+            "2025-11#client#CLIENT-2", "2025-12#client#CLIENT-1",
+        }
+        totals = saved["ALL"]
+        assert (totals.order_count, totals.customers, totals.total_units, totals.total_value) == (3, 2, 10, 223.0)
+        assert (saved["2025-12"].order_count, saved["2025-12"].customers) == (1, 1)
+        item = totals.serialize()
+        assert (item["units#P-2"], item["value#P-2"], item["name#P-2"]) == ({"N": "4"}, {"N": "160.0"}, {"S": "Keyboard"})
+        assert [call.args[0].period for call in batch.delete.call_args_list] == ["ALL#product#P-1"]
+        mock_query.assert_called_once_with("VENDOR-1", attributes_to_get=["id_vendor", "period"])
+        assert result == {"vendors": 1, "written": 8, "deleted": 1}
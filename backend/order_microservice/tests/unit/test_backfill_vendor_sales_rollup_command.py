@@ -0,0 +1,26 @@
+import pytest
+from unittest.mock import patch
+from src.commands.backfill_vendor_sales_rollup import BackfillVendorSalesRollup, ROLLUP_ATTRIBUTES
+from src.errors.errors import ApiError
+
+
+class TestBackfillVendorSalesRollupCommand:
+    # ✅ Reconstruye los acumulados con el scan de Orders
+    @patch("src.commands.backfill_vendor_sales_rollup.VendorSalesRollupModel.rebuild")
+    @patch("src.commands.backfill_vendor_sales_rollup.OrderModel.scan")
+    def test_execute_reconstruye_desde_orders(self, mock_scan, mock_rebuild):
+        """✅ Escanea solo los atributos necesarios y delega en rebuild"""
+        mock_rebuild.return_value = {"vendors": 2, "written": 7, "deleted": 1}
+
+        result = BackfillVendorSalesRollup().execute()
+
+        mock_scan.assert_called_once_with(attributes_to_get=ROLLUP_ATTRIBUTES)
+        mock_rebuild.assert_called_once_with(mock_scan.return_value)
+        assert result == {"vendors": 2, "written": 7, "deleted": 1}
+
+    # ❌ Error de DynamoDB
+    @patch("src.commands.backfill_vendor_sales_rollup.OrderModel.scan", side_effect=Exception("DB error"))
+    def test_execute_error(self, mock_scan):
+        """❌ Debe lanzar ApiError si falla la reconstrucción"""
+        with pytest.raises(ApiError, match="Error al reconstruir los acumulados"):
+            BackfillVendorSalesRollup().execute()
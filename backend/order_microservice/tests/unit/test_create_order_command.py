@@ -2,7 +2,8 @@ import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
 from src.commands.create_order import CreateOrder
-from src.errors.errors import ParamError, ApiError
+from src.errors.errors import ParamError, ApiError, ConflictError, InsufficientStockError
+from src.models.idempotency_key import COMPLETED, request_fingerprint
 from src.models.order import NewOrderJsonSchema
 
 
@@ -70,3 +71,119 @@ class TestCreateOrderCommand:
 
         with pytest.raises(ApiError, match="Error al crear orden"):
             command.execute()
+
+    # 📦 Stock insuficiente
+    @patch("src.commands.create_order.OrderModel")
+    def test_execute_stock_insuficiente(self, mock_order_model):
+        """❌ Propaga las líneas sin stock sin envolverlas en ApiError"""
+        failed = [{"line": 0, "id": "P-1", "id_warehouse": "W-001", "amount": 9}]
+        mock_order_model.create.side_effect = InsufficientStockError(failed)
+
+        with pytest.raises(InsufficientStockError) as excinfo:
+            CreateOrder({"products": [], "date_estimated": "2025-11-10"}).execute()
+
+        assert excinfo.value.failed_lines == failed
+
+
+class TestCreateOrderIdempotency:
+    """🧪 Creación idempotente con Idempotency-Key"""
+
+    BODY = {
+        "priority": "HIGH",
+        "products": [{"id": "P-1", "name": "Mouse", "amount": 1, "id_warehouse": "W-001", "unit_price": 25.0}],
+        "date_estimated": "2025-11-10",
+        "id_client": "CLIENT-123",
+        "id_vendor": "VENDOR-456",
+    }
+
+    def mock_order(self):
+        order = MagicMock(id="ORDER-1")
+        order.to_dict.return_value = {"id": "ORDER-1"}
+        return order
+
+    @patch("src.commands.create_order.IdempotencyKeyModel")
+    @patch("src.commands.create_order.OrderModel")
+    def test_primera_solicitud_reclama_llave_y_guarda_respuesta(self, mock_order_model, mock_keys):
+        """✅ La primera solicitud crea la orden y guarda la respuesta"""
+        mock_order_model.create.return_value = self.mock_order()
+        mock_keys.find.return_value = None
+        claimed = mock_keys.claim.return_value
+
+        command = CreateOrder(dict(self.BODY), idempotency_key="user#abc")
+        result = command.execute()
+
+        assert result["order"]["id"] == "ORDER-1"
+        assert command.replayed is False
+        mock_keys.claim.assert_called_once_with("user#abc", request_fingerprint(self.BODY))
+        claimed.complete.assert_called_once_with("ORDER-1", result)
+
+    @patch("src.commands.create_order.IdempotencyKeyModel")
+    @patch("src.commands.create_order.OrderModel")
+    def test_reintento_devuelve_respuesta_guardada(self, mock_order_model, mock_keys):
+        """♻️ Un reintento devuelve la respuesta original sin crear otra orden"""
+        stored = {"message": "Orden creada exitosamente.", "order": {"id": "ORDER-1"}}
+        mock_keys.find.return_value = MagicMock(
+            request_hash=request_fingerprint(self.BODY), status=COMPLETED, order_id="ORDER-1",
+            **{"stored_response.return_value": stored, "lease_expired.return_value": False},
+        )
+
+        command = CreateOrder(dict(self.BODY), idempotency_key="user#abc")
+        result = command.execute()
+
+        assert result == stored
+        assert command.replayed is True
+        mock_order_model.create.assert_not_called()
+        mock_keys.claim.assert_not_called()
+
+    @patch("src.commands.create_order.IdempotencyKeyModel")
+    @patch("src.commands.create_order.OrderModel")
+    def test_llave_en_proceso_lanza_conflicto(self, mock_order_model, mock_keys):
+        """⏳ Si otra solicitud ganó la llave y sigue en curso, responde conflicto"""
+        mock_keys.find.side_effect = [None, MagicMock(request_hash=request_fingerprint(self.BODY), status="IN_PROGRESS")]
+        mock_keys.claim.return_value = None
+
+        with pytest.raises(ConflictError, match="se está procesando"):
+            CreateOrder(dict(self.BODY), idempotency_key="user#abc").execute()
+
+        mock_order_model.create.assert_not_called()
+
+    @patch("src.commands.create_order.IdempotencyKeyModel")
+    @patch("src.commands.create_order.OrderModel")
+    def test_llave_abandonada_se_vuelve_a_reclamar(self, mock_order_model, mock_keys):
+        """🔁 Si el worker que reclamó la llave murió (lease vencido), el reintento crea la orden"""
+        mock_order_model.create.return_value = self.mock_order()
+        mock_keys.find.return_value = MagicMock(
+            request_hash=request_fingerprint(self.BODY), status="IN_PROGRESS", **{"lease_expired.return_value": True},
+        )
+        claimed = mock_keys.claim.return_value
+
+        result = CreateOrder(dict(self.BODY), idempotency_key="user#abc").execute()
+
+        assert result["order"]["id"] == "ORDER-1"
+        mock_keys.claim.assert_called_once_with("user#abc", request_fingerprint(self.BODY))
+        claimed.complete.assert_called_once_with("ORDER-1", result)
+
+    @patch("src.commands.create_order.IdempotencyKeyModel")
+    @patch("src.commands.create_order.OrderModel")
+    def test_llave_con_otro_cuerpo_lanza_param_error(self, mock_order_model, mock_keys):
+        """❌ Reutilizar la llave con otro cuerpo es un error del cliente"""
+        mock_keys.find.return_value = MagicMock(request_hash="otro", status=COMPLETED)
+
+        with pytest.raises(ParamError, match="cuerpo diferente"):
+            CreateOrder(dict(self.BODY), idempotency_key="user#abc").execute()
+
+        mock_order_model.create.assert_not_called()
+
+    @patch("src.commands.create_order.IdempotencyKeyModel")
+    @patch("src.commands.create_order.OrderModel")
+    def test_error_al_crear_libera_llave(self, mock_order_model, mock_keys):
+        """🔓 Si la creación falla, la llave se libera para permitir el reintento"""
+        mock_order_model.create.side_effect = Exception("Falla en DynamoDB")
+        mock_keys.find.return_value = None
+        claimed = mock_keys.claim.return_value
+
+        with pytest.raises(ApiError, match="Error al crear orden"):
+            CreateOrder(dict(self.BODY), idempotency_key="user#abc").execute()
+
+        claimed.release.assert_called_once()
+        claimed.complete.assert_not_called()
@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from src.commands.view_all import GetAllOrders
-from src.errors.errors import ApiError
+from src.errors.errors import ApiError, ParamError
+from src.utils.pagination import encode_cursor
 
 
 class TestGetAllOrdersCommand:
@@ -50,3 +51,48 @@ class TestGetAllOrdersCommand:
 
         with pytest.raises(ApiError, match="Error al obtener órdenes"):
             command.execute()
+
+    # 📄 Caso paginado: retorna una página y el cursor siguiente
+    @patch("src.commands.view_all.OrderModel")
+    def test_execute_paginado(self, mock_order_model):
+        """📄 Debe retornar items y next_cursor cuando se envía limit"""
+        last_key = {"id": {"S": "ORDER-2"}}
+        mock_order_model.get_page.return_value = ([{"id": "ORDER-1"}, {"id": "ORDER-2"}], last_key)
+
+        result = GetAllOrders(limit="2").execute()
+
+        assert result["items"] == [{"id": "ORDER-1"}, {"id": "ORDER-2"}]
+        assert result["next_cursor"] == encode_cursor(last_key)
+        mock_order_model.get_page.assert_called_once_with(2, None)
+        mock_order_model.scan.assert_not_called()
+
+    # 📄 Última página: sin next_cursor
+    @patch("src.commands.view_all.OrderModel")
+    def test_execute_ultima_pagina(self, mock_order_model):
+        """📄 Debe continuar desde el cursor y no devolver next_cursor al final"""
+        start_key = {"id": {"S": "ORDER-2"}}
+        mock_order_model.get_page.return_value = ([{"id": "ORDER-3"}], None)
+
+        result = GetAllOrders(cursor=encode_cursor(start_key)).execute()
+
+        assert result["next_cursor"] is None
+        mock_order_model.get_page.assert_called_once_with(50, start_key)
+
+    # 🚫 Parámetros de paginación inválidos
+    def test_execute_limit_invalido(self):
+        """🚫 Debe lanzar ParamError si el limit no es válido"""
+        with pytest.raises(ParamError, match="limit"):
+            GetAllOrders(limit="0").execute()
+
+    # 📤 Exportación en streaming
+    @patch("src.commands.view_all.OrderModel")
+    def test_stream_recorre_scan_perezosamente(self, mock_order_model):
+        """📤 stream() debe devolver un generador sobre el scan"""
+        mock_order = MagicMock()
+        mock_order.to_dict.return_value = {"id": "ORDER-1"}
+        mock_order_model.scan.return_value = iter([mock_order])
+
+        result = GetAllOrders().stream()
+
+        assert not isinstance(result, list)
+        assert list(result) == [{"id": "ORDER-1"}]
@@ -1,4 +1,3 @@
-import uuid
 import traceback
 import datetime
 from flask import jsonify, Blueprint, request
@@ -6,11 +5,16 @@ from flask import jsonify, Blueprint, request
 from ..commands.ping import PingCommand
 from ..models.product import NewProductJsonSchema
 from ..models.product_mirror import ProductMirrorModel
-from ..errors.errors import ParamError, ApiError
+from ..errors.errors import ParamError, ApiError, NotFoundError
 from ..commands.create_product import CreateProduct
-from ..commands.create_products_bulk import CreateProductsBulk
+from ..commands.bulk_jobs import SubmitProductsBulkJob, GetBulkJob
+from ..commands.update_stock_bulk import UpdateStockBulk
+from ..commands.upsert_product_mirrors import UpsertProductMirrors
 from ..queries.search_products import SearchProductsQuery
 from ..queries.get_product_detail import GetProductDetailQuery
+from ..queries.product_search_index import search_index
+from ..queries.warehouse_cache import warehouse_cache
+from ..utils.streaming import wants_ndjson, ndjson_response
 
 from flask_cognito import cognito_auth_required
 
@@ -46,12 +50,18 @@ def create_product():
 @products_blueprint.get("/")
 @cognito_auth_required
 def get_all_products():
-    products = SearchProductsQuery(
+    query = SearchProductsQuery(
         product_name=request.args.get("product_name"),
         batch=request.args.get("batch"),
         status=request.args.get("status"),
         warehouse_name=request.args.get("warehouse_name"),
-    ).execute()
+        limit=request.args.get("limit"),
+        cursor=request.args.get("cursor"),
+    )
+    if wants_ndjson(request):
+        return ndjson_response(query.stream())
+
+    products = query.execute()
     return jsonify(products), 200
 
 
@@ -70,12 +80,11 @@ def bulk_upload_products():
             return jsonify({"error": "Debe adjuntar un archivo CSV o Excel"}), 400
 
         file = request.files["file"]
-        file_bytes = file.read()
-        filename = file.filename
         warehouse = request.form.get("warehouse", "1")
 
-        result = CreateProductsBulk(file_bytes, filename, warehouse).execute()
-        return jsonify(result), 200
+        # El archivo se procesa en segundo plano; el progreso se consulta en /bulk/<job_id>
+        job = SubmitProductsBulkJob(file, warehouse).execute()
+        return jsonify(job), 202
 
     except ApiError as e:
         return jsonify({"error": str(e)}), 400
@@ -83,35 +92,52 @@ def bulk_upload_products():
         return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
 
 
+@products_blueprint.get("/bulk/<string:job_id>")
+@cognito_auth_required
+def get_bulk_upload_job(job_id):
+    try:
+        return jsonify(GetBulkJob(job_id).execute()), 200
+
+    except NotFoundError as e:
+        return jsonify({"error": e.description}), 404
+
+
+@products_blueprint.post("/stock")
+@cognito_auth_required
+def update_stock_bulk():
+    try:
+        body = request.get_json(silent=True) or {}
+        result = UpdateStockBulk(body.get("items")).execute()
+        return jsonify(result), 200
+
+    except ParamError as e:
+        return jsonify({"error": str(e)}), 400
+    except ApiError as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @products_blueprint.post("/mirrors")
 @cognito_auth_required
 def create_product_mirror():
     body = request.get_json()
 
-    # Convertir fecha de expiración a formato ISO string
-    expiration_date_obj = datetime.datetime.strptime(body["expiration_date"], "%Y-%m-%d").date()
-    formatted_date = expiration_date_obj.isoformat()
-
-    product_mirror = ProductMirrorModel(
-        id=str(uuid.uuid4()),
-        sku=body["sku"],
-        provider_nit=body["provider_nit"],
-        name=body["name"],
-        product_type=body["product_type"],
-        stock=body["stock"],
-        expiration_date=formatted_date,
-        temperature_required=body["temperature_required"],
-        batch=body["batch"],
-        status=body["status"],
-        unit_value=body["unit_value"],
-        storage_conditions=body["storage_conditions"],
-        warehouse=body["warehouse"],
-        warehouse_name=body["warehouse_name"],
-        warehouse_address=body["warehouse_address"],
-        warehouse_country=body["warehouse_country"],
-        warehouse_city=body["warehouse_city"],
-        created_at=datetime.datetime.now(datetime.timezone.utc),
-        updated_at=datetime.datetime.now(datetime.timezone.utc),
-    )
+    # El id es warehouse#sku: reenviar el mismo producto reemplaza su espejo
+    product_mirror = ProductMirrorModel.from_json(body, warehouse_cache.get(body.get("warehouse")))
     product_mirror.save()
+    ProductMirrorModel.bump_version()
+    search_index.upsert(product_mirror.to_dict())
     return jsonify(product_mirror.to_dict()), 200
+
+
+@products_blueprint.post("/mirrors/bulk")
+@cognito_auth_required
+def upsert_product_mirrors():
+    try:
+        body = request.get_json(silent=True) or {}
+        result = UpsertProductMirrors(body.get("items")).execute()
+        return jsonify(result), 200
+
+    except ParamError as e:
+        return jsonify({"error": str(e)}), 400
+    except ApiError as e:
+        return jsonify({"error": str(e)}), 500
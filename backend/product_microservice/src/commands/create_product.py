@@ -3,6 +3,7 @@ import datetime
 from .base_command import BaseCommannd
 from ..errors.errors import ParamError, ApiError
 from ..models.product import ProductModel
+from ..queries.warehouse_cache import warehouse_cache
 
 logger = logging.getLogger(__name__)
 
@@ -59,6 +60,10 @@ class CreateProduct(BaseCommannd):
         if self.stock < 1:
             raise ParamError("El stock debe ser mayor o igual a 1.")
 
+        # Bodega (desde la caché en memoria, sin ir a DynamoDB)
+        if warehouse_cache.get(self.warehouse) is None:
+            raise ParamError(f"La bodega {self.warehouse} no existe.")
+
     # ----------------------------------------------------------
     def save_or_update(self):
         """Guarda o actualiza un producto existente (sumando stock si ya existe)."""
@@ -68,10 +73,11 @@ class CreateProduct(BaseCommannd):
 
             # 🔁 Si ya existe → actualiza stock
             if existing_product:
-                new_stock = existing_product.stock + self.stock
-                logger.info(f"🔁 Actualizando stock de {self.name} a {new_stock}")
+                logger.info(f"🔁 Sumando {self.stock} unidades al stock de {self.name}")
 
+                # `update` refresca el ítem con el stock resultante del ADD atómico
                 existing_product.update_stock(self.stock)
+                new_stock = int(existing_product.stock)
                 return {"message": f"Stock actualizado a {new_stock} unidades para {self.name}."}
 
             # 🆕 Crear nuevo producto
@@ -82,6 +88,7 @@ class CreateProduct(BaseCommannd):
             expiration_str = self.expiration_date.isoformat() if hasattr(self.expiration_date, 'isoformat') else str(self.expiration_date)
 
             # Crear nueva instancia del modelo
+            now = datetime.datetime.now(datetime.timezone.utc)
             product = ProductModel(
                 warehouse=self.warehouse,
                 sku=self.sku,
@@ -95,7 +102,9 @@ class CreateProduct(BaseCommannd):
                 status=self.status,
                 unit_value=self.unit_value,
                 storage_conditions=self.storage_conditions,
-                created_at=datetime.datetime.now(datetime.timezone.utc),
+                # `updated_at` desde la creación: el proyector en modo polling filtra por él
+                created_at=now,
+                updated_at=now,
             )
 
             logger.info(f"🧾 Guardando producto en DynamoDB: {self.name}")
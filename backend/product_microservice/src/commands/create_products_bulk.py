@@ -1,27 +1,42 @@
 import io
 import uuid
 import logging
-import pandas as pd
 import time
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 from .base_command import BaseCommannd
 from ..errors.errors import ApiError
 from ..models.product import ProductModel
+from ..queries.warehouse_cache import warehouse_cache
+
+# pandas/numpy se importan al primer uso: los workers que no atienden /bulk no los cargan
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 logger = logging.getLogger(__name__)
 
+EXPECTED_COLUMNS = {
+    "provider_nit", "name", "product_type", "stock", "expiration_date",
+    "temperature_required", "batch", "status", "unit_value", "storage_conditions"
+}
+TEXT_FIELDS = ["provider_nit", "name", "product_type", "batch", "status", "storage_conditions"]
+NUMERIC_FIELDS = ["stock", "unit_value", "temperature_required"]
+
 
 class CreateProductsBulk(BaseCommannd):
-    def __init__(self, file_bytes, filename, warehouse="1"):
+    def __init__(self, file_bytes, filename, warehouse="1", file_path=None):
         self.file_bytes = file_bytes
         self.filename = filename
         self.warehouse = warehouse
+        # Si el archivo se guardó en disco se lee desde ahí, sin cargarlo completo en memoria
+        self.file_path = file_path
 
     # ----------------------------------------------------------
     def execute(self):
         start = time.time()
         try:
+            self.check_upload()
             df = self._read_file()
             result = self._process(df)
             result["tiempo_seg"] = round(time.time() - start, 2)
@@ -30,119 +45,157 @@ class CreateProductsBulk(BaseCommannd):
             logger.error(f"❌ Error en carga masiva: {e}")
             raise ApiError(str(e))
 
+    # ----------------------------------------------------------
+    def check_upload(self):
+        """Validaciones baratas antes de aceptar la carga (formato y bodega)."""
+        if not self.filename.endswith((".csv", ".xlsx")):
+            raise ApiError("Formato no soportado. Usa CSV o XLSX.")
+        if warehouse_cache.get(self.warehouse) is None:
+            raise ApiError(f"La bodega {self.warehouse} no existe.")
+
+    # ----------------------------------------------------------
+    def execute_in_chunks(self, chunk_rows, on_chunk):
+        """
+        Procesa el archivo por bloques de `chunk_rows` filas (validar y guardar) y
+        reporta cada bloque con on_chunk(total, procesados, exitosos, rechazados_detalle).
+        Cada bloque se guarda antes de leer el siguiente, así la memoria no crece con el archivo.
+        """
+        for total, chunk in self._read_chunks(chunk_rows):
+            result = self._process(chunk)
+            on_chunk(total, len(chunk), result["exitosos"], result["rechazados_detalle"])
+
+    # ----------------------------------------------------------
+    def _source(self):
+        return self.file_path or io.BytesIO(self.file_bytes)
+
     # ----------------------------------------------------------
     def _read_file(self):
         """Lee archivo CSV o Excel."""
+        import pandas as pd
+
         try:
             if self.filename.endswith(".csv"):
-                df = pd.read_csv(io.BytesIO(self.file_bytes))
+                df = pd.read_csv(self._source())
             elif self.filename.endswith(".xlsx"):
-                df = pd.read_excel(io.BytesIO(self.file_bytes))
+                df = pd.read_excel(self._source())
             else:
                 raise ApiError("Formato no soportado. Usa CSV o XLSX.")
         except Exception as e:
             raise ApiError(f"Error al leer archivo: {e}")
 
-        expected = {
-            "provider_nit", "name", "product_type", "stock", "expiration_date",
-            "temperature_required", "batch", "status", "unit_value", "storage_conditions"
-        }
+        return self._normalize_columns(df)
+
+    # ----------------------------------------------------------
+    def _read_chunks(self, chunk_rows):
+        """
+        Genera (total, bloque) de a `chunk_rows` filas. El CSV se lee en streaming y su
+        total no se conoce hasta terminar (None); el XLSX (un zip) se lee completo.
+        """
+        import pandas as pd
+
+        if not self.filename.endswith(".csv"):
+            df = self._read_file()
+            for start in range(0, len(df), chunk_rows):
+                yield len(df), df.iloc[start:start + chunk_rows]
+            return
+
+        try:
+            reader = pd.read_csv(self._source(), chunksize=chunk_rows)
+        except Exception as e:
+            raise ApiError(f"Error al leer archivo: {e}")
+
+        with reader:
+            for chunk in reader:
+                yield None, self._normalize_columns(chunk)
 
+    # ----------------------------------------------------------
+    @staticmethod
+    def _normalize_columns(df: "pd.DataFrame"):
         df.columns = df.columns.str.lower().str.strip()
-        missing = expected - set(df.columns)
+        missing = EXPECTED_COLUMNS - set(df.columns)
         if missing:
             raise ApiError(f"Faltan columnas: {', '.join(missing)}")
 
         return df
 
     # ----------------------------------------------------------
-    def _process(self, df: pd.DataFrame):
-        valid = []
-        invalid = []
-
-        for _, row in df.iterrows():
-            provider_nit = str(row.get("provider_nit", "")).strip()
-            name = str(row.get("name", "")).strip()
-            product_type = str(row.get("product_type", "")).strip()
-            batch = str(row.get("batch", "")).strip()
-            status = str(row.get("status", "")).strip()
-            storage_conditions = str(row.get("storage_conditions", "")).strip()
-
-            try:
-                stock = int(row.get("stock", 0))
-                unit_value = float(row.get("unit_value", 0))
-                temperature_required = float(row.get("temperature_required", 0))
-            except Exception:
-                invalid.append({**row.to_dict(), "error": "Campos numéricos inválidos"})
-                continue
-
-            # 🧩 Validaciones
-            if not all([provider_nit, name, product_type, batch, status, storage_conditions]):
-                invalid.append({**row.to_dict(), "error": "Campos obligatorios faltantes"})
-                continue
-
-            if stock < 1:
-                invalid.append({**row.to_dict(), "error": "Stock debe ser positivo"})
-                continue
-
-            if unit_value <= 0:
-                invalid.append({**row.to_dict(), "error": "Valor unitario debe ser mayor que 0"})
-                continue
-
-            try:
-                expiration_date = datetime.strptime(str(row["expiration_date"]), "%Y-%m-%d").date()
-                # Usar UTC para consistencia entre entornos (local UTC-5, GitHub Actions UTC+0)
-                current_date_utc = datetime.now(timezone.utc).date()
-                if expiration_date <= current_date_utc:
-                    invalid.append({**row.to_dict(), "error": "Fecha de vencimiento inválida"})
-                    continue
-            except Exception:
-                invalid.append({**row.to_dict(), "error": "Formato de fecha inválido (YYYY-MM-DD)"})
-                continue
-
-            # Generar SKU único
-            sku = uuid.uuid4().hex
-
-            # 🔍 Validar duplicados
-            try:
-                existing_product = ProductModel.find_existing_product(self.warehouse, sku)
-                if existing_product:
-                    invalid.append({**row.to_dict(), "error": "Duplicado en base de datos"})
-                    continue
-            except Exception as e:
-                invalid.append({**row.to_dict(), "error": f"Error al verificar duplicados: {e}"})
-                continue
-
-            # Crear instancia del modelo ProductModel
-            product_data = {
-                "warehouse": self.warehouse,
-                "sku": sku,
-                "provider_nit": provider_nit,
-                "name": name,
-                "product_type": product_type,
-                "stock": stock,
-                "expiration_date": expiration_date.isoformat(),
-                "temperature_required": temperature_required,
-                "batch": batch,
-                "status": status,
-                "unit_value": unit_value,
-                "storage_conditions": storage_conditions,
-                "created_at": datetime.now(timezone.utc)
-            }
-            valid.append(product_data)
-
-        # 💾 Guardar válidos usando ProductModel
+    def _validate(self, df: "pd.DataFrame"):
+        """
+        Valida todo el DataFrame por columnas (sin iterar filas).
+        Retorna (productos válidos, filas rechazadas con su motivo).
+        """
+        import numpy as np
+        import pandas as pd
+
+        text = pd.DataFrame({
+            col: df[col].fillna("").astype(str).str.strip() for col in TEXT_FIELDS
+        }, index=df.index)
+        numbers = pd.DataFrame({
+            col: pd.to_numeric(df[col], errors="coerce") for col in NUMERIC_FIELDS
+        }, index=df.index)
+        expiration = pd.to_datetime(
+            df["expiration_date"].astype(str).str.strip(), format="%Y-%m-%d", errors="coerce"
+        )
+
+        # Usar UTC para consistencia entre entornos (local UTC-5, GitHub Actions UTC+0)
+        today = pd.Timestamp(datetime.now(timezone.utc).date())
+
+        # 🧩 Validaciones (el orden define el motivo reportado)
+        checks = [
+            (~np.isfinite(numbers).all(axis=1), "Campos numéricos inválidos"),
+            (text.eq("").any(axis=1), "Campos obligatorios faltantes"),
+            (numbers["stock"] < 1, "Stock debe ser positivo"),
+            (numbers["unit_value"] <= 0, "Valor unitario debe ser mayor que 0"),
+            (expiration.isna(), "Formato de fecha inválido (YYYY-MM-DD)"),
+            (expiration <= today, "Fecha de vencimiento inválida"),
+        ]
+        errors = pd.Series(
+            np.select([mask.to_numpy() for mask, _ in checks], [reason for _, reason in checks], default=""),
+            index=df.index,
+        )
+        rejected_mask = errors != ""
+
+        rejected = df[rejected_mask].astype(object)
+        rejected = rejected.where(rejected.notna(), None).assign(error=errors[rejected_mask])
+
+        accepted = ~rejected_mask
+        columns = {col: text.loc[accepted, col].tolist() for col in TEXT_FIELDS}
+        columns["stock"] = numbers.loc[accepted, "stock"].astype(int).tolist()
+        columns["unit_value"] = numbers.loc[accepted, "unit_value"].astype(float).tolist()
+        columns["temperature_required"] = numbers.loc[accepted, "temperature_required"].astype(float).tolist()
+        columns["expiration_date"] = expiration[accepted].dt.strftime("%Y-%m-%d").tolist()
+        columns["sku"] = self._generate_skus(int(accepted.sum()))
+
+        # `updated_at` desde la creación: el proyector en modo polling filtra por él
+        created_at = datetime.now(timezone.utc)
+        valid = [
+            {**dict(zip(columns, values)), "warehouse": self.warehouse, "created_at": created_at, "updated_at": created_at}
+            for values in zip(*columns.values())
+        ]
+
+        return valid, rejected.to_dict("records")
+
+    # ----------------------------------------------------------
+    @staticmethod
+    def _generate_skus(count: int):
+        """Genera `count` SKUs UUID4 en hexadecimal, igual que la creación individual."""
+        return [uuid.uuid4().hex for _ in range(count)]
+
+    # ----------------------------------------------------------
+    def _process(self, df: "pd.DataFrame"):
+        valid, invalid = self._validate(df)
+
+        # 💾 Guardar válidos en bloques de 25 con BatchWriteItem
         if valid:
-            for product_data in valid:
-                try:
-                    # Crear y guardar cada producto usando el modelo
-                    product = ProductModel(**product_data)
-                    product.save()
-                except Exception as e:
-                    logger.error(f"❌ Error al guardar producto {product_data.get('name', 'unknown')}: {e}")
-                    # Si falla el guardado, mover de valid a invalid
-                    invalid.append({**product_data, "error": f"Error al guardar: {e}"})
-                    valid.remove(product_data)
+            products = [ProductModel(**product_data) for product_data in valid]
+            failed = {product.sku: error for product, error in ProductModel.batch_save(products)}
+            if failed:
+                for product_data in valid:
+                    error = failed.get(product_data["sku"])
+                    if error:
+                        logger.error(f"❌ Error al guardar producto {product_data['name']}: {error}")
+                        invalid.append({**product_data, "error": f"Error al guardar: {error}"})
+                valid = [p for p in valid if p["sku"] not in failed]
 
         total = len(df)
         success = len(valid)
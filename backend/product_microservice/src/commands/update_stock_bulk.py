@@ -0,0 +1,56 @@
+import logging
+from .base_command import BaseCommannd
+from ..errors.errors import ParamError, ApiError
+from ..models.product import ProductModel
+
+logger = logging.getLogger(__name__)
+
+MAX_STOCK_ITEMS = 1000
+
+
+class UpdateStockBulk(BaseCommannd):
+    """
+    Aplica ajustes de stock (recepción en bodega, devoluciones) a muchos productos a la vez.
+    Cada ajuste es un ADD atómico, por lo que las recepciones concurrentes no se pisan.
+    """
+
+    def __init__(self, items):
+        self.items = items
+
+    def execute(self):
+        deltas = self.validate()
+        try:
+            updated, failed = ProductModel.batch_update_stock(deltas)
+        except Exception as e:
+            logger.error(f"❌ Error al actualizar stock: {e}")
+            raise ApiError(f"Error al actualizar stock: {str(e)}")
+
+        logger.info(f"📦 Stock actualizado: {len(updated)} productos, {len(failed)} con error")
+        return {
+            "updated": [
+                {"warehouse": warehouse, "sku": sku, "stock": stock}
+                for (warehouse, sku), stock in updated.items()
+            ],
+            "failed": [
+                {"warehouse": warehouse, "sku": sku, "error": error}
+                for (warehouse, sku), error in failed
+            ],
+        }
+
+    def validate(self):
+        if not isinstance(self.items, list) or not self.items:
+            raise ParamError("El campo 'items' debe ser una lista no vacía.")
+        if len(self.items) > MAX_STOCK_ITEMS:
+            raise ParamError(f"El campo 'items' admite máximo {MAX_STOCK_ITEMS} elementos.")
+
+        deltas = []
+        for position, item in enumerate(self.items):
+            warehouse = str(item.get("warehouse") or "").strip() if isinstance(item, dict) else ""
+            sku = str(item.get("sku") or "").strip() if isinstance(item, dict) else ""
+            amount = item.get("amount") if isinstance(item, dict) else None
+            if not warehouse or not sku:
+                raise ParamError(f"items[{position}]: 'warehouse' y 'sku' son obligatorios.")
+            if isinstance(amount, bool) or not isinstance(amount, int) or amount == 0:
+                raise ParamError(f"items[{position}]: 'amount' debe ser un entero distinto de cero.")
+            deltas.append((warehouse, sku, amount))
+        return deltas
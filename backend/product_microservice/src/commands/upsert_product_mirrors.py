@@ -0,0 +1,57 @@
+import logging
+from collections import OrderedDict
+from .base_command import BaseCommannd
+from ..errors.errors import ParamError, ApiError
+from ..models.product_mirror import ProductMirrorModel
+from ..queries.product_search_index import search_index
+from ..queries.warehouse_cache import warehouse_cache
+
+logger = logging.getLogger(__name__)
+
+MAX_MIRROR_ITEMS = 1000
+
+
+class UpsertProductMirrors(BaseCommannd):
+    """
+    Sincroniza muchos espejos de producto con BatchWriteItem.
+    Cada producto queda en un solo registro (warehouse#sku), así que reenviar
+    el catálogo completo no crea duplicados.
+    """
+
+    def __init__(self, items):
+        self.items = items
+
+    def execute(self):
+        mirrors = self.validate()
+        try:
+            ProductMirrorModel.batch_upsert(mirrors)
+        except Exception as e:
+            logger.error(f"❌ Error al sincronizar espejos: {e}")
+            raise ApiError(f"Error al sincronizar espejos: {str(e)}")
+
+        for mirror in mirrors:
+            search_index.upsert(mirror.to_dict())
+
+        logger.info(f"🪞 Espejos sincronizados: {len(mirrors)}")
+        return {"upserted": len(mirrors), "ids": [mirror.id for mirror in mirrors]}
+
+    def validate(self):
+        if not isinstance(self.items, list) or not self.items:
+            raise ParamError("El campo 'items' debe ser una lista no vacía.")
+        if len(self.items) > MAX_MIRROR_ITEMS:
+            raise ParamError(f"El campo 'items' admite máximo {MAX_MIRROR_ITEMS} elementos.")
+
+        # BatchWriteItem rechaza llaves repetidas en un mismo request: gana la última
+        mirrors = OrderedDict()
+        for position, item in enumerate(self.items):
+            if not isinstance(item, dict):
+                raise ParamError(f"items[{position}]: debe ser un objeto.")
+            try:
+                mirror = ProductMirrorModel.from_json(item, warehouse_cache.get(item.get("warehouse")))
+            except KeyError as e:
+                raise ParamError(f"items[{position}]: el campo {e} es obligatorio.")
+            except (TypeError, ValueError):
+                raise ParamError(f"items[{position}]: 'expiration_date' debe tener formato YYYY-MM-DD.")
+            mirrors.pop(mirror.id, None)
+            mirrors[mirror.id] = mirror
+        return list(mirrors.values())
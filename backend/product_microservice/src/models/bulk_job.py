@@ -0,0 +1,193 @@
+import os
+import json
+import datetime
+from uuid import uuid4
+from pynamodb.models import Model
+from pynamodb.exceptions import UpdateError
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute, BooleanAttribute, UTCDateTimeAttribute, TTLAttribute
+from .db import MAX_POOL_CONNECTIONS
+
+# Los jobs terminados se conservan una semana (DynamoDB borra el ítem al vencer el TTL)
+BULK_JOB_TTL_SECONDS = int(os.getenv("BULK_JOB_TTL_SECONDS", "604800"))
+# Filas rechazadas que se guardan con su motivo (el ítem de DynamoDB no puede pasar de 400 KB)
+MAX_STORED_REJECTED_ROWS = int(os.getenv("BULK_JOB_MAX_REJECTED_ROWS", "200"))
+# Un job sin latido por este tiempo quedó huérfano (el worker se reinició o se desplegó)
+BULK_JOB_STALE_SECONDS = int(os.getenv("BULK_JOB_STALE_SECONDS", "300"))
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class BulkJobModel(Model):
+    """
+    Modelo PynamoDB para los jobs de carga masiva de productos.
+    El único que escribe el progreso es el hilo que lo procesa, así que se
+    acumula en memoria y se guarda con un UpdateItem por bloque.
+
+    Los jobs corren dentro del worker web y se ejecutan a lo sumo una vez: si el
+    worker muere, el job deja de latir (`heartbeat_at`) y la consulta lo marca
+    FAILED. Las filas de los bloques ya reportados quedan guardadas; el resto
+    no se reintenta y hay que volver a subir el archivo con las filas faltantes.
+    """
+
+    class Meta:
+        table_name = os.getenv("DYNAMODB_BULK_JOBS_TABLE", "ProductBulkJobs")
+        region = os.getenv("AWS_REGION", "us-east-1")
+        host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
+        if os.getenv("APP_ENV") != "PROD":
+            aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
+            aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
+            aws_session_token = os.getenv("AWS_SESSION_TOKEN", None)
+
+    # Primary Key
+    job_id = UnicodeAttribute(hash_key=True)
+
+    status = UnicodeAttribute(default=PENDING)
+    filename = UnicodeAttribute()
+    warehouse = UnicodeAttribute(null=True)
+
+    # Progreso
+    total = NumberAttribute(null=True)
+    processed = NumberAttribute(default=0)
+    succeeded = NumberAttribute(default=0)
+    rejected = NumberAttribute(default=0)
+    rejected_rows = UnicodeAttribute(null=True)  # JSON con las primeras filas rechazadas
+    rejected_truncated = BooleanAttribute(default=False)
+    error = UnicodeAttribute(null=True)
+
+    # Timestamps
+    created_at = UTCDateTimeAttribute(null=True)
+    updated_at = UTCDateTimeAttribute(null=True)
+    finished_at = UTCDateTimeAttribute(null=True)
+    heartbeat_at = UTCDateTimeAttribute(null=True)
+    expires_at = TTLAttribute(null=True)
+
+    @classmethod
+    def create(cls, filename: str, warehouse: str = None):
+        job = cls(str(uuid4()), filename=filename, warehouse=warehouse, status=PENDING)
+        job.created_at = job.updated_at = job.heartbeat_at = _now()
+        job.expires_at = datetime.timedelta(seconds=BULK_JOB_TTL_SECONDS)
+        job.save()
+        return job
+
+    @classmethod
+    def find(cls, job_id: str):
+        try:
+            return cls.get(job_id)
+        except cls.DoesNotExist:
+            return None
+
+    @classmethod
+    def beat(cls, job_id: str):
+        """Renueva el latido de un job en cola o en curso sin tocar su progreso."""
+        try:
+            cls._get_connection().update_item(
+                job_id,
+                actions=[cls.heartbeat_at.set(_now())],
+                condition=cls.status.is_in(PENDING, RUNNING),
+            )
+        except UpdateError as e:
+            # El job ya terminó o fue marcado como huérfano
+            if e.cause_response_code != "ConditionalCheckFailedException":
+                raise
+
+    def expire_if_stale(self):
+        """Marca FAILED el job en cola o en curso cuyo worker dejó de latir."""
+        if self.status not in (PENDING, RUNNING):
+            return
+        now = _now()
+        cutoff = now - datetime.timedelta(seconds=BULK_JOB_STALE_SECONDS)
+        last_beat = self.heartbeat_at or self.updated_at
+        if last_beat is None or last_beat >= cutoff:
+            return
+        try:
+            self.update(
+                actions=[
+                    BulkJobModel.status.set(FAILED),
+                    BulkJobModel.error.set("El worker que procesaba la carga se detuvo; vuelva a subir el archivo."),
+                    BulkJobModel.updated_at.set(now),
+                    BulkJobModel.finished_at.set(now),
+                ],
+                # Un latido posterior a la lectura gana: el job sigue vivo
+                condition=BulkJobModel.status.is_in(PENDING, RUNNING) & (
+                    (BulkJobModel.heartbeat_at < cutoff)
+                    | (BulkJobModel.heartbeat_at.does_not_exist() & (BulkJobModel.updated_at < cutoff))
+                ),
+            )
+        except UpdateError as e:
+            if e.cause_response_code != "ConditionalCheckFailedException":
+                raise
+            self.refresh()
+
+    def start(self):
+        now = _now()
+        self.update(actions=[
+            BulkJobModel.status.set(RUNNING),
+            BulkJobModel.updated_at.set(now),
+            BulkJobModel.heartbeat_at.set(now),
+        ])
+
+    def record_chunk(self, total, processed, succeeded, rejected_rows):
+        """Suma el resultado de un bloque al progreso del job."""
+        stored = self.stored_rejected_rows()
+        room = MAX_STORED_REJECTED_ROWS - len(stored)
+        now = _now()
+        actions = [
+            BulkJobModel.processed.set(int(self.processed) + processed),
+            BulkJobModel.succeeded.set(int(self.succeeded) + succeeded),
+            BulkJobModel.rejected.set(int(self.rejected) + len(rejected_rows)),
+            BulkJobModel.rejected_rows.set(json.dumps(stored + rejected_rows[:max(room, 0)], default=str)),
+            BulkJobModel.rejected_truncated.set(bool(self.rejected_truncated) or len(rejected_rows) > room),
+            BulkJobModel.updated_at.set(now),
+            BulkJobModel.heartbeat_at.set(now),
+        ]
+        if total is not None:
+            actions.append(BulkJobModel.total.set(total))
+        self.update(actions=actions)
+
+    def finish(self):
+        now = _now()
+        self.update(actions=[
+            BulkJobModel.status.set(COMPLETED),
+            BulkJobModel.total.set(int(self.processed) if self.total is None else int(self.total)),
+            BulkJobModel.updated_at.set(now),
+            BulkJobModel.finished_at.set(now),
+        ])
+
+    def fail(self, error: str):
+        now = _now()
+        self.update(actions=[
+            BulkJobModel.status.set(FAILED),
+            BulkJobModel.error.set(error),
+            BulkJobModel.updated_at.set(now),
+            BulkJobModel.finished_at.set(now),
+        ])
+
+    def stored_rejected_rows(self):
+        return json.loads(self.rejected_rows) if self.rejected_rows else []
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "filename": self.filename,
+            "warehouse": self.warehouse,
+            "total_registros": int(self.total) if self.total is not None else None,
+            "procesados": int(self.processed),
+            "exitosos": int(self.succeeded),
+            "rechazados": int(self.rejected),
+            "rechazados_detalle": self.stored_rejected_rows(),
+            "rechazados_truncados": bool(self.rejected_truncated),
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+        }
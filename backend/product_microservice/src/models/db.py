@@ -1,6 +1,8 @@
 import boto3
 import os
 import logging
+import threading
+from botocore.config import Config
 
 # 🧩 Configuración del logger
 logger = logging.getLogger(__name__)
@@ -11,21 +13,89 @@ PK_NAME = "sku"
 DYNAMODB_ENDPOINT = os.getenv("DYNAMODB_ENDPOINT")
 
 
-def init_db():
+# ⚙️ Configuración del pool de conexiones (por worker)
+MAX_POOL_CONNECTIONS = int(os.getenv("BOTO_MAX_POOL_CONNECTIONS", "50"))
+TCP_KEEPALIVE = os.getenv("BOTO_TCP_KEEPALIVE", "true").lower() == "true"
+RETRY_MODE = os.getenv("BOTO_RETRY_MODE", "standard")
+MAX_ATTEMPTS = int(os.getenv("BOTO_MAX_ATTEMPTS", "3"))
+
+_lock = threading.Lock()
+_clients = {}
+_owner_pid = os.getpid()
+
+
+def _boto_config():
+    return Config(
+        region_name=REGION,
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        tcp_keepalive=TCP_KEEPALIVE,
+        retries={"mode": RETRY_MODE, "max_attempts": MAX_ATTEMPTS},
+    )
+
+
+def _connection_kwargs(service):
+    """Parámetros de conexión según el servicio y el entorno (local o AWS)."""
+    kwargs = {"region_name": REGION, "config": _boto_config()}
     # 💡 Si se define un endpoint local, usamos credenciales dummy
-    if DYNAMODB_ENDPOINT:
-        logger.info(f"🔗 Conectando a DynamoDB local en {DYNAMODB_ENDPOINT}")
-        dynamodb = boto3.client(
-            "dynamodb",
-            region_name=REGION,
+    if service in ("dynamodb", "dynamodbstreams") and DYNAMODB_ENDPOINT:
+        kwargs.update(
             endpoint_url=DYNAMODB_ENDPOINT,
             aws_access_key_id="dummy",
-            aws_secret_access_key="dummy"
+            aws_secret_access_key="dummy",
         )
+    return kwargs
+
+
+def _check_fork():
+    """Descarta las conexiones heredadas si el proceso fue bifurcado (p. ej. gunicorn --preload)."""
+    global _owner_pid
+    if _owner_pid != os.getpid():
+        reset_connections()
+        _owner_pid = os.getpid()
+
+
+def get_client(service="dynamodb"):
+    """Retorna el cliente boto3 compartido del worker (los clientes son thread-safe)."""
+    _check_fork()
+    client = _clients.get(service)
+    if client is None:
+        with _lock:
+            client = _clients.get(service)
+            if client is None:
+                logger.info(f"🔌 Creando cliente boto3 compartido para {service}")
+                client = boto3.client(service, **_connection_kwargs(service))
+                _clients[service] = client
+    return client
+
+
+def reset_connections():
+    """Descarta todas las conexiones cacheadas (útil en pruebas)."""
+    with _lock:
+        _clients.clear()
+
+
+def _reset_model_connections():
+    """
+    PynamoDB guarda una conexión por modelo; tras un fork (gunicorn --preload)
+    cada worker debe abrir la suya en vez de compartir los sockets del master.
+    """
+    from pynamodb.models import Model
+    pending = list(Model.__subclasses__())
+    while pending:
+        model = pending.pop()
+        model._connection = None
+        pending.extend(model.__subclasses__())
+
+
+os.register_at_fork(after_in_child=_reset_model_connections)
+
+
+def init_db():
+    if DYNAMODB_ENDPOINT:
+        logger.info(f"🔗 Conectando a DynamoDB local en {DYNAMODB_ENDPOINT}")
     else:
         logger.info(f"🌍 Conectando a DynamoDB real en AWS región {REGION}")
-        dynamodb = boto3.client("dynamodb", region_name=REGION)
-
+    dynamodb = get_client("dynamodb")
     existing_tables = dynamodb.list_tables().get("TableNames", [])
     if TABLE_NAME not in existing_tables:
         raise Exception(f"La tabla \"{TABLE_NAME}\" no existe")
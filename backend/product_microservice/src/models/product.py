@@ -1,10 +1,19 @@
 import os
+import time
+import random
 import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pynamodb.models import Model
+from pynamodb.exceptions import PutError, UpdateError
+from pynamodb.constants import BATCH_WRITE_PAGE_LIMIT, UNPROCESSED_ITEMS, PUT_REQUEST, ITEM
 from marshmallow import Schema, fields, validate, ValidationError
 from pynamodb.attributes import UnicodeAttribute, NumberAttribute, UTCDateTimeAttribute
 
 from ..errors.errors import ParamError
+from .db import MAX_POOL_CONNECTIONS
+
+STOCK_UPDATE_WORKERS = int(os.getenv("STOCK_UPDATE_WORKERS", "16"))
 
 
 class NewProductJsonSchema(Schema):
@@ -97,6 +106,7 @@ class ProductModel(Model):
         table_name = os.getenv("DYNAMODB_TABLE", "Products")
         region = os.getenv("AWS_REGION", "us-east-1")
         host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
             aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
@@ -130,10 +140,112 @@ class ProductModel(Model):
         except cls.DoesNotExist:
             return None
 
+    @classmethod
+    def batch_save(cls, products, max_retries=5, base_delay=0.05):
+        """
+        Persiste productos con BatchWriteItem en bloques de 25, reintentando
+        los `UnprocessedItems` con backoff exponencial (con jitter).
+        Retorna una lista de (producto, error) con los que no se pudieron guardar.
+        """
+        failed = []
+        for start in range(0, len(products), BATCH_WRITE_PAGE_LIMIT):
+            chunk = products[start:start + BATCH_WRITE_PAGE_LIMIT]
+            pending = {(product.warehouse, product.sku): product for product in chunk}
+            put_items = [product.serialize() for product in chunk]
+            attempt = 0
+
+            while put_items:
+                try:
+                    data = cls._get_connection().batch_write_item(put_items=put_items)
+                except PutError as e:
+                    failed.extend((pending[cls._item_key(item)], str(e)) for item in put_items)
+                    break
+
+                unprocessed = (data or {}).get(UNPROCESSED_ITEMS, {}).get(cls.Meta.table_name, [])
+                put_items = [request[PUT_REQUEST][ITEM] for request in unprocessed]
+                if not put_items:
+                    break
+
+                attempt += 1
+                if attempt > max_retries:
+                    error = f"No procesado por DynamoDB tras {max_retries} reintentos"
+                    failed.extend((pending[cls._item_key(item)], error) for item in put_items)
+                    break
+                time.sleep(base_delay * (2 ** (attempt - 1)) * random.uniform(1, 2))
+
+        return failed
+
+    @staticmethod
+    def _item_key(item):
+        return item["warehouse"]["S"], item["sku"]["S"]
+
+    @classmethod
+    def batch_update_stock(cls, deltas, max_workers=STOCK_UPDATE_WORKERS):
+        """
+        Aplica muchos ajustes de stock [(warehouse, sku, delta)] en paralelo,
+        cada uno con un UpdateItem atómico. Los ajustes a un mismo producto se suman antes
+        y las salidas que dejarían el stock en negativo se reportan como fallidas.
+        Retorna ({(warehouse, sku): nuevo_stock}, [((warehouse, sku), error)]).
+        """
+        grouped = OrderedDict()
+        for warehouse, sku, delta in deltas:
+            grouped[(warehouse, sku)] = grouped.get((warehouse, sku), 0) + int(delta)
+
+        updated, failed = {}, []
+        if not grouped:
+            return updated, failed
+
+        # Crear el cliente antes de repartirlo entre hilos
+        connection = cls._get_connection()
+        _ = connection.connection.client
+
+        def apply(item):
+            (warehouse, sku), delta = item
+            condition = cls.sku.exists()
+            # Las salidas de stock no pueden dejarlo en negativo
+            if delta < 0:
+                condition &= cls.stock >= -delta
+            try:
+                data = connection.update_item(
+                    warehouse,
+                    range_key=sku,
+                    actions=cls._stock_actions(delta),
+                    condition=condition,
+                    return_values="UPDATED_NEW",
+                )
+                return (warehouse, sku), int(data["Attributes"]["stock"]["N"]), None
+            except UpdateError as e:
+                if e.cause_response_code == "ConditionalCheckFailedException":
+                    if delta < 0:
+                        return (warehouse, sku), None, "Producto no encontrado o stock insuficiente"
+                    return (warehouse, sku), None, "Producto no encontrado"
+                return (warehouse, sku), None, str(e)
+            except Exception as e:
+                # Un error en un ítem no debe abortar los demás ajustes en curso
+                return (warehouse, sku), None, str(e)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(grouped))) as executor:
+            for key, stock, error in executor.map(apply, grouped.items()):
+                if error:
+                    failed.append((key, error))
+                else:
+                    updated[key] = stock
+
+        return updated, failed
+
+    @classmethod
+    def _stock_actions(cls, delta):
+        """ADD stock :n SET updated_at = :t"""
+        return [cls.stock.add(int(delta)), cls.updated_at.set(datetime.datetime.now(datetime.timezone.utc))]
+
     def update_stock(self, additional_stock):
-        self.stock = int(self.stock) + int(additional_stock)
-        self.updated_at = datetime.datetime.now(datetime.timezone.utc)
-        self.save()
+        """Suma stock con un UpdateItem atómico; no reescribe el ítem ni pierde incrementos concurrentes."""
+        if additional_stock < 1:
+            raise ParamError("El stock a sumar debe ser mayor o igual a 1.")
+        self.update(
+            actions=self._stock_actions(additional_stock),
+            condition=ProductModel.sku.exists(),
+        )
 
     def to_dict(self):
         return {
@@ -1,6 +1,31 @@
 import os
+import datetime
 from pynamodb.models import Model
+from pynamodb.expressions.operand import Path, Value
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
 from pynamodb.attributes import UnicodeAttribute, NumberAttribute, UTCDateTimeAttribute
+from .db import MAX_POOL_CONNECTIONS
+
+# Ítem con el sello de versión de la tabla (se incrementa en cada escritura de espejos)
+VERSION_ITEM_ID = "#version"
+
+
+def mirror_id(warehouse: str, sku: str) -> str:
+    """Id determinista del espejo: un solo registro por producto en cada bodega."""
+    return f"{warehouse}#{sku}"
+
+
+class SkuIndex(GlobalSecondaryIndex):
+    """GSI sku + name para el detalle de producto (resultados ya ordenados por nombre)"""
+
+    class Meta:
+        index_name = "sku-name-index"
+        projection = AllProjection()
+        read_capacity_units = 5
+        write_capacity_units = 5
+
+    sku = UnicodeAttribute(hash_key=True)
+    name = UnicodeAttribute(range_key=True)
 
 
 class ProductMirrorModel(Model):
@@ -11,6 +36,7 @@ class ProductMirrorModel(Model):
         table_name = os.getenv("DYNAMODB_PRODUCTS_MIRROR_TABLE", "ProductsMirror")
         region = os.getenv("AWS_REGION", "us-east-1")
         host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
             aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
@@ -41,6 +67,121 @@ class ProductMirrorModel(Model):
     warehouse_country = UnicodeAttribute()
     warehouse_city = UnicodeAttribute()
 
+    # Índices
+    sku_index = SkuIndex()
+
+    @classmethod
+    def from_product(cls, product, warehouse=None):
+        """
+        Construye el espejo de un ProductModel con los datos de su bodega.
+        Si la bodega no existe se conserva su id como nombre y el resto vacío.
+        """
+        return cls(
+            id=mirror_id(product.warehouse, product.sku),
+            sku=product.sku,
+            provider_nit=product.provider_nit,
+            name=product.name,
+            product_type=product.product_type,
+            stock=product.stock,
+            expiration_date=product.expiration_date,
+            temperature_required=product.temperature_required,
+            batch=product.batch,
+            status=product.status,
+            unit_value=product.unit_value,
+            storage_conditions=product.storage_conditions,
+            created_at=product.created_at,
+            updated_at=product.updated_at,
+            warehouse=product.warehouse,
+            warehouse_name=warehouse.name if warehouse else product.warehouse,
+            warehouse_address=warehouse.address if warehouse else "",
+            warehouse_country=warehouse.country if warehouse else "",
+            warehouse_city=warehouse.city if warehouse else "",
+        )
+
+    @classmethod
+    def from_json(cls, body: dict, warehouse=None):
+        """
+        Construye el espejo desde el cuerpo de /mirrors. El id es warehouse#sku, así
+        que volver a sincronizar el mismo producto reemplaza su registro.
+        Los datos de la bodega salen de `warehouse` (la caché) y, si no se conoce, del cuerpo.
+        """
+        def warehouse_field(name):
+            value = getattr(warehouse, name) if warehouse is not None else body.get(f"warehouse_{name}")
+            if value is None:
+                raise KeyError(f"warehouse_{name}")
+            return value
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        expiration_date = datetime.datetime.strptime(body["expiration_date"], "%Y-%m-%d").date()
+        return cls(
+            id=mirror_id(body["warehouse"], body["sku"]),
+            sku=body["sku"],
+            provider_nit=body["provider_nit"],
+            name=body["name"],
+            product_type=body["product_type"],
+            stock=body["stock"],
+            expiration_date=expiration_date.isoformat(),
+            temperature_required=body["temperature_required"],
+            batch=body["batch"],
+            status=body["status"],
+            unit_value=body["unit_value"],
+            storage_conditions=body["storage_conditions"],
+            warehouse=body["warehouse"],
+            warehouse_name=warehouse_field("name"),
+            warehouse_address=warehouse_field("address"),
+            warehouse_country=warehouse_field("country"),
+            warehouse_city=warehouse_field("city"),
+            created_at=now,
+            updated_at=now,
+        )
+
+    @classmethod
+    def delete_legacy(cls):
+        """
+        Elimina los espejos con id aleatorio (anteriores a warehouse#sku) que
+        duplican productos. Retorna la cantidad de registros eliminados.
+        """
+        stale = [
+            mirror.id
+            for mirror in cls.scan(cls.id != VERSION_ITEM_ID, attributes_to_get=["id", "warehouse", "sku"])
+            if mirror.id != mirror_id(mirror.warehouse, mirror.sku)
+        ]
+        cls.batch_upsert([], stale)
+        return len(stale)
+
+    @classmethod
+    def batch_upsert(cls, mirrors, deleted_ids=()):
+        """
+        Reemplaza y elimina espejos con BatchWriteItem (bloques de 25; PynamoDB
+        reintenta los `UnprocessedItems`).
+        """
+        if not mirrors and not deleted_ids:
+            return
+        with cls.batch_write() as batch:
+            for mirror in mirrors:
+                batch.save(mirror)
+            for deleted_id in deleted_ids:
+                batch.delete(cls(deleted_id))
+        cls.bump_version()
+
+    @classmethod
+    def get_all(cls):
+        return cls.scan(cls.id != VERSION_ITEM_ID)
+
+    @classmethod
+    def current_version(cls):
+        """Sello de versión de los espejos (0 si nunca se ha modificado)."""
+        item = cls._get_connection().get_item(VERSION_ITEM_ID, attributes_to_get=["version"]).get("Item") or {}
+        return int(item["version"]["N"]) if "version" in item else 0
+
+    @classmethod
+    def bump_version(cls):
+        """Incrementa el sello con un ADD atómico para que los índices de búsqueda de cada worker se refresquen."""
+        cls._get_connection().update_item(
+            VERSION_ITEM_ID,
+            actions=[Path(["version"]).add(Value(1, attribute=NumberAttribute()))],
+        )
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -0,0 +1,44 @@
+import os
+import datetime
+from pynamodb.models import Model
+from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute
+from .db import MAX_POOL_CONNECTIONS
+
+
+class ProjectorCheckpointModel(Model):
+    """
+    Modelo PynamoDB para la posición de lectura del proyector de cambios.
+    Un ítem por fuente (proyector#tabla) y shard, con el último cambio ya aplicado.
+    """
+
+    class Meta:
+        table_name = os.getenv("DYNAMODB_PROJECTOR_CHECKPOINTS_TABLE", "ProjectorCheckpoints")
+        region = os.getenv("AWS_REGION", "us-east-1")
+        host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
+        if os.getenv("APP_ENV") != "PROD":
+            aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
+            aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
+            aws_session_token = os.getenv("AWS_SESSION_TOKEN", None)
+
+    # Primary Key
+    source = UnicodeAttribute(hash_key=True)
+    shard_id = UnicodeAttribute(range_key=True)
+
+    # Número de secuencia (Streams) o marca de tiempo (polling)
+    position = UnicodeAttribute()
+    updated_at = UTCDateTimeAttribute(null=True)
+
+    @classmethod
+    def load(cls, source: str):
+        """Retorna {shard_id: position} con las posiciones guardadas de una fuente."""
+        return {checkpoint.shard_id: checkpoint.position for checkpoint in cls.query(source)}
+
+    @classmethod
+    def store(cls, source: str, shard_id: str, position: str):
+        cls(
+            source,
+            shard_id,
+            position=position,
+            updated_at=datetime.datetime.now(datetime.timezone.utc),
+        ).save()
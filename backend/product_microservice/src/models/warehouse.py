@@ -2,10 +2,16 @@ import os
 import datetime
 from uuid import uuid4
 from pynamodb.models import Model
+from pynamodb.exceptions import PutError
+from pynamodb.expressions.operand import Path, Value
 from marshmallow import Schema, fields, validate, ValidationError
 from pynamodb.attributes import UnicodeAttribute, NumberAttribute, UTCDateTimeAttribute
 
 from ..errors.errors import ParamError
+from .db import MAX_POOL_CONNECTIONS
+
+# Ítem con el sello de versión de la tabla (se incrementa en cada cambio de bodegas)
+VERSION_ITEM_ID = "#version"
 
 
 class NewWarehouseSchema(Schema):
@@ -32,6 +38,7 @@ class WarehouseModel(Model):
         table_name = os.getenv("DYNAMODB_WAREHOUSE_TABLE", "Warehouses")
         region = os.getenv("AWS_REGION", "us-east-1")
         host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
             aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
@@ -57,11 +64,26 @@ class WarehouseModel(Model):
         warehouse.id = str(uuid4())
         warehouse.created_at = warehouse.updated_at = datetime.datetime.now(datetime.timezone.utc)
         warehouse.save()
+        cls.bump_version()
         return warehouse
 
     @classmethod
     def get_all(cls):
-        return list(cls.scan())
+        return list(cls.scan(cls.id != VERSION_ITEM_ID))
+
+    @classmethod
+    def current_version(cls):
+        """Sello de versión de las bodegas (0 si nunca se ha modificado)."""
+        item = cls._get_connection().get_item(VERSION_ITEM_ID, attributes_to_get=["version"]).get("Item") or {}
+        return int(item["version"]["N"]) if "version" in item else 0
+
+    @classmethod
+    def bump_version(cls):
+        """Incrementa el sello con un ADD atómico para que los demás workers recarguen su caché."""
+        cls._get_connection().update_item(
+            VERSION_ITEM_ID,
+            actions=[Path(["version"]).add(Value(1, attribute=NumberAttribute()))],
+        )
 
     def to_dict(self):
         return {
@@ -77,6 +99,11 @@ class WarehouseModel(Model):
 
     @classmethod
     def populate(cls):
+        """
+        Siembra la bodega principal con un put condicional: solo la crea si no existe,
+        así que varios workers o contenedores pueden llamarlo sin reescribirla.
+        Retorna True si la creó.
+        """
         main_warehouse = cls(
             id="1",
             name="Bodega Principal",
@@ -87,4 +114,11 @@ class WarehouseModel(Model):
             created_at=datetime.datetime.now(datetime.timezone.utc),
             updated_at=datetime.datetime.now(datetime.timezone.utc),
         )
-        main_warehouse.save()
+        try:
+            main_warehouse.save(condition=cls.id.does_not_exist())
+        except PutError as e:
+            if e.cause_response_code == "ConditionalCheckFailedException":
+                return False
+            raise
+        cls.bump_version()
+        return True
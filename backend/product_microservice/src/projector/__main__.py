@@ -0,0 +1,69 @@
+"""
+Proyector de ProductsMirror. Se ejecuta como proceso aparte de la API:
+
+    python -m src.projector
+
+PROJECTOR_SOURCE=streams lee DynamoDB Streams; PROJECTOR_SOURCE=polling escanea
+las tablas por `updated_at` (por defecto cuando se usa DYNAMODB_ENDPOINT local).
+"""
+import os
+import time
+import logging
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from ..models.product import ProductModel  # noqa: E402
+from ..models.warehouse import WarehouseModel  # noqa: E402
+from ..models.product_mirror import ProductMirrorModel  # noqa: E402
+from ..models.projector_checkpoint import ProjectorCheckpointModel  # noqa: E402
+from .change_feed import StreamsReader, PollingReader  # noqa: E402
+from .mirror_projector import MirrorProjector, run_once  # noqa: E402
+
+logger = logging.getLogger("products_projector")
+
+PROJECTOR_NAME = "products-mirror"
+POLL_SECONDS = float(os.getenv("PROJECTOR_POLL_SECONDS", "1"))
+
+
+def build_readers():
+    default_source = "polling" if os.getenv("DYNAMODB_ENDPOINT") else "streams"
+    source = os.getenv("PROJECTOR_SOURCE", default_source)
+    # Las bodegas primero: sus cambios reproyectan productos que quizá también cambiaron
+    models = [WarehouseModel, ProductModel]
+
+    if source == "polling":
+        logger.info("🔁 Proyector en modo polling (sin DynamoDB Streams)")
+        return [
+            PollingReader(model, ProjectorCheckpointModel, f"{PROJECTOR_NAME}#{model.Meta.table_name}")
+            for model in models
+        ]
+
+    logger.info("🌊 Proyector leyendo DynamoDB Streams")
+    return [
+        StreamsReader(model.Meta.table_name, ProjectorCheckpointModel, f"{PROJECTOR_NAME}#{model.Meta.table_name}")
+        for model in models
+    ]
+
+
+def main():
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+    readers = build_readers()
+    projector = MirrorProjector()
+
+    # Los espejos con id aleatorio duplican productos que ahora viven en warehouse#sku
+    removed = ProductMirrorModel.delete_legacy()
+    if removed:
+        logger.info(f"🧹 {removed} espejos con id anterior eliminados")
+
+    while True:
+        try:
+            run_once(readers, projector)
+        except Exception as e:
+            logger.exception(f"❌ Error proyectando cambios: {e}")
+        # Siempre se espera entre lecturas: en modo polling cada lectura es un scan de la tabla
+        time.sleep(POLL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import json
+import logging
+from collections import namedtuple
+from botocore.exceptions import ClientError
+
+from ..models.db import get_client
+
+logger = logging.getLogger(__name__)
+
+UPSERT = "UPSERT"
+REMOVE = "REMOVE"
+
+# Marca de un shard cerrado y leído por completo
+SHARD_END = "SHARD_END"
+
+# Cambio normalizado: tabla, tipo, llave ({atributo: valor}) e imagen nueva en formato DynamoDB (None si se eliminó)
+ChangeEvent = namedtuple("ChangeEvent", ["table", "kind", "keys", "image"])
+
+
+def _plain_keys(raw_keys):
+    # Las llaves de Products y Warehouses son strings: {"sku": {"S": "x"}} -> {"sku": "x"}
+    return {name: next(iter(value.values())) for name, value in raw_keys.items()}
+
+
+class StreamsReader:
+    """
+    Lee los cambios de una tabla desde DynamoDB Streams, shard por shard.
+    Cada shard retoma después del último número de secuencia guardado y los
+    shards hijos se leen solo cuando su padre terminó, para conservar el orden por llave.
+    """
+
+    def __init__(self, table_name, checkpoints, source, batch_size=100, dynamodb=None, streams=None):
+        self.table_name = table_name
+        self.source = source
+        self.batch_size = batch_size
+        self._checkpoints = checkpoints
+        self._dynamodb = dynamodb or get_client("dynamodb")
+        self._streams = streams or get_client("dynamodbstreams")
+        self._stream_arn = None
+        self._committed = None
+        self._positions = {}
+        self._iterators = {}
+
+    def read(self):
+        """Retorna los cambios nuevos de todos los shards disponibles."""
+        if self._committed is None:
+            self._committed = dict(self._checkpoints.load(self.source))
+
+        events = []
+        shards = self._describe_shards()
+        open_ids = {shard["ShardId"] for shard in shards if self._position(shard["ShardId"]) != SHARD_END}
+        for shard in shards:
+            shard_id = shard["ShardId"]
+            if shard_id not in open_ids or shard.get("ParentShardId") in open_ids:
+                continue
+            events.extend(self._read_shard(shard_id))
+        return events
+
+    def commit(self):
+        """Guarda las posiciones leídas; se llama después de aplicar los cambios."""
+        for shard_id, position in self._positions.items():
+            if self._committed.get(shard_id) != position:
+                self._checkpoints.store(self.source, shard_id, position)
+                self._committed[shard_id] = position
+        self._positions = {}
+
+    def rewind(self):
+        """Descarta lo leído sin aplicar; la próxima lectura retoma desde lo guardado."""
+        self._positions = {}
+        self._iterators = {}
+
+    # ----------------------------------------------------------
+    def _position(self, shard_id):
+        return self._positions.get(shard_id, self._committed.get(shard_id))
+
+    def _describe_shards(self):
+        if self._stream_arn is None:
+            table = self._dynamodb.describe_table(TableName=self.table_name)["Table"]
+            self._stream_arn = table.get("LatestStreamArn")
+            if not self._stream_arn:
+                raise RuntimeError(f"La tabla {self.table_name} no tiene DynamoDB Streams activo")
+
+        shards, params = [], {"StreamArn": self._stream_arn}
+        while True:
+            description = self._streams.describe_stream(**params)["StreamDescription"]
+            shards.extend(description.get("Shards", []))
+            last = description.get("LastEvaluatedShardId")
+            if not last:
+                return shards
+            params["ExclusiveStartShardId"] = last
+
+    def _iterator(self, shard_id):
+        iterator = self._iterators.get(shard_id)
+        if iterator:
+            return iterator
+        params = {"StreamArn": self._stream_arn, "ShardId": shard_id}
+        position = self._position(shard_id)
+        if position:
+            params.update(ShardIteratorType="AFTER_SEQUENCE_NUMBER", SequenceNumber=position)
+        else:
+            params.update(ShardIteratorType="TRIM_HORIZON")
+        return self._streams.get_shard_iterator(**params)["ShardIterator"]
+
+    def _read_shard(self, shard_id):
+        try:
+            response = self._streams.get_records(ShardIterator=self._iterator(shard_id), Limit=self.batch_size)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ExpiredIteratorException":
+                raise
+            # Los iteradores vencen a los 15 minutos: se pide otro desde la última posición
+            self._iterators.pop(shard_id, None)
+            response = self._streams.get_records(ShardIterator=self._iterator(shard_id), Limit=self.batch_size)
+
+        events = []
+        for record in response.get("Records", []):
+            change = record["dynamodb"]
+            kind = REMOVE if record["eventName"] == "REMOVE" else UPSERT
+            image = change.get("NewImage") if kind == UPSERT else None
+            events.append(ChangeEvent(self.table_name, kind, _plain_keys(change["Keys"]), image))
+            self._positions[shard_id] = change["SequenceNumber"]
+
+        next_iterator = response.get("NextShardIterator")
+        if next_iterator:
+            self._iterators[shard_id] = next_iterator
+        else:
+            self._iterators.pop(shard_id, None)
+            self._positions[shard_id] = SHARD_END
+            logger.info(f"🏁 Shard {shard_id} de {self.table_name} leído por completo")
+        return events
+
+
+class PollingReader:
+    """
+    Sustituto local de Streams (dynamodb-local): escanea la tabla buscando ítems
+    con `updated_at` igual o posterior al último visto. La posición guarda esa marca
+    de tiempo y las llaves ya entregadas con ella: así no se pierden escrituras con
+    la misma marca ni se reemiten las ya aplicadas. No detecta eliminaciones.
+    """
+
+    SHARD_ID = "scan"
+
+    def __init__(self, model, checkpoints, source):
+        self.model = model
+        self.table_name = model.Meta.table_name
+        self.source = source
+        self._checkpoints = checkpoints
+        self._committed = None
+        self._pending = None
+
+    def read(self):
+        if self._committed is None:
+            self._committed = _parse_position(self._checkpoints.load(self.source).get(self.SHARD_ID))
+
+        stamp, seen = self._pending or self._committed or (None, frozenset())
+        condition = None
+        if stamp:
+            condition = self.model.updated_at >= self.model.updated_at.deserialize(stamp)
+
+        events = []
+        latest, latest_keys = stamp, set(seen)
+        for item in self.model.scan(filter_condition=condition):
+            image = item.serialize()
+            keys = {name: image[name]["S"] for name in self._key_names()}
+            key = tuple(keys.values())
+            item_stamp = image.get("updated_at", {}).get("S")
+            if item_stamp == stamp and key in seen:
+                continue
+            events.append(ChangeEvent(self.table_name, UPSERT, keys, image))
+            # El formato de UTCDateTimeAttribute ordena igual como texto que como fecha
+            if item_stamp and (latest is None or item_stamp > latest):
+                latest, latest_keys = item_stamp, {key}
+            elif item_stamp and item_stamp == latest:
+                latest_keys.add(key)
+
+        if events and latest:
+            self._pending = (latest, frozenset(latest_keys))
+        return events
+
+    def commit(self):
+        if self._pending and self._pending != self._committed:
+            self._checkpoints.store(self.source, self.SHARD_ID, _format_position(*self._pending))
+            self._committed = self._pending
+        self._pending = None
+
+    def rewind(self):
+        self._pending = None
+
+    def _key_names(self):
+        keys = [self.model._hash_keyname]
+        if self.model._range_keyname:
+            keys.append(self.model._range_keyname)
+        return keys
+
+
+def _format_position(stamp, keys):
+    return json.dumps({"updated_at": stamp, "keys": sorted(list(key) for key in keys)}, separators=(",", ":"))
+
+
+def _parse_position(position):
+    """(updated_at, llaves ya entregadas con esa marca); acepta la marca sola del formato anterior."""
+    if not position:
+        return None
+    if not position.startswith("{"):
+        return position, frozenset()
+    data = json.loads(position)
+    return data["updated_at"], frozenset(tuple(key) for key in data["keys"])
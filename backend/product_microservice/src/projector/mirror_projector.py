@@ -0,0 +1,86 @@
+import logging
+from collections import OrderedDict
+
+from ..models.product import ProductModel
+from ..models.warehouse import WarehouseModel, VERSION_ITEM_ID
+from ..models.product_mirror import ProductMirrorModel, mirror_id
+from ..queries.warehouse_cache import warehouse_cache
+from .change_feed import UPSERT, REMOVE
+
+logger = logging.getLogger(__name__)
+
+
+class MirrorProjector:
+    """
+    Proyecta los cambios de Products y Warehouses sobre ProductsMirror.
+    Cada lote se reduce al último cambio por llave, se une con los datos de la
+    bodega y se escribe con BatchWriteItem. Las escrituras son idempotentes, así que
+    reaplicar un lote (entrega al menos una vez) deja el espejo igual.
+    Las bodegas que no vienen en el lote se leen de la caché en memoria.
+    """
+
+    def apply(self, events):
+        """Aplica un lote de cambios y retorna {"upserted": n, "removed": m}."""
+        products = OrderedDict()  # (warehouse, sku) -> ProductModel | None si se eliminó
+        warehouses = {}
+
+        for event in events:
+            if event.table == ProductModel.Meta.table_name:
+                key = (event.keys["warehouse"], event.keys["sku"])
+                products[key] = ProductModel.from_raw_data(event.image) if event.kind == UPSERT else None
+            elif event.keys.get("id") == VERSION_ITEM_ID:
+                continue
+            elif event.table == WarehouseModel.Meta.table_name and event.kind == UPSERT:
+                warehouse = WarehouseModel.from_raw_data(event.image)
+                warehouses[warehouse.id] = warehouse
+            elif event.kind == REMOVE:
+                logger.warning(f"⚠️ Bodega {event.keys.get('id')} eliminada; sus espejos se conservan")
+
+        # Un cambio en la bodega reproyecta todos sus productos (warehouse es la llave de partición)
+        for warehouse_id in warehouses:
+            for product in ProductModel.query(warehouse_id):
+                products[(product.warehouse, product.sku)] = product
+
+        upserts = [product for product in products.values() if product is not None]
+        removed = [mirror_id(*key) for key, product in products.items() if product is None]
+
+        for warehouse_id in {product.warehouse for product in upserts} - set(warehouses):
+            warehouses[warehouse_id] = warehouse_cache.get(warehouse_id)
+
+        mirrors = []
+        for product in upserts:
+            mirror = ProductMirrorModel.from_product(product, warehouses.get(product.warehouse))
+            try:
+                mirror.serialize()
+            except ValueError as e:
+                # Un ítem incompleto no debe bloquear el resto del flujo
+                logger.error(f"❌ Producto {product.warehouse}/{product.sku} omitido del espejo: {e}")
+                continue
+            mirrors.append(mirror)
+
+        ProductMirrorModel.batch_upsert(mirrors, removed)
+        return {"upserted": len(mirrors), "removed": len(removed)}
+
+
+def run_once(readers, projector):
+    """
+    Lee, aplica y confirma los cambios de cada fuente. Si el lote falla, la
+    fuente vuelve a su última posición guardada para reintentarlo.
+    Retorna la cantidad de cambios aplicados.
+    """
+    applied = 0
+    for reader in readers:
+        events = reader.read()
+        try:
+            if events:
+                result = projector.apply(events)
+                logger.info(
+                    f"🪞 {reader.table_name}: {len(events)} cambios -> "
+                    f"{result['upserted']} espejos actualizados, {result['removed']} eliminados"
+                )
+            reader.commit()
+        except Exception:
+            reader.rewind()
+            raise
+        applied += len(events)
+    return applied
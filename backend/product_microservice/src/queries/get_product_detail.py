@@ -7,8 +7,9 @@ class GetProductDetailQuery:
 
     def execute(self):
         """Obtener los productos que coinciden con el SKU dado."""
-        products = ProductMirrorModel.scan(ProductMirrorModel.sku == self.sku)
+        products = ProductMirrorModel.sku_index.query(self.sku)
 
+        # El índice ordena por nombre (binario); el sort solo corrige mayúsculas/minúsculas
         sorted_products = [product.to_dict() for product in products]
         sorted_products.sort(key=lambda p: p.get("name", "").lower())
 
@@ -0,0 +1,246 @@
+import os
+import time
+import logging
+import threading
+import unicodedata
+from bisect import bisect_right
+from collections import defaultdict
+from ..models.product_mirror import ProductMirrorModel
+
+logger = logging.getLogger(__name__)
+
+NGRAM_SIZE = 3
+TEXT_FIELDS = ("name", "warehouse_name")  # Búsqueda por subcadena
+EXACT_FIELDS = ("batch", "status")  # Igualdad sin distinguir mayúsculas
+CHECK_SECONDS = float(os.getenv("SEARCH_INDEX_CHECK_SECONDS", "5"))
+
+
+def normalize(value):
+    """Minúsculas y sin tildes, para comparar sin distinguir mayúsculas ni acentos."""
+    text = unicodedata.normalize("NFKD", str(value or "")).casefold()
+    return "".join(char for char in text if not unicodedata.combining(char)).strip()
+
+
+def sort_key(product):
+    """Orden de los resultados: por nombre y, a igual nombre, por id."""
+    return ((product.get("name") or "").lower(), product["id"])
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+def _prefixes(text):
+    """Prefijos cortos de cada palabra, para consultas de menos de NGRAM_SIZE caracteres."""
+    return {"^" + word[:size] for word in text.split() for size in range(1, NGRAM_SIZE)}
+
+
+class ProductSearchIndex:
+    """
+    Índice invertido en memoria (por worker) sobre ProductsMirror.
+    Se carga con un scan la primera vez que se usa y se actualiza con cada escritura
+    de espejos en este worker. Cada CHECK_SECONDS lee el sello de versión de los
+    espejos (un GetItem) y solo si otro worker o el proyector escribió se reconstruye
+    en segundo plano. Sin `version_reader` solo se recarga con clear().
+    """
+
+    def __init__(self, loader=None, version_reader=None, check_seconds=CHECK_SECONDS, clock=time.monotonic):
+        self._loader = loader or (lambda: (product.to_dict() for product in ProductMirrorModel.get_all()))
+        self._version_reader = version_reader
+        self._check_seconds = check_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._version = None
+        self._checked_at = None
+        self._refreshing = False
+        self._pending = []  # (id, producto | None si se eliminó) escritos durante una reconstrucción
+        self._reset()
+
+    def _reset(self):
+        self._docs = {}
+        self._grams = {field: defaultdict(set) for field in TEXT_FIELDS}
+        self._values = {field: defaultdict(set) for field in EXACT_FIELDS}
+        self._sorted_keys = None
+
+    # ----------------------------------------------------------
+    def upsert(self, product: dict):
+        """Agrega o reemplaza un producto del espejo."""
+        with self._lock:
+            if self._refreshing:
+                self._pending.append((product["id"], product))
+            self._remove(product["id"])
+            self._add(product)
+
+    def remove(self, product_id: str):
+        with self._lock:
+            if self._refreshing:
+                self._pending.append((product_id, None))
+            self._remove(product_id)
+
+    def clear(self):
+        """Vacía el índice; el próximo uso lo vuelve a cargar desde DynamoDB."""
+        with self._lock:
+            self._reset()
+            self._checked_at = None
+
+    def _add(self, product):
+        normalized = {field: normalize(product.get(field)) for field in TEXT_FIELDS + EXACT_FIELDS}
+        product_id = product["id"]
+        self._docs[product_id] = (product, normalized)
+        self._sorted_keys = None
+        for field in TEXT_FIELDS:
+            for gram in _ngrams(normalized[field]) | _prefixes(normalized[field]):
+                self._grams[field][gram].add(product_id)
+        for field in EXACT_FIELDS:
+            self._values[field][normalized[field]].add(product_id)
+
+    def _remove(self, product_id):
+        entry = self._docs.pop(product_id, None)
+        if entry is None:
+            return
+        self._sorted_keys = None
+        _, normalized = entry
+        for field in TEXT_FIELDS:
+            for gram in _ngrams(normalized[field]) | _prefixes(normalized[field]):
+                _discard(self._grams[field], gram, product_id)
+        for field in EXACT_FIELDS:
+            _discard(self._values[field], normalized[field], product_id)
+
+    # ----------------------------------------------------------
+    def search(self, product_name=None, batch=None, status=None, warehouse_name=None):
+        """Retorna los productos que cumplen todos los filtros, ordenados por nombre."""
+        return list(self.iter_search(product_name, batch, status, warehouse_name))
+
+    def iter_search(self, product_name=None, batch=None, status=None, warehouse_name=None, after=None):
+        """
+        Igual que search(), pero entrega los productos uno a uno: solo se calculan
+        por adelantado los ids candidatos y el orden por nombre, no la lista de resultados.
+        Con `after` (un sort_key) arranca justo después de ese producto, aunque ya no exista.
+        """
+        self._ensure_loaded()
+        text_filters = {"name": normalize(product_name), "warehouse_name": normalize(warehouse_name)}
+        exact_filters = {"batch": normalize(batch), "status": normalize(status)}
+        text_filters = {field: query for field, query in text_filters.items() if query}
+        exact_filters = {field: value for field, value in exact_filters.items() if value}
+
+        with self._lock:
+            candidates = [self._match_text(field, query) for field, query in text_filters.items()] + [
+                self._values[field].get(value, set()) for field, value in exact_filters.items()
+            ]
+            if candidates:
+                candidates.sort(key=len)
+                ids = set(candidates[0]).intersection(*candidates[1:])
+            else:
+                ids = None
+            ordered = self._ordered_keys()
+
+        start = bisect_right(ordered, tuple(after)) if after is not None else 0
+        return self._iter_matches(ordered, start, ids, text_filters)
+
+    def _iter_matches(self, ordered, start, ids, text_filters):
+        for position in range(start, len(ordered)):
+            product_id = ordered[position][1]
+            if ids is not None and product_id not in ids:
+                continue
+            # Se relee el documento: pudo cambiar o eliminarse mientras se recorría
+            entry = self._docs.get(product_id)
+            if entry is None:
+                continue
+            product, normalized = entry
+            # Los n-gramas pueden dar falsos positivos: se confirma la subcadena
+            if all(query in normalized[field] for field, query in text_filters.items()):
+                yield product
+
+    def _ordered_keys(self):
+        """sort_key de todos los productos, ordenados; se recalcula solo después de una escritura."""
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(sort_key(product) for product, _ in self._docs.values())
+        return self._sorted_keys
+
+    def _match_text(self, field, query):
+        if len(query) < NGRAM_SIZE:
+            return self._grams[field].get("^" + query, set())
+        postings = sorted((self._grams[field].get(gram, set()) for gram in _ngrams(query)), key=len)
+        return postings[0].intersection(*postings[1:])
+
+    # ----------------------------------------------------------
+    def _ensure_loaded(self):
+        if self._checked_at is None:
+            with self._load_lock:
+                if self._checked_at is None:
+                    self._rebuild()
+            return
+        if self._version_reader is None or self._refreshing:
+            return
+        if self._clock() - self._checked_at < self._check_seconds:
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._checked_at = self._clock()
+        try:
+            version = self._version_reader()
+        except Exception as e:
+            # Se sigue respondiendo con el índice actual; se vuelve a intentar en CHECK_SECONDS
+            logger.error(f"❌ Error al leer la versión de los espejos: {e}")
+            return
+        if version == self._version:
+            return
+
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        logger.info(f"🔄 Espejos modificados (versión {self._version} -> {version}), reconstruyendo el índice")
+        threading.Thread(target=self._rebuild, args=(version,), daemon=True).start()
+
+    def _rebuild(self, version=None):
+        """Reconstruye el índice desde DynamoDB sin bloquear las búsquedas en curso."""
+        start = time.monotonic()
+        with self._lock:
+            self._refreshing = True
+        try:
+            # La versión se lee antes del scan: si cambia en medio, la próxima revisión reconstruye
+            if version is None and self._version_reader is not None:
+                version = self._version_reader()
+            rebuilt = ProductSearchIndex(loader=self._loader)
+            for product in self._loader():
+                rebuilt._add(product)
+        except Exception as e:
+            logger.error(f"❌ Error al construir el índice de búsqueda: {e}")
+            with self._lock:
+                self._refreshing = False
+                self._pending = []
+            if self._checked_at is None:
+                raise
+            return
+
+        with self._lock:
+            self._docs, self._grams, self._values = rebuilt._docs, rebuilt._grams, rebuilt._values
+            self._sorted_keys = None
+            # Reaplicar lo escrito en este worker mientras se reconstruía
+            for product_id, product in self._pending:
+                self._remove(product_id)
+                if product is not None:
+                    self._add(product)
+            self._pending = []
+            self._refreshing = False
+            self._version = version
+            self._checked_at = self._clock()
+        logger.info(f"🔎 Índice de búsqueda cargado: {len(self._docs)} productos en {time.monotonic() - start:.2f}s")
+
+
+def _discard(postings, key, product_id):
+    """Quita el id de la lista de postings y la elimina si queda vacía."""
+    posting = postings.get(key)
+    if posting is None:
+        return
+    posting.discard(product_id)
+    if not posting:
+        del postings[key]
+
+
+# Índice compartido por el worker
+search_index = ProductSearchIndex(version_reader=ProductMirrorModel.current_version)
@@ -1,5 +1,7 @@
-from functools import reduce
-from ..models.product_mirror import ProductMirrorModel
+from itertools import islice
+from .product_search_index import search_index, sort_key
+from ..errors.errors import ParamError
+from ..utils.pagination import parse_limit, encode_cursor, decode_cursor
 
 
 class SearchProductsQuery:
@@ -9,36 +11,73 @@ class SearchProductsQuery:
         batch: str = None,
         status: str = None,
         warehouse_name: str = None,
+        limit: str = None,
+        cursor: str = None,
+        index=None,
     ):
         self.product_name = product_name
         self.batch = batch
         self.status = status
         self.warehouse_name = warehouse_name
+        self.limit = limit
+        self.cursor = cursor
+        self.index = index or search_index
 
     def execute(self):
         """Ejecuta la consulta de productos con los filtros dados."""
-        filter_conditions = []
-
-        if self.product_name:
-            filter_conditions.append(
-                ProductMirrorModel.name.contains(self.product_name)
-            )
-        if self.batch:
-            filter_conditions.append(ProductMirrorModel.batch == self.batch)
-        if self.status:
-            filter_conditions.append(ProductMirrorModel.status == self.status)
-        if self.warehouse_name:
-            filter_conditions.append(
-                ProductMirrorModel.warehouse_name.contains(self.warehouse_name)
-            )
-
-        if filter_conditions:
-            combined_filter = reduce(lambda x, y: x & y, filter_conditions)
-            products = ProductMirrorModel.scan(filter_condition=combined_filter)
-        else:
-            products = ProductMirrorModel.scan()
-
-        sorted_products = [product.to_dict() for product in products]
-        sorted_products.sort(key=lambda p: p.get("name", "").lower())
-
-        return sorted_products
+        if self.limit is not None or self.cursor is not None:
+            return self.fetch_page()
+
+        return self._search()
+
+    def stream(self):
+        """Recorre los productos filtrados uno a uno, sin armar la lista completa."""
+        return self.index.iter_search(
+            product_name=self.product_name,
+            batch=self.batch,
+            status=self.status,
+            warehouse_name=self.warehouse_name,
+        )
+
+    def _search(self):
+        """Busca en el índice en memoria (sin distinguir mayúsculas ni tildes), ordenado por nombre."""
+        return self.index.search(
+            product_name=self.product_name,
+            batch=self.batch,
+            status=self.status,
+            warehouse_name=self.warehouse_name,
+        )
+
+    def fetch_page(self):
+        """
+        Obtiene una página de productos y el cursor para la siguiente.
+        El cursor guarda el último (nombre, id) entregado y la página siguiente arranca
+        después de él, así las escrituras entre páginas no saltan ni repiten productos.
+        """
+        limit = parse_limit(self.limit)
+        products = list(islice(
+            self.index.iter_search(
+                product_name=self.product_name,
+                batch=self.batch,
+                status=self.status,
+                warehouse_name=self.warehouse_name,
+                after=self._decode_after(),
+            ),
+            limit + 1,
+        ))
+
+        items = products[:limit]
+        next_cursor = None
+        if len(products) > limit:
+            name, product_id = sort_key(items[-1])
+            next_cursor = encode_cursor({"name": name, "id": product_id})
+        return {"items": items, "next_cursor": next_cursor}
+
+    def _decode_after(self):
+        key = decode_cursor(self.cursor)
+        if key is None:
+            return None
+        name, product_id = key.get("name"), key.get("id")
+        if not isinstance(name, str) or not isinstance(product_id, str):
+            raise ParamError("El parámetro 'cursor' no es válido.")
+        return name, product_id
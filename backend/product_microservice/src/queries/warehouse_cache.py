@@ -0,0 +1,72 @@
+import os
+import time
+import logging
+import threading
+from ..models.warehouse import WarehouseModel
+
+logger = logging.getLogger(__name__)
+
+TTL_SECONDS = float(os.getenv("WAREHOUSE_CACHE_TTL_SECONDS", "60"))
+
+
+class WarehouseCache:
+    """
+    Caché en memoria (por worker) de todas las bodegas.
+    Se precarga al arrancar. Al vencer el TTL solo se lee el sello de versión
+    (un GetItem) y la tabla se vuelve a escanear únicamente si otro worker la cambió.
+    """
+
+    def __init__(self, ttl=TTL_SECONDS, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._warehouses = None
+        self._version = None
+        self._checked_at = None
+
+    def preload(self):
+        """Carga todas las bodegas; se llama al arrancar el worker."""
+        with self._lock:
+            self._load()
+        logger.info(f"🏬 Caché de bodegas cargada: {len(self._warehouses)} bodegas")
+
+    def get(self, warehouse_id):
+        """Retorna la bodega o None. Un id desconocido fuerza a revisar la versión."""
+        warehouses = self._fresh()
+        warehouse = warehouses.get(warehouse_id)
+        if warehouse is None and warehouse_id:
+            warehouses = self._fresh(force_check=True)
+            warehouse = warehouses.get(warehouse_id)
+        return warehouse
+
+    def all(self):
+        return list(self._fresh().values())
+
+    def invalidate(self):
+        """Descarta la caché local; la próxima lectura vuelve a cargarla."""
+        with self._lock:
+            self._warehouses = None
+
+    # ----------------------------------------------------------
+    def _fresh(self, force_check=False):
+        with self._lock:
+            if self._warehouses is None:
+                self._load()
+            elif force_check or self._clock() - self._checked_at >= self.ttl:
+                version = WarehouseModel.current_version()
+                if version != self._version:
+                    logger.info(f"🔄 Bodegas modificadas (versión {self._version} -> {version}), recargando")
+                    self._load(version)
+                else:
+                    self._checked_at = self._clock()
+            return self._warehouses
+
+    def _load(self, version=None):
+        # La versión se lee antes del scan: si cambia en medio, la próxima revisión recarga
+        self._version = WarehouseModel.current_version() if version is None else version
+        self._warehouses = {warehouse.id: warehouse for warehouse in WarehouseModel.get_all()}
+        self._checked_at = self._clock()
+
+
+# Caché compartida por el worker
+warehouse_cache = WarehouseCache()
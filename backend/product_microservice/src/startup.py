@@ -0,0 +1,74 @@
+import os
+import json
+import time
+import fcntl
+import logging
+import tempfile
+from .models.db import init_db, DYNAMODB_ENDPOINT, TABLE_NAME
+from .models.warehouse import WarehouseModel
+
+logger = logging.getLogger(__name__)
+
+# Archivo compartido por los workers del contenedor con el resultado del arranque
+STATE_FILE = os.getenv(
+    "STARTUP_STATE_FILE", os.path.join(tempfile.gettempdir(), "products_microservice_ready.json")
+)
+READY_TTL_SECONDS = int(os.getenv("STARTUP_READY_TTL_SECONDS", "3600"))
+
+_ready = False  # Por proceso; con gunicorn --preload lo heredan los workers del master
+
+
+def _fingerprint():
+    """Identifica la configuración verificada: si cambia el endpoint o las tablas, se verifica de nuevo."""
+    return "|".join([DYNAMODB_ENDPOINT or "aws", TABLE_NAME, WarehouseModel.Meta.table_name])
+
+
+def _read_state():
+    try:
+        with open(STATE_FILE) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_state(state):
+    # Escritura atómica: un worker nunca lee un archivo a medias
+    tmp_path = f"{STATE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump(state, handle)
+    os.replace(tmp_path, STATE_FILE)
+
+
+def _is_fresh(state):
+    return (
+        state is not None
+        and state.get("fingerprint") == _fingerprint()
+        and time.time() - state.get("checked_at", 0) < READY_TTL_SECONDS
+    )
+
+
+def ensure_ready():
+    """
+    Verifica las tablas (list_tables) y siembra la bodega principal una sola vez.
+    El primer worker lo hace bajo un lock de archivo y guarda el resultado en
+    STATE_FILE; los demás workers y los reinicios en caliente lo reutilizan sin
+    llamar a DynamoDB mientras no venza READY_TTL_SECONDS.
+    """
+    global _ready
+    if _ready:
+        return
+
+    with open(f"{STATE_FILE}.lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            if _is_fresh(_read_state()):
+                logger.info("♻️ Arranque ya verificado por otro worker, se omite list_tables")
+            else:
+                init_db()
+                if WarehouseModel.populate():
+                    logger.info("🌱 Bodega principal creada")
+                _write_state({"fingerprint": _fingerprint(), "checked_at": time.time()})
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+    _ready = True
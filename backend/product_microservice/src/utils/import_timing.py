@@ -0,0 +1,21 @@
+import time
+import logging
+import importlib
+
+logger = logging.getLogger(__name__)
+
+# Milisegundos que tomó importar cada módulo al crear la app
+IMPORT_TIMES = {}
+
+
+def import_timed(module_name, package=None):
+    """
+    Importa un módulo y registra cuánto tardó, incluyendo las dependencias que
+    cargó por primera vez. Para el detalle completo: `python -X importtime`.
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(module_name, package)
+    elapsed = (time.perf_counter() - start) * 1000
+    IMPORT_TIMES[module_name] = elapsed
+    logger.info(f"⏱️ import {module_name}: {elapsed:.1f} ms")
+    return module
@@ -4,6 +4,8 @@ from unittest.mock import patch
 from src.models.product import ProductModel
 from src.models.warehouse import WarehouseModel
 from src.models.product_mirror import ProductMirrorModel
+from src.queries.product_search_index import search_index
+from src.queries.warehouse_cache import warehouse_cache
 
 
 # --- Fixture de cliente Flask ---
@@ -25,6 +27,13 @@ def client():
             clear_db()
 
 
+@pytest.fixture
+def main_warehouse(client):
+    """Bodega principal ("1"), la que usan por defecto los productos y la carga masiva."""
+    WarehouseModel.populate()
+    warehouse_cache.invalidate()
+
+
 @pytest.fixture()
 def db_clearer():
     clear_db()
@@ -38,6 +47,8 @@ def clear_db():
         with model.batch_write() as batch:
             for item in model.scan():
                 batch.delete(item)
+    search_index.clear()
+    warehouse_cache.invalidate()
 
 
 @pytest.fixture
@@ -56,6 +56,35 @@ class TestUpdateStock:
 
         updated_product = ProductModel.get(hash_key=product.warehouse, range_key=product.sku)
         assert updated_product.stock == expected_stock
+        assert product.stock == expected_stock
+
+    def test_should_not_lose_concurrent_increments(self, product_builder: ProductBuilder):
+        product = product_builder.with_stock(10).build()
+        product.save()
+
+        # Dos instancias con el mismo stock leído: ADD no pisa el incremento del otro
+        first = ProductModel.get(hash_key=product.warehouse, range_key=product.sku)
+        second = ProductModel.get(hash_key=product.warehouse, range_key=product.sku)
+        first.update_stock(5)
+        second.update_stock(7)
+
+        updated_product = ProductModel.get(hash_key=product.warehouse, range_key=product.sku)
+        assert updated_product.stock == 22
+
+
+@pytest.mark.usefixtures('db_clearer')
+class TestBatchUpdateStock:
+    def test_should_apply_deltas_concurrently(self, product_builder: ProductBuilder):
+        product = product_builder.with_stock(10).build()
+        product.save()
+        key = (product.warehouse, product.sku)
+
+        updated, failed = ProductModel.batch_update_stock(
+            [(product.warehouse, product.sku, 1)] * 20 + [("NoWarehouse", "NoSKU", 1)]
+        )
+
+        assert updated == {key: 30}
+        assert failed == [(("NoWarehouse", "NoSKU"), "Producto no encontrado")]
 
 
 @pytest.mark.usefixtures('db_clearer')
@@ -1,3 +1,4 @@
+import time
 import pytest
 import logging
 from pathlib import Path
@@ -6,8 +7,18 @@ from pathlib import Path
 products_csv_file = Path(__file__).parent / 'test-data' / 'products_bulk.csv'
 
 
+def wait_for_job(client, job_id, timeout=30):
+    """Consulta el job de carga masiva hasta que termine."""
+    deadline = time.time() + timeout
+    while True:
+        job = client.get(f"/bulk/{job_id}").get_json()
+        if job["status"] in ("COMPLETED", "FAILED") or time.time() > deadline:
+            return job
+        time.sleep(0.2)
+
+
 class TestCreateProduct:
-    @pytest.mark.usefixtures("client")
+    @pytest.mark.usefixtures("client", "main_warehouse")
     def test_create_product_endpoint(self, client):
         """✅ Caso exitoso de creación"""
         data = {
@@ -15,4 +26,13 @@ class TestCreateProduct:
         }
         response = client.post("/bulk", data=data)
         logging.info("Response: %s", response.get_json())
-        assert response.status_code == 200
+        assert response.status_code == 202
+
+        job = wait_for_job(client, response.get_json()["job_id"])
+        assert job["status"] == "COMPLETED"
+        assert job["procesados"] == job["total_registros"]
+
+    @pytest.mark.usefixtures("client")
+    def test_bulk_job_inexistente(self, client):
+        response = client.get("/bulk/no-existe")
+        assert response.status_code == 404
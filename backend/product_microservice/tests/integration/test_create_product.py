@@ -1,7 +1,7 @@
 import pytest
 import logging
 
-@pytest.mark.usefixtures('client')
+@pytest.mark.usefixtures('client', 'main_warehouse')
 class TestCreateProduct:
     def test_successful_product_creation(self, client):
         payload = {
@@ -8,3 +8,18 @@ class TestGetAllProducts:
         response = client.get("/")
         logging.info("Response: %s", response.get_json())
         assert response.status_code == 200
+
+    @pytest.mark.usefixtures("client")
+    def test_get_products_paginated(self, client):
+        """📄 Con limit debe devolver items y next_cursor"""
+        response = client.get("/?limit=5")
+        json_data = response.get_json()
+        assert response.status_code == 200
+        assert isinstance(json_data["items"], list)
+        assert "next_cursor" in json_data
+
+    @pytest.mark.usefixtures("client")
+    def test_get_products_invalid_limit(self, client):
+        """🚫 Un limit inválido debe devolver 400"""
+        response = client.get("/?limit=abc")
+        assert response.status_code == 400
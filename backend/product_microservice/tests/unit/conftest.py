@@ -0,0 +1,14 @@
+import pytest
+from unittest.mock import patch
+from src.models.warehouse import WarehouseModel
+from src.queries.warehouse_cache import warehouse_cache
+
+
+@pytest.fixture(autouse=True)
+def known_warehouse():
+    """Las pruebas unitarias no llegan a DynamoDB: toda bodega consultada existe salvo que la prueba diga lo contrario."""
+    warehouse = WarehouseModel(
+        id="1", name="Bodega Principal", address="Calle 123", country="Colombia", city="Medellin", capacity=100000,
+    )
+    with patch.object(warehouse_cache, "get", return_value=warehouse) as mock_get:
+        yield mock_get
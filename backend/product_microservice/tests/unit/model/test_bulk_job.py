@@ -0,0 +1,107 @@
+import datetime
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import UpdateError
+from src.models.bulk_job import BulkJobModel
+
+
+def ago(seconds):
+    return datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=seconds)
+
+
+def condition_failed():
+    return UpdateError(cause=ClientError(
+        {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem"
+    ))
+
+
+def serialized_actions(update):
+    actions = update.call_args.kwargs["actions"]
+    return {action.values[0].path[0]: action.values[1].value for action in actions}
+
+
+class TestBulkJobModel:
+    def build_job(self, **attrs):
+        job = BulkJobModel("job-1", filename="productos.csv", warehouse="1")
+        for name, value in attrs.items():
+            setattr(job, name, value)
+        return job
+
+    @patch.object(BulkJobModel, "update")
+    def test_record_chunk_acumula_el_progreso(self, mock_update):
+        job = self.build_job(processed=500, succeeded=490, rejected=10)
+
+        job.record_chunk(1000, 500, 495, [{"name": "X", "error": "Stock debe ser positivo"}] * 5)
+
+        values = serialized_actions(mock_update)
+        assert values["total"] == {"N": "1000"}
+        assert values["processed"] == {"N": "1000"}
+        assert values["succeeded"] == {"N": "985"}
+        assert values["rejected"] == {"N": "15"}
+        assert "heartbeat_at" in values
+
+    @patch("src.models.bulk_job.MAX_STORED_REJECTED_ROWS", 3)
+    @patch.object(BulkJobModel, "update")
+    def test_record_chunk_limita_las_filas_rechazadas_guardadas(self, mock_update):
+        job = self.build_job(rejected_rows='[{"name": "A"}, {"name": "B"}]')
+
+        job.record_chunk(10, 5, 3, [{"name": "C"}, {"name": "D"}])
+
+        values = serialized_actions(mock_update)
+        assert values["rejected_rows"] == {"S": '[{"name": "A"}, {"name": "B"}, {"name": "C"}]'}
+        assert values["rejected_truncated"] == {"BOOL": True}
+
+    def test_to_dict(self):
+        job = self.build_job(status="RUNNING", total=10, processed=5, succeeded=4, rejected=1,
+                             rejected_rows='[{"name": "X", "error": "Campos obligatorios faltantes"}]')
+
+        result = job.to_dict()
+
+        assert result["status"] == "RUNNING"
+        assert result["total_registros"] == 10
+        assert result["procesados"] == 5
+        assert result["exitosos"] == 4
+        assert result["rechazados"] == 1
+        assert result["rechazados_detalle"][0]["error"] == "Campos obligatorios faltantes"
+        assert result["rechazados_truncados"] is False
+
+    @patch("src.models.bulk_job.BULK_JOB_STALE_SECONDS", 60)
+    @patch.object(BulkJobModel, "update")
+    def test_expire_if_stale_marca_fallido_el_job_sin_latido(self, mock_update):
+        job = self.build_job(status="RUNNING", heartbeat_at=ago(120))
+
+        job.expire_if_stale()
+
+        values = serialized_actions(mock_update)
+        assert values["status"] == {"S": "FAILED"}
+        assert "vuelva a subir el archivo" in values["error"]["S"]
+        assert "finished_at" in values
+        assert mock_update.call_args.kwargs["condition"] is not None
+
+    @patch("src.models.bulk_job.BULK_JOB_STALE_SECONDS", 60)
+    @patch.object(BulkJobModel, "update")
+    def test_expire_if_stale_respeta_jobs_vivos_y_terminados(self, mock_update):
+        self.build_job(status="RUNNING", heartbeat_at=ago(10)).expire_if_stale()
+        self.build_job(status="COMPLETED", heartbeat_at=ago(120)).expire_if_stale()
+
+        mock_update.assert_not_called()
+
+    @patch("src.models.bulk_job.BULK_JOB_STALE_SECONDS", 60)
+    @patch.object(BulkJobModel, "refresh")
+    @patch.object(BulkJobModel, "update", side_effect=condition_failed())
+    def test_expire_if_stale_recarga_si_llega_un_latido_a_tiempo(self, mock_update, mock_refresh):
+        self.build_job(status="PENDING", heartbeat_at=ago(120)).expire_if_stale()
+
+        mock_refresh.assert_called_once()
+
+    @patch.object(BulkJobModel, "_get_connection")
+    def test_beat_ignora_jobs_terminados(self, mock_get_connection):
+        connection = MagicMock()
+        connection.update_item.side_effect = condition_failed()
+        mock_get_connection.return_value = connection
+
+        BulkJobModel.beat("job-1")
+
+        args, kwargs = connection.update_item.call_args
+        assert args == ("job-1",)
+        assert kwargs["condition"].serialize({}, {}) == "#0 IN (:0, :1)"
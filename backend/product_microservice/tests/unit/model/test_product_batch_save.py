@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import patch, MagicMock
+from pynamodb.exceptions import PutError
+from src.models.product import ProductModel
+
+
+def build_products(count):
+    return [
+        ProductModel(
+            warehouse="W1", sku=f"sku-{i}", provider_nit="1234567890", name=f"Prod {i}",
+            product_type="Tipo", stock=1, expiration_date="2030-01-01", temperature_required=4,
+            batch="B1", status="Disponible", unit_value=1, storage_conditions="Seco",
+        )
+        for i in range(count)
+    ]
+
+
+def unprocessed(products):
+    return {
+        "UnprocessedItems": {
+            ProductModel.Meta.table_name: [{"PutRequest": {"Item": p.serialize()}} for p in products]
+        }
+    }
+
+
+@pytest.fixture
+def connection():
+    with patch.object(ProductModel, "_get_connection") as get_connection, \
+            patch("src.models.product.time.sleep") as sleep:
+        conn = MagicMock()
+        conn.sleep = sleep
+        get_connection.return_value = conn
+        yield conn
+
+
+class TestBatchSave:
+    def test_should_write_in_chunks_of_25(self, connection):
+        connection.batch_write_item.return_value = {}
+
+        failed = ProductModel.batch_save(build_products(60))
+
+        assert failed == []
+        sizes = [len(c.kwargs["put_items"]) for c in connection.batch_write_item.call_args_list]
+        assert sizes == [25, 25, 10]
+
+    def test_should_retry_unprocessed_items_with_backoff(self, connection):
+        products = build_products(3)
+        connection.batch_write_item.side_effect = [
+            unprocessed(products[1:]),
+            unprocessed(products[2:]),
+            {},
+        ]
+
+        failed = ProductModel.batch_save(products, base_delay=0.1)
+
+        assert failed == []
+        retried = [c.kwargs["put_items"] for c in connection.batch_write_item.call_args_list[1:]]
+        assert retried == [[p.serialize() for p in products[1:]], [products[2].serialize()]]
+        delays = [c.args[0] for c in connection.sleep.call_args_list]
+        assert 0.1 <= delays[0] <= 0.2
+        assert 0.2 <= delays[1] <= 0.4
+
+    def test_should_report_items_left_after_max_retries(self, connection):
+        products = build_products(2)
+        connection.batch_write_item.side_effect = [unprocessed(products[:1])] * 3
+
+        failed = ProductModel.batch_save(products, max_retries=2)
+
+        assert len(failed) == 1
+        assert failed[0][0] is products[0]
+        assert "2 reintentos" in failed[0][1]
+        assert connection.batch_write_item.call_count == 3
+
+    def test_should_report_whole_chunk_when_request_fails(self, connection):
+        products = build_products(30)
+        connection.batch_write_item.side_effect = [PutError("boom"), {}]
+
+        failed = ProductModel.batch_save(products)
+
+        assert [p for p, _ in failed] == products[:25]
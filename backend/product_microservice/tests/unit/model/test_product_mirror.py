@@ -0,0 +1,58 @@
+from unittest.mock import patch, MagicMock
+from src.models.product_mirror import ProductMirrorModel, mirror_id, VERSION_ITEM_ID
+
+
+class TestMirrorId:
+    def test_mirror_id_es_warehouse_y_sku(self):
+        assert mirror_id("W1", "SKU-1") == "W1#SKU-1"
+
+
+class TestDeleteLegacy:
+    @patch.object(ProductMirrorModel, "batch_upsert")
+    @patch.object(ProductMirrorModel, "scan")
+    def test_elimina_solo_los_ids_aleatorios(self, mock_scan, mock_batch):
+        mock_scan.return_value = [
+            ProductMirrorModel("W1#S1", warehouse="W1", sku="S1"),
+            ProductMirrorModel("0b9f6c1e-uuid", warehouse="W1", sku="S1"),
+        ]
+
+        assert ProductMirrorModel.delete_legacy() == 1
+        mock_batch.assert_called_once_with([], ["0b9f6c1e-uuid"])
+
+
+class TestBatchUpsert:
+    @patch.object(ProductMirrorModel, "bump_version")
+    @patch.object(ProductMirrorModel, "batch_write")
+    def test_guarda_y_elimina_en_el_mismo_lote(self, mock_batch_write, mock_bump):
+        batch = MagicMock()
+        mock_batch_write.return_value.__enter__.return_value = batch
+        mirror = ProductMirrorModel("W1#S1")
+
+        ProductMirrorModel.batch_upsert([mirror], ["W1#S2"])
+
+        batch.save.assert_called_once_with(mirror)
+        assert batch.delete.call_args.args[0].id == "W1#S2"
+        mock_bump.assert_called_once()
+
+    @patch.object(ProductMirrorModel, "bump_version")
+    @patch.object(ProductMirrorModel, "batch_write")
+    def test_lote_vacio_no_escribe_ni_cambia_la_version(self, mock_batch_write, mock_bump):
+        ProductMirrorModel.batch_upsert([], [])
+
+        mock_batch_write.assert_not_called()
+        mock_bump.assert_not_called()
+
+
+class TestVersion:
+    @patch.object(ProductMirrorModel, "_get_connection")
+    def test_current_version_lee_el_sello(self, mock_connection):
+        mock_connection.return_value.get_item.return_value = {"Item": {"version": {"N": "7"}}}
+
+        assert ProductMirrorModel.current_version() == 7
+        assert mock_connection.return_value.get_item.call_args.args[0] == VERSION_ITEM_ID
+
+    @patch.object(ProductMirrorModel, "_get_connection")
+    def test_current_version_sin_sello_es_cero(self, mock_connection):
+        mock_connection.return_value.get_item.return_value = {}
+
+        assert ProductMirrorModel.current_version() == 0
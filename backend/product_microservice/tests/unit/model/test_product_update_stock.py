@@ -0,0 +1,132 @@
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import UpdateError
+from pynamodb.expressions.update import Update
+from src.models.product import ProductModel
+from src.errors.errors import ParamError
+
+
+def serialize(actions):
+    names, values = {}, {}
+    return Update(*actions).serialize(names, values), names, values
+
+
+@pytest.fixture
+def connection():
+    with patch.object(ProductModel, "_get_connection") as get_connection:
+        conn = MagicMock()
+        get_connection.return_value = conn
+        yield conn
+
+
+class TestUpdateStock:
+    """🧪 update_stock con UpdateItem atómico"""
+
+    @patch.object(ProductModel, "update")
+    def test_should_add_stock_without_rewriting_item(self, mock_update):
+        product = ProductModel(warehouse="W1", sku="S1", stock=10)
+
+        product.update_stock(5)
+
+        kwargs = mock_update.call_args.kwargs
+        expression, names, values = serialize(kwargs["actions"])
+        assert expression == "SET #0 = :0 ADD #1 :1"
+        assert names == {"updated_at": "#0", "stock": "#1"}
+        assert values[":1"] == {"N": "5"}
+        assert kwargs["condition"].serialize({}, {}) == "attribute_exists (#0)"
+
+    @pytest.mark.parametrize("amount", [0, -3])
+    @patch.object(ProductModel, "update")
+    def test_should_reject_non_positive_stock(self, mock_update, amount):
+        product = ProductModel(warehouse="W1", sku="S1", stock=10)
+
+        with pytest.raises(ParamError, match="mayor o igual a 1"):
+            product.update_stock(amount)
+
+        mock_update.assert_not_called()
+
+
+class TestBatchUpdateStock:
+    """🧪 batch_update_stock con ajustes concurrentes"""
+
+    def test_should_merge_deltas_and_return_new_stock(self, connection):
+        calls = []
+        lock = threading.Lock()
+
+        def update_item(warehouse, range_key, actions, condition, return_values):
+            _, _, values = serialize(actions)
+            with lock:
+                calls.append((warehouse, range_key, values[":1"]["N"]))
+            return {"Attributes": {"stock": {"N": "100"}}}
+
+        connection.update_item.side_effect = update_item
+
+        updated, failed = ProductModel.batch_update_stock([
+            ("W1", "S1", 5), ("W1", "S2", -2), ("W1", "S1", 3),
+        ])
+
+        assert sorted(calls) == [("W1", "S1", "8"), ("W1", "S2", "-2")]
+        assert updated == {("W1", "S1"): 100, ("W1", "S2"): 100}
+        assert failed == []
+
+    def test_should_report_missing_products_and_errors(self, connection):
+        def update_item(warehouse, range_key, **kwargs):
+            if range_key == "MISSING":
+                raise UpdateError(cause=ClientError(
+                    {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem"
+                ))
+            if range_key == "BOOM":
+                raise UpdateError("Error updating item")
+            return {"Attributes": {"stock": {"N": "7"}}}
+
+        connection.update_item.side_effect = update_item
+
+        updated, failed = ProductModel.batch_update_stock([
+            ("W1", "OK", 1), ("W1", "MISSING", 1), ("W1", "BOOM", 1),
+        ])
+
+        assert updated == {("W1", "OK"): 7}
+        errors = dict(failed)
+        assert errors[("W1", "MISSING")] == "Producto no encontrado"
+        assert "Error updating item" in errors[("W1", "BOOM")]
+
+    def test_should_guard_negative_deltas_against_stock(self, connection):
+        conditions = {}
+
+        def update_item(warehouse, range_key, actions, condition, return_values):
+            conditions[range_key] = condition.serialize({}, {})
+            if range_key == "LOW":
+                raise UpdateError(cause=ClientError(
+                    {"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem"
+                ))
+            return {"Attributes": {"stock": {"N": "3"}}}
+
+        connection.update_item.side_effect = update_item
+
+        updated, failed = ProductModel.batch_update_stock([("W1", "IN", 4), ("W1", "LOW", -5)])
+
+        assert conditions["IN"] == "attribute_exists (#0)"
+        assert conditions["LOW"] == "(attribute_exists (#0) AND #1 >= :0)"
+        assert updated == {("W1", "IN"): 3}
+        assert failed == [(("W1", "LOW"), "Producto no encontrado o stock insuficiente")]
+
+    def test_should_keep_going_after_unexpected_errors(self, connection):
+        def update_item(warehouse, range_key, **kwargs):
+            if range_key == "BROKEN":
+                raise KeyError("Attributes")
+            return {"Attributes": {"stock": {"N": "9"}}}
+
+        connection.update_item.side_effect = update_item
+
+        updated, failed = ProductModel.batch_update_stock([
+            ("W1", "BROKEN", 1), ("W1", "A", 1), ("W1", "B", 1),
+        ])
+
+        assert updated == {("W1", "A"): 9, ("W1", "B"): 9}
+        assert [key for key, _ in failed] == [("W1", "BROKEN")]
+
+    def test_should_skip_empty_input(self, connection):
+        assert ProductModel.batch_update_stock([]) == ({}, [])
+        connection.update_item.assert_not_called()
@@ -0,0 +1,26 @@
+from unittest.mock import patch
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import PutError
+from src.models.warehouse import WarehouseModel
+
+
+def conditional_failure():
+    cause = ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": ""}}, "PutItem")
+    return PutError("Failed to put item", cause=cause)
+
+
+@patch.object(WarehouseModel, "bump_version")
+@patch.object(WarehouseModel, "save")
+class TestPopulate:
+    def test_crea_la_bodega_principal_si_no_existe(self, mock_save, mock_bump):
+        assert WarehouseModel.populate() is True
+
+        condition = mock_save.call_args.kwargs["condition"]
+        assert condition.serialize({}, {}) == "attribute_not_exists (#0)"
+        mock_bump.assert_called_once()
+
+    def test_no_reescribe_una_bodega_existente(self, mock_save, mock_bump):
+        mock_save.side_effect = conditional_failure()
+
+        assert WarehouseModel.populate() is False
+        mock_bump.assert_not_called()
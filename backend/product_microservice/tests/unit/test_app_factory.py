@@ -0,0 +1,27 @@
+import sys
+import subprocess
+from unittest.mock import patch
+
+
+class TestAppFactory:
+    """🧪 Pruebas unitarias de la app factory"""
+
+    @patch("src.queries.warehouse_cache.warehouse_cache.preload")
+    @patch("src.startup.ensure_ready")
+    def test_create_app_registra_blueprints_y_verifica_el_arranque(self, mock_ready, mock_preload, monkeypatch):
+        monkeypatch.setenv("APP_COGNITO_USER_POOL_ID", "pool")
+        from src.main import create_app
+        from src.utils.import_timing import IMPORT_TIMES
+
+        app = create_app()
+
+        mock_ready.assert_called_once()
+        mock_preload.assert_called_once()
+        assert {"product", "warehouses"} <= set(app.blueprints)
+        assert ".blueprints.products" in IMPORT_TIMES
+        assert app.test_client().get("/health").get_json()["status"] == "up"
+
+    def test_importar_la_api_no_carga_pandas(self):
+        code = "import sys, src.main, src.blueprints.products; print('pandas' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
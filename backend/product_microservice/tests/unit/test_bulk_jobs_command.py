@@ -0,0 +1,180 @@
+import io
+import os
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from werkzeug.datastructures import FileStorage
+from src.commands import bulk_jobs
+from src.commands.bulk_jobs import SubmitProductsBulkJob, GetBulkJob, run_bulk_job, beat_active_jobs
+from src.commands.create_products_bulk import CreateProductsBulk
+from src.errors.errors import ApiError, NotFoundError
+
+
+def upload(content, filename):
+    return FileStorage(io.BytesIO(content), filename=filename)
+
+
+def product_row(name, stock=10):
+    return {
+        "provider_nit": "1234567890",
+        "name": name,
+        "product_type": "Medicamento",
+        "stock": stock,
+        "expiration_date": "2030-12-31",
+        "temperature_required": 25,
+        "batch": "L001",
+        "status": "Disponible",
+        "unit_value": 2.5,
+        "storage_conditions": "Lugar fresco",
+    }
+
+
+@pytest.fixture(autouse=True)
+def active_jobs():
+    with patch.object(bulk_jobs, "_active_jobs", set()) as jobs:
+        yield jobs
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path):
+    with patch("src.commands.bulk_jobs.BULK_UPLOAD_DIR", str(tmp_path)):
+        yield tmp_path
+
+
+class TestSubmitProductsBulkJob:
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    def test_encola_el_job_y_responde_de_inmediato(self, mock_job_model, mock_get_executor):
+        job = MagicMock(job_id="job-1", status="PENDING")
+        mock_job_model.create.return_value = job
+
+        result = SubmitProductsBulkJob(upload(b"name\nA\n", "productos.csv"), "1").execute()
+
+        assert result == {"job_id": "job-1", "status": "PENDING"}
+        mock_job_model.create.assert_called_once_with("productos.csv", "1")
+        run, submitted_job, command = mock_get_executor.return_value.submit.call_args.args
+        assert run is run_bulk_job
+        assert submitted_job is job
+        assert command.filename == "productos.csv"
+        # El archivo queda en disco para el job, no en memoria
+        assert command.file_bytes is None
+        with open(command.file_path, "rb") as spooled:
+            assert spooled.read() == b"name\nA\n"
+
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    def test_registra_el_job_para_el_latido(self, mock_job_model, mock_get_executor, active_jobs):
+        mock_job_model.create.return_value = MagicMock(job_id="job-1", status="PENDING")
+
+        SubmitProductsBulkJob(upload(b"name\nA\n", "productos.csv"), "1").execute()
+
+        assert active_jobs == {"job-1"}
+
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    def test_borra_el_archivo_si_no_se_puede_encolar(self, mock_job_model, mock_get_executor, upload_dir):
+        mock_job_model.create.side_effect = RuntimeError("DynamoDB no disponible")
+
+        with pytest.raises(RuntimeError):
+            SubmitProductsBulkJob(upload(b"name\nA\n", "productos.csv")).execute()
+
+        assert os.listdir(upload_dir) == []
+
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    def test_formato_no_soportado_no_crea_job(self, mock_job_model, mock_get_executor):
+        with pytest.raises(ApiError, match="Formato no soportado"):
+            SubmitProductsBulkJob(upload(b"bytes", "productos.txt")).execute()
+
+        mock_job_model.create.assert_not_called()
+        mock_get_executor.return_value.submit.assert_not_called()
+
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    @patch("src.commands.create_products_bulk.warehouse_cache")
+    def test_bodega_inexistente_no_crea_job(self, mock_cache, mock_job_model, mock_get_executor):
+        mock_cache.get.return_value = None
+
+        with pytest.raises(ApiError, match="La bodega 99 no existe"):
+            SubmitProductsBulkJob(upload(b"bytes", "productos.csv"), "99").execute()
+
+        mock_job_model.create.assert_not_called()
+
+
+class TestRunBulkJob:
+    @patch("src.commands.bulk_jobs.BULK_JOB_CHUNK_ROWS", 2)
+    @patch("src.commands.create_products_bulk.ProductModel")
+    def test_procesa_por_bloques_y_reporta_progreso(self, mock_product_model):
+        mock_product_model.batch_save.return_value = []
+        df = pd.DataFrame([product_row("A"), product_row("B"), product_row("C", stock=0)])
+        job = MagicMock()
+
+        # El XLSX se lee completo, así que el total se conoce desde el primer bloque
+        with patch.object(CreateProductsBulk, "_read_file", return_value=df):
+            run_bulk_job(job, CreateProductsBulk(b"bytes", "productos.xlsx"))
+
+        job.start.assert_called_once()
+        assert job.record_chunk.call_count == 2
+        first, second = [c.args for c in job.record_chunk.call_args_list]
+        assert first[:3] == (3, 2, 2) and first[3] == []
+        assert second[:3] == (3, 1, 0)
+        assert second[3][0]["error"] == "Stock debe ser positivo"
+        assert mock_product_model.batch_save.call_count == 1
+        job.finish.assert_called_once()
+        job.fail.assert_not_called()
+
+    @patch("src.commands.bulk_jobs.BULK_JOB_CHUNK_ROWS", 2)
+    @patch("src.commands.create_products_bulk.ProductModel")
+    def test_csv_en_disco_se_lee_en_streaming_y_se_borra(self, mock_product_model, upload_dir):
+        mock_product_model.batch_save.return_value = []
+        path = upload_dir / "productos.csv"
+        pd.DataFrame([product_row(name) for name in "ABCDE"]).to_csv(path, index=False)
+        job = MagicMock()
+
+        with patch.object(CreateProductsBulk, "_read_file", side_effect=AssertionError("no debe leer todo")):
+            run_bulk_job(job, CreateProductsBulk(None, "productos.csv", file_path=str(path)))
+
+        # 5 filas en bloques de 2: el total del CSV no se conoce hasta terminar
+        assert [c.args[:3] for c in job.record_chunk.call_args_list] == [(None, 2, 2), (None, 2, 2), (None, 1, 1)]
+        assert mock_product_model.batch_save.call_count == 3
+        job.finish.assert_called_once()
+        assert not path.exists()
+
+    def test_error_al_leer_marca_el_job_como_fallido(self, active_jobs):
+        job = MagicMock(job_id="job-1")
+        active_jobs.add("job-1")
+
+        run_bulk_job(job, CreateProductsBulk(b"nombre\nA\n", "productos.csv"))
+
+        assert job.fail.call_args.args[0].startswith("Faltan columnas:")
+        job.finish.assert_not_called()
+        # Al terminar, el worker deja de latir por el job
+        assert active_jobs == set()
+
+
+class TestBeatActiveJobs:
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    def test_late_por_cada_job_activo_aunque_alguno_falle(self, mock_job_model, active_jobs):
+        active_jobs.update({"job-1", "job-2"})
+        mock_job_model.beat.side_effect = [RuntimeError("DynamoDB no disponible"), None]
+
+        beat_active_jobs()
+
+        assert sorted(c.args[0] for c in mock_job_model.beat.call_args_list) == ["job-1", "job-2"]
+
+
+class TestGetBulkJob:
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    def test_retorna_el_estado_del_job(self, mock_job_model):
+        mock_job_model.find.return_value.to_dict.return_value = {"job_id": "job-1", "status": "RUNNING"}
+
+        assert GetBulkJob("job-1").execute() == {"job_id": "job-1", "status": "RUNNING"}
+        # Un job huérfano se marca como fallido antes de responder
+        mock_job_model.find.return_value.expire_if_stale.assert_called_once()
+
+    @patch("src.commands.bulk_jobs.BulkJobModel")
+    def test_job_inexistente(self, mock_job_model):
+        mock_job_model.find.return_value = None
+
+        with pytest.raises(NotFoundError, match="no existe"):
+            GetBulkJob("job-x").execute()
@@ -0,0 +1,237 @@
+import datetime
+import pytest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+import pandas as pd
+from src.models.product import ProductModel
+from src.models.warehouse import WarehouseModel
+from src.commands.create_product import CreateProduct
+from src.commands.create_products_bulk import CreateProductsBulk
+from src.projector.change_feed import StreamsReader, PollingReader, ChangeEvent, UPSERT, REMOVE, SHARD_END
+from src.projector.mirror_projector import run_once
+
+
+class FakeCheckpoints:
+    def __init__(self, positions=None):
+        self.positions = dict(positions or {})
+        self.stored = []
+
+    def load(self, source):
+        return dict(self.positions)
+
+    def store(self, source, shard_id, position):
+        self.positions[shard_id] = position
+        self.stored.append((source, shard_id, position))
+
+
+def record(name, sequence, sku, image=True):
+    change = {"Keys": {"warehouse": {"S": "W1"}, "sku": {"S": sku}}, "SequenceNumber": sequence}
+    if image:
+        change["NewImage"] = {"warehouse": {"S": "W1"}, "sku": {"S": sku}, "stock": {"N": "1"}}
+    return {"eventName": name, "dynamodb": change}
+
+
+def build_reader(shards, checkpoints=None):
+    dynamodb, streams = MagicMock(), MagicMock()
+    dynamodb.describe_table.return_value = {"Table": {"LatestStreamArn": "arn:stream"}}
+    streams.describe_stream.return_value = {"StreamDescription": {"Shards": shards}}
+    streams.get_shard_iterator.side_effect = lambda **kw: {"ShardIterator": f"it-{kw['ShardId']}"}
+    reader = StreamsReader("Products", checkpoints or FakeCheckpoints(), "mirror#Products",
+                           dynamodb=dynamodb, streams=streams)
+    return reader, streams
+
+
+class TestStreamsReader:
+    """🧪 Pruebas unitarias del lector de DynamoDB Streams"""
+
+    def test_read_normaliza_registros_y_confirma_posicion(self):
+        checkpoints = FakeCheckpoints()
+        reader, streams = build_reader([{"ShardId": "s1"}], checkpoints)
+        streams.get_records.return_value = {
+            "Records": [record("INSERT", "10", "A"), record("REMOVE", "11", "B", image=False)],
+            "NextShardIterator": "it-next",
+        }
+
+        events = reader.read()
+
+        assert events == [
+            ChangeEvent("Products", UPSERT, {"warehouse": "W1", "sku": "A"},
+                        {"warehouse": {"S": "W1"}, "sku": {"S": "A"}, "stock": {"N": "1"}}),
+            ChangeEvent("Products", REMOVE, {"warehouse": "W1", "sku": "B"}, None),
+        ]
+        streams.get_shard_iterator.assert_called_once_with(
+            StreamArn="arn:stream", ShardId="s1", ShardIteratorType="TRIM_HORIZON")
+        assert checkpoints.stored == []
+
+        reader.commit()
+        assert checkpoints.stored == [("mirror#Products", "s1", "11")]
+
+    def test_read_retoma_desde_el_checkpoint(self):
+        reader, streams = build_reader([{"ShardId": "s1"}], FakeCheckpoints({"s1": "42"}))
+        streams.get_records.return_value = {"Records": [], "NextShardIterator": "it-next"}
+
+        reader.read()
+        reader.read()
+
+        streams.get_shard_iterator.assert_called_once_with(
+            StreamArn="arn:stream", ShardId="s1", ShardIteratorType="AFTER_SEQUENCE_NUMBER", SequenceNumber="42")
+        assert streams.get_records.call_args.kwargs["ShardIterator"] == "it-next"
+
+    def test_shard_hijo_espera_a_que_termine_el_padre(self):
+        checkpoints = FakeCheckpoints()
+        reader, streams = build_reader([{"ShardId": "parent"}, {"ShardId": "child", "ParentShardId": "parent"}],
+                                       checkpoints)
+        streams.get_records.return_value = {"Records": [record("MODIFY", "5", "A")]}  # Sin NextShardIterator: cerrado
+
+        reader.read()
+        assert [c.kwargs["ShardIterator"] for c in streams.get_records.call_args_list] == ["it-parent"]
+
+        reader.commit()
+        assert checkpoints.positions == {"parent": SHARD_END}
+
+        streams.get_records.return_value = {"Records": [], "NextShardIterator": "it-2"}
+        reader.read()
+        assert streams.get_records.call_args.kwargs["ShardIterator"] == "it-child"
+
+    def test_rewind_descarta_lo_leido(self):
+        checkpoints = FakeCheckpoints({"s1": "1"})
+        reader, streams = build_reader([{"ShardId": "s1"}], checkpoints)
+        streams.get_records.return_value = {"Records": [record("INSERT", "2", "A")], "NextShardIterator": "it-next"}
+
+        reader.read()
+        reader.rewind()
+        reader.read()
+
+        assert streams.get_shard_iterator.call_count == 2
+        assert streams.get_shard_iterator.call_args.kwargs["SequenceNumber"] == "1"
+
+    def test_iterador_vencido_se_renueva(self):
+        reader, streams = build_reader([{"ShardId": "s1"}])
+        expired = ClientError({"Error": {"Code": "ExpiredIteratorException"}}, "GetRecords")
+        streams.get_records.side_effect = [expired, {"Records": [record("INSERT", "3", "A")], "NextShardIterator": "x"}]
+
+        assert len(reader.read()) == 1
+        assert streams.get_shard_iterator.call_count == 2
+
+    def test_tabla_sin_streams(self):
+        reader, _ = build_reader([])
+        reader._dynamodb.describe_table.return_value = {"Table": {}}
+
+        with pytest.raises(RuntimeError, match="no tiene DynamoDB Streams"):
+            reader.read()
+
+
+class TestPollingReader:
+    """🧪 Pruebas unitarias del lector por polling (dynamodb-local)"""
+
+    @staticmethod
+    def warehouse(id, minute):
+        return WarehouseModel(
+            id=id, name="Bodega", address="Calle 1", country="CO", city="Bogotá", capacity=10,
+            updated_at=datetime.datetime(2030, 1, 1, 10, minute, tzinfo=datetime.timezone.utc),
+        )
+
+    @staticmethod
+    def position(minute, *ids):
+        keys = ",".join(f'["{id}"]' for id in ids)
+        return f'{{"updated_at":"2030-01-01T10:{minute:02d}:00.000000+0000","keys":[{keys}]}}'
+
+    @patch.object(WarehouseModel, "scan")
+    def test_read_filtra_por_updated_at_y_guarda_el_maximo(self, mock_scan):
+        checkpoints = FakeCheckpoints()
+        reader = PollingReader(WarehouseModel, checkpoints, "mirror#Warehouses")
+        mock_scan.return_value = [self.warehouse("1", 5), self.warehouse("2", 7), self.warehouse("3", 7)]
+
+        events = reader.read()
+
+        assert mock_scan.call_args.kwargs["filter_condition"] is None
+        assert [(e.table, e.kind, e.keys) for e in events] == [
+            ("Warehouses", UPSERT, {"id": "1"}), ("Warehouses", UPSERT, {"id": "2"}), ("Warehouses", UPSERT, {"id": "3"}),
+        ]
+
+        reader.commit()
+        assert checkpoints.positions == {"scan": self.position(7, "2", "3")}
+
+        mock_scan.return_value = []
+        reader.read()
+        condition = mock_scan.call_args.kwargs["filter_condition"]
+        assert condition.operator == ">="
+        assert condition.values[1].value == {"S": "2030-01-01T10:07:00.000000+0000"}
+
+    @patch.object(WarehouseModel, "scan")
+    def test_read_entrega_los_items_nuevos_con_la_misma_marca_de_tiempo(self, mock_scan):
+        checkpoints = FakeCheckpoints({"scan": self.position(7, "2")})
+        reader = PollingReader(WarehouseModel, checkpoints, "mirror#Warehouses")
+        # "2" ya se aplicó; "3" se escribió en el mismo instante después del último scan
+        mock_scan.return_value = [self.warehouse("2", 7), self.warehouse("3", 7)]
+
+        events = reader.read()
+        reader.commit()
+
+        assert [e.keys for e in events] == [{"id": "3"}]
+        assert checkpoints.positions == {"scan": self.position(7, "2", "3")}
+
+    @patch.object(WarehouseModel, "scan")
+    def test_polls_seguidos_sin_escrituras_no_reaplican_nada(self, mock_scan):
+        checkpoints = FakeCheckpoints()
+        reader = PollingReader(WarehouseModel, checkpoints, "mirror#Warehouses")
+        projector = MagicMock()
+        projector.apply.return_value = {"upserted": 1, "removed": 0}
+        # La fila del checkpoint cumple su propio filtro `>=` en cada scan
+        mock_scan.return_value = [self.warehouse("1", 5)]
+
+        assert run_once([reader], projector) == 1
+        assert run_once([reader], projector) == 0
+        assert run_once([reader], projector) == 0
+
+        projector.apply.assert_called_once()
+        assert checkpoints.stored == [("mirror#Warehouses", "scan", self.position(5, "1"))]
+
+    @patch.object(WarehouseModel, "scan")
+    def test_read_acepta_checkpoints_con_solo_la_marca_de_tiempo(self, mock_scan):
+        checkpoints = FakeCheckpoints({"scan": "2030-01-01T10:07:00.000000+0000"})
+        reader = PollingReader(WarehouseModel, checkpoints, "mirror#Warehouses")
+        mock_scan.return_value = [self.warehouse("2", 7)]
+
+        assert [e.keys for e in reader.read()] == [{"id": "2"}]
+
+
+class TestPollingReaderNewProducts:
+    """🧪 Los productos creados después del checkpoint llegan al proyector en modo polling"""
+
+    @staticmethod
+    def scan_table(products):
+        """Scan en memoria que evalúa el filtro `updated_at >= x` como lo haría DynamoDB."""
+        def scan(filter_condition=None):
+            if filter_condition is None:
+                return list(products)
+            since = ProductModel.updated_at.deserialize(filter_condition.values[1].value["S"])
+            return [p for p in products if p.updated_at is not None and p.updated_at >= since]
+        return scan
+
+    def test_read_retorna_productos_creados_despues_del_checkpoint(self):
+        checkpoint = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1)
+        checkpoints = FakeCheckpoints({"scan": ProductModel.updated_at.serialize(checkpoint)})
+        table = []
+        future = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=365)).date()
+
+        with patch.object(ProductModel, "find_existing_product", return_value=None), \
+                patch.object(ProductModel, "save", autospec=True, side_effect=table.append), \
+                patch.object(ProductModel, "batch_save", side_effect=lambda products: table.extend(products) or []):
+            CreateProduct(
+                provider_nit="1234567890", name="Paracetamol", product_type="Medicamento", stock=10,
+                expiration_date=future, temperature_required=25.0, batch="L001", status="Disponible",
+                unit_value=2.5, storage_conditions="Seco", warehouse="1", sku="SKU-1",
+            ).execute()
+            CreateProductsBulk(b"", "productos.csv", warehouse="1")._process(pd.DataFrame([{
+                "provider_nit": "123", "name": "Ibuprofeno", "product_type": "Medicamento", "stock": 5,
+                "expiration_date": future.isoformat(), "temperature_required": 4, "batch": "B001",
+                "status": "Disponible", "unit_value": 1, "storage_conditions": "Seco",
+            }]))
+
+        reader = PollingReader(ProductModel, checkpoints, "mirror#Products")
+        with patch.object(ProductModel, "scan", side_effect=self.scan_table(table)):
+            events = reader.read()
+
+        assert len(table) == 2
+        assert [e.keys["sku"] for e in events] == ["SKU-1", table[1].sku]
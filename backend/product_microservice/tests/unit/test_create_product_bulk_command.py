@@ -14,9 +14,10 @@ class TestCreateProductsBulkCommand:
         # Mock del método find_existing_product para simular que no hay duplicados
         mock_product_model.find_existing_product.return_value = None
 
-        # Mock de las instancias de ProductModel para save()
+        # Mock de las instancias de ProductModel y del guardado por lotes
         mock_product_instance = MagicMock()
         mock_product_model.return_value = mock_product_instance
+        mock_product_model.batch_save.return_value = []
 
         # DataFrame con productos válidos
         df = pd.DataFrame([
@@ -54,14 +55,50 @@ class TestCreateProductsBulkCommand:
         assert result["rechazados"] == 0
         assert "Carga completada" in result["mensaje"]
 
-        # Verificar que se llamó find_existing_product para cada producto
-        assert mock_product_model.find_existing_product.call_count == 2
+        # La validación es vectorizada: no se consulta DynamoDB por fila
+        mock_product_model.find_existing_product.assert_not_called()
 
         # Verificar que se crearon 2 instancias del modelo
         assert mock_product_model.call_count == 2
 
-        # Verificar que se llamó save() en cada instancia
-        assert mock_product_instance.save.call_count == 2
+        # Verificar que se guardaron en un solo lote, sin save() por fila
+        mock_product_model.batch_save.assert_called_once_with([mock_product_instance, mock_product_instance])
+        mock_product_instance.save.assert_not_called()
+
+    # 💾 Test: fallos de escritura reportados por ítem
+    @patch("src.commands.create_products_bulk.ProductModel")
+    def test_process_fallo_guardado_por_item(self, mock_product_model):
+        """💾 Los ítems que DynamoDB no procesa se reportan como rechazados"""
+        mock_product_model.side_effect = lambda **data: MagicMock(**data)
+        mock_product_model.batch_save.side_effect = lambda products: [(products[1], "Throttling")]
+
+        rows = [
+            {
+                "provider_nit": "123", "name": name, "product_type": "Tipo",
+                "stock": 5, "expiration_date": "2030-01-01", "temperature_required": 10,
+                "batch": "B001", "status": "Disponible", "unit_value": 10, "storage_conditions": "Seco"
+            }
+            for name in ["Uno", "Dos", "Tres"]
+        ]
+
+        cmd = CreateProductsBulk(b"", "productos.csv")
+        result = cmd._process(pd.DataFrame(rows))
+
+        assert result["exitosos"] == 2
+        assert result["rechazados"] == 1
+        assert result["rechazados_detalle"][0]["name"] == "Dos"
+        assert result["rechazados_detalle"][0]["error"] == "Error al guardar: Throttling"
+        assert "Carga parcial" in result["mensaje"]
+
+    # 🏬 Test: bodega inexistente
+    def test_execute_bodega_inexistente(self, known_warehouse):
+        """🏬 Lanza ApiError sin leer el archivo si la bodega no existe"""
+        known_warehouse.return_value = None
+        cmd = CreateProductsBulk(b"contenido", "productos.csv", warehouse="W9")
+        with patch.object(cmd, "_read_file") as mock_read:
+            with pytest.raises(ApiError, match="La bodega W9 no existe"):
+                cmd.execute()
+        mock_read.assert_not_called()
 
     # ⚙️ Test: formato no soportado
     def test_read_file_formato_no_soportado(self):
@@ -151,43 +188,38 @@ class TestCreateProductsBulkCommand:
         assert result["rechazados"] == 1
         assert "Fecha de vencimiento inválida" in result["rechazados_detalle"][0]["error"]
 
-    # ⚠️ Test: duplicado existente en DynamoDB
+    # 🚫 Test: campos vacíos o NaN
     @patch("src.commands.create_products_bulk.ProductModel")
-    def test_process_duplicado_existente(self, mock_product_model):
-        """⚠️ Detecta duplicado existente en la base de datos"""
-        # Mock para simular que existe un producto duplicado
-        mock_existing_product = MagicMock()
-        mock_product_model.find_existing_product.return_value = mock_existing_product
-
-        df = pd.DataFrame([{
-            "provider_nit": "123", "name": "Prod", "product_type": "Tipo",
-            "stock": 5, "expiration_date": "2030-01-01", "temperature_required": 10,
-            "batch": "B001", "status": "Disponible", "unit_value": 10, "storage_conditions": "Seco"
-        }])
+    def test_process_campos_faltantes(self, mock_product_model):
+        """🚫 Rechaza filas con campos obligatorios vacíos o NaN"""
+        df = pd.DataFrame([
+            {
+                "provider_nit": None, "name": "Prod", "product_type": "Tipo",
+                "stock": 5, "expiration_date": "2030-01-01", "temperature_required": 10,
+                "batch": "B001", "status": "Disponible", "unit_value": 10, "storage_conditions": "Seco"
+            },
+            {
+                "provider_nit": "123", "name": "   ", "product_type": "Tipo",
+                "stock": 5, "expiration_date": "2030-01-01", "temperature_required": 10,
+                "batch": "B001", "status": "Disponible", "unit_value": 10, "storage_conditions": "Seco"
+            },
+        ])
 
         cmd = CreateProductsBulk(b"", "productos.csv")
         result = cmd._process(df)
 
-        assert result["rechazados"] == 1
-        assert "Duplicado" in result["rechazados_detalle"][0]["error"]
-
-        # Verificar que se llamó find_existing_product con warehouse y sku generado
-        # El sku se genera como uuid, así que solo verificamos que fue llamado
-        mock_product_model.find_existing_product.assert_called_once()
-        call_args = mock_product_model.find_existing_product.call_args[0]
-        assert call_args[0] == "1"  # warehouse por defecto
-        assert len(call_args[1]) == 32  # sku generado como uuid hex
+        assert result["rechazados"] == 2
+        assert all("Campos obligatorios faltantes" in r["error"] for r in result["rechazados_detalle"])
+        assert result["rechazados_detalle"][0]["provider_nit"] is None
+        mock_product_model.assert_not_called()
 
-    # ⚡ Test: error ProductModel
+    # 🚫 Test: valores numéricos no parseables
     @patch("src.commands.create_products_bulk.ProductModel")
-    def test_process_error_modelo(self, mock_product_model):
-        """⚡ Maneja error del modelo correctamente"""
-        # Mock para simular error al buscar duplicados
-        mock_product_model.find_existing_product.side_effect = Exception("Falla de red")
-
+    def test_process_numericos_invalidos(self, mock_product_model):
+        """🚫 Rechaza stock no numérico sin interrumpir la carga"""
         df = pd.DataFrame([{
             "provider_nit": "123", "name": "Prod", "product_type": "Tipo",
-            "stock": 5, "expiration_date": "2030-01-01", "temperature_required": 10,
+            "stock": "diez", "expiration_date": "2030-01-01", "temperature_required": 10,
             "batch": "B001", "status": "Disponible", "unit_value": 10, "storage_conditions": "Seco"
         }])
 
@@ -195,7 +227,54 @@ class TestCreateProductsBulkCommand:
         result = cmd._process(df)
 
         assert result["rechazados"] == 1
-        assert "Error al verificar duplicados" in result["rechazados_detalle"][0]["error"]
+        assert "Campos numéricos inválidos" in result["rechazados_detalle"][0]["error"]
+        assert result["rechazados_detalle"][0]["stock"] == "diez"
+
+    # ✅ Test: productos válidos normalizados
+    def test_validate_normaliza_validos(self):
+        """✅ Los válidos salen con tipos nativos, sku único y bodega asignada"""
+        df = pd.DataFrame([
+            {
+                "provider_nit": " 123 ", "name": "Prod", "product_type": "Tipo",
+                "stock": "7", "expiration_date": "2030-01-01", "temperature_required": "4",
+                "batch": "B001", "status": "Disponible", "unit_value": "2.5", "storage_conditions": "Seco"
+            },
+            {
+                "provider_nit": "456", "name": "Prod 2", "product_type": "Tipo",
+                "stock": 0, "expiration_date": "2030-01-01", "temperature_required": 4,
+                "batch": "B002", "status": "Disponible", "unit_value": 1, "storage_conditions": "Seco"
+            },
+            {
+                "provider_nit": "789", "name": "Prod 3", "product_type": "Tipo",
+                "stock": 3, "expiration_date": "2030-02-01", "temperature_required": 4,
+                "batch": "B003", "status": "Disponible", "unit_value": 1, "storage_conditions": "Seco"
+            },
+        ])
+
+        cmd = CreateProductsBulk(b"", "productos.csv", warehouse="W9")
+        valid, invalid = cmd._validate(df)
+
+        assert len(valid) == 2
+        assert [r["error"] for r in invalid] == ["Stock debe ser positivo"]
+        first = valid[0]
+        assert first["provider_nit"] == "123"
+        assert first["stock"] == 7 and isinstance(first["stock"], int)
+        assert first["unit_value"] == 2.5
+        assert first["temperature_required"] == 4.0
+        assert first["expiration_date"] == "2030-01-01"
+        assert first["warehouse"] == "W9"
+        assert len(first["sku"]) == 32
+        assert first["sku"] != valid[1]["sku"]
+
+    # 🔑 Test: SKUs generados
+    def test_generate_skus_formato_uuid4(self):
+        """🔑 Los SKUs son UUID4 en hexadecimal y no se repiten"""
+        import uuid
+        skus = CreateProductsBulk._generate_skus(100)
+
+        assert len(set(skus)) == 100
+        assert all(uuid.UUID(sku).version == 4 for sku in skus)
+        assert CreateProductsBulk._generate_skus(0) == []
 
     # ✅ Test: carga parcial (<100%)
     @patch("src.commands.create_products_bulk.ProductModel")
@@ -178,3 +178,29 @@ class TestCreateProductCommand:
 
         with pytest.raises(ApiError, match="Error al crear producto"):
             producto.execute()
+
+    # 🏬 Bodega inexistente (resuelta desde la caché)
+    @patch("src.commands.create_product.ProductModel")
+    def test_bodega_inexistente(self, mock_product_model, known_warehouse):
+        """❌ Debe rechazar productos de bodegas que no existen, sin consultar ProductModel"""
+        known_warehouse.return_value = None
+
+        producto = CreateProduct(
+            provider_nit="1234567890",
+            name="Ibuprofeno 400mg",
+            product_type="Medicamento",
+            stock=10,
+            expiration_date=self._get_future_date_utc(120),
+            temperature_required=20.0,
+            batch="L004",
+            status="Disponible",
+            unit_value=2.0,
+            storage_conditions="Seco",
+            warehouse="WH999",
+            sku="SKU12348"
+        )
+
+        with pytest.raises(ParamError, match="La bodega WH999 no existe"):
+            producto.execute()
+        known_warehouse.assert_called_with("WH999")
+        mock_product_model.find_existing_product.assert_not_called()
@@ -0,0 +1,38 @@
+from unittest.mock import MagicMock, patch
+from src.queries.get_product_detail import GetProductDetailQuery
+
+
+def _mock_product(name):
+    product = MagicMock()
+    product.to_dict.return_value = {"name": name}
+    return product
+
+
+class TestGetProductDetailQuery:
+
+    # 🔎 Consulta el GSI por sku en lugar de escanear la tabla
+    @patch("src.queries.get_product_detail.ProductMirrorModel")
+    def test_execute_consulta_indice_sku(self, mock_model):
+        mock_model.sku_index.query.return_value = [_mock_product("Acetaminofén"), _mock_product("ibuprofeno")]
+
+        result = GetProductDetailQuery("SKU-1").execute()
+
+        assert [p["name"] for p in result] == ["Acetaminofén", "ibuprofeno"]
+        mock_model.sku_index.query.assert_called_once_with("SKU-1")
+        mock_model.scan.assert_not_called()
+
+    # 🔠 El orden ignora mayúsculas aunque el índice ordene en binario
+    @patch("src.queries.get_product_detail.ProductMirrorModel")
+    def test_execute_ordena_sin_distinguir_mayusculas(self, mock_model):
+        mock_model.sku_index.query.return_value = [_mock_product("Zinc"), _mock_product("aspirina")]
+
+        result = GetProductDetailQuery("SKU-1").execute()
+
+        assert [p["name"] for p in result] == ["aspirina", "Zinc"]
+
+    # 📭 Sin resultados
+    @patch("src.queries.get_product_detail.ProductMirrorModel")
+    def test_execute_sin_resultados(self, mock_model):
+        mock_model.sku_index.query.return_value = []
+
+        assert GetProductDetailQuery("NO-EXISTE").execute() == []
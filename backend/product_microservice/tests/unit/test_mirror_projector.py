@@ -0,0 +1,118 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.models.product import ProductModel
+from src.models.warehouse import WarehouseModel
+from src.projector.change_feed import ChangeEvent, UPSERT, REMOVE
+from src.projector.mirror_projector import MirrorProjector, run_once
+
+
+def product(sku, warehouse="W1", name="Producto"):
+    return ProductModel(
+        warehouse=warehouse, sku=sku, provider_nit="1234567890", name=name,
+        product_type="Tipo", stock=3, expiration_date="2030-01-01", temperature_required=4,
+        batch="B1", status="Disponible", unit_value=10, storage_conditions="Seco",
+    )
+
+
+def warehouse(id="W1", name="Bodega Norte"):
+    return WarehouseModel(id=id, name=name, address="Calle 1", country="Colombia", city="Bogotá", capacity=10)
+
+
+def product_event(item, kind=UPSERT):
+    keys = {"warehouse": item.warehouse, "sku": item.sku}
+    return ChangeEvent("Products", kind, keys, item.serialize() if kind == UPSERT else None)
+
+
+@pytest.fixture
+def batch_upsert():
+    with patch("src.projector.mirror_projector.ProductMirrorModel.batch_upsert") as mock:
+        yield mock
+
+
+class TestMirrorProjector:
+    """🧪 Pruebas unitarias del proyector de ProductsMirror"""
+
+    def test_apply_une_producto_con_bodega(self, known_warehouse, batch_upsert):
+        known_warehouse.return_value = warehouse()
+
+        result = MirrorProjector().apply([product_event(product("A"))])
+
+        assert result == {"upserted": 1, "removed": 0}
+        known_warehouse.assert_called_once_with("W1")
+        mirrors, removed = batch_upsert.call_args.args
+        assert removed == []
+        assert mirrors[0].id == "W1#A"
+        assert mirrors[0].warehouse_name == "Bodega Norte"
+        assert mirrors[0].warehouse_city == "Bogotá"
+
+    def test_apply_conserva_el_ultimo_cambio_por_llave(self, batch_upsert):
+        events = [
+            product_event(product("A", name="Viejo")),
+            product_event(product("A", name="Nuevo")),
+            product_event(product("B")),
+            product_event(product("B"), kind=REMOVE),
+        ]
+
+        result = MirrorProjector().apply(events)
+
+        assert result == {"upserted": 1, "removed": 1}
+        mirrors, removed = batch_upsert.call_args.args
+        assert [m.name for m in mirrors] == ["Nuevo"]
+        assert removed == ["W1#B"]
+
+    @patch.object(ProductModel, "query", return_value=[product("A"), product("B")])
+    def test_cambio_de_bodega_reproyecta_sus_productos(self, mock_query, known_warehouse, batch_upsert):
+        updated = warehouse(name="Bodega Renombrada")
+        event = ChangeEvent("Warehouses", UPSERT, {"id": "W1"}, updated.serialize())
+
+        result = MirrorProjector().apply([event])
+
+        assert result == {"upserted": 2, "removed": 0}
+        mock_query.assert_called_once_with("W1")
+        known_warehouse.assert_not_called()
+        mirrors, _ = batch_upsert.call_args.args
+        assert {m.warehouse_name for m in mirrors} == {"Bodega Renombrada"}
+
+    def test_producto_incompleto_se_omite(self, known_warehouse, batch_upsert):
+        known_warehouse.return_value = None
+        incomplete = product("A")
+        incomplete.name = None
+        event = ChangeEvent("Products", UPSERT, {"warehouse": "W1", "sku": "A"}, incomplete.serialize(null_check=False))
+
+        result = MirrorProjector().apply([event, product_event(product("B"))])
+
+        assert result == {"upserted": 1, "removed": 0}
+        mirrors, _ = batch_upsert.call_args.args
+        assert mirrors[0].id == "W1#B"
+        assert mirrors[0].warehouse_name == "W1"
+
+    def test_sello_de_version_no_se_proyecta(self, known_warehouse, batch_upsert):
+        event = ChangeEvent("Warehouses", UPSERT, {"id": "#version"}, {"id": {"S": "#version"}, "version": {"N": "2"}})
+
+        assert MirrorProjector().apply([event]) == {"upserted": 0, "removed": 0}
+        known_warehouse.assert_not_called()
+
+
+class TestRunOnce:
+    """🧪 Pruebas unitarias del ciclo lectura -> proyección -> checkpoint"""
+
+    def test_confirma_despues_de_aplicar(self):
+        reader = MagicMock(table_name="Products")
+        reader.read.return_value = ["evento"]
+        projector = MagicMock()
+        projector.apply.return_value = {"upserted": 1, "removed": 0}
+
+        assert run_once([reader], projector) == 1
+        projector.apply.assert_called_once_with(["evento"])
+        reader.commit.assert_called_once()
+
+    def test_error_al_aplicar_rebobina_sin_confirmar(self):
+        reader = MagicMock(table_name="Products")
+        reader.read.return_value = ["evento"]
+        projector = MagicMock()
+        projector.apply.side_effect = Exception("DynamoDB")
+
+        with pytest.raises(Exception, match="DynamoDB"):
+            run_once([reader], projector)
+        reader.rewind.assert_called_once()
+        reader.commit.assert_not_called()
@@ -0,0 +1,169 @@
+import time
+import pytest
+from src.queries.product_search_index import ProductSearchIndex, normalize
+
+
+def _product(id, name, batch="L1", status="Disponible", warehouse_name="Bodega Norte"):
+    return {"id": id, "name": name, "batch": batch, "status": status, "warehouse_name": warehouse_name}
+
+
+class TestProductSearchIndex:
+
+    def test_normalize_ignora_mayusculas_y_tildes(self):
+        assert normalize("  Acetaminofén ") == "acetaminofen"
+        assert normalize(None) == ""
+
+    def test_busqueda_por_subcadena_sin_distinguir_mayusculas(self):
+        index = ProductSearchIndex(loader=lambda: [_product("1", "Ibuprofeno"), _product("2", "Acetaminofén")])
+
+        assert [p["id"] for p in index.search(product_name="PROFEN")] == ["1"]
+        assert [p["id"] for p in index.search(product_name="minofen")] == ["2"]
+        assert index.search(product_name="xyz") == []
+
+    def test_consultas_cortas_usan_prefijos_de_palabra(self):
+        index = ProductSearchIndex(loader=lambda: [_product("1", "Suero oral"), _product("2", "Ibuprofeno")])
+
+        assert [p["id"] for p in index.search(product_name="or")] == ["1"]
+        assert [p["id"] for p in index.search(product_name="i")] == ["2"]
+
+    def test_descarta_falsos_positivos_de_ngramas(self):
+        # "abcxbcd" contiene los trigramas de "abcd" ("abc", "bcd") pero no la subcadena
+        index = ProductSearchIndex(loader=lambda: [_product("1", "abcxbcd"), _product("2", "abcd")])
+
+        assert [p["id"] for p in index.search(product_name="abcd")] == ["2"]
+
+    def test_lote_y_estado_son_igualdad(self):
+        index = ProductSearchIndex(loader=lambda: [
+            _product("1", "A", batch="L1"), _product("2", "B", batch="L10", status="Agotado"),
+        ])
+
+        assert [p["id"] for p in index.search(batch="l1")] == ["1"]
+        assert [p["id"] for p in index.search(status="AGOTADO", warehouse_name="norte")] == ["2"]
+
+    def test_upsert_reemplaza_y_remove_elimina(self):
+        index = ProductSearchIndex(loader=lambda: [_product("1", "Ibuprofeno")])
+        index.search()
+
+        index.upsert(_product("1", "Naproxeno"))
+        index.upsert(_product("2", "Loratadina"))
+
+        assert index.search(product_name="ibupro") == []
+        assert [p["id"] for p in index.search(product_name="prox")] == ["1"]
+
+        index.remove("2")
+        assert [p["id"] for p in index.search()] == ["1"]
+
+    def test_carga_una_sola_vez(self):
+        calls = []
+        index = ProductSearchIndex(loader=lambda: calls.append(1) or [_product("1", "A")])
+
+        index.search()
+        index.search(product_name="a")
+
+        assert len(calls) == 1
+
+    def test_clear_fuerza_recarga(self):
+        calls = []
+        index = ProductSearchIndex(loader=lambda: calls.append(1) or [])
+
+        index.search()
+        index.clear()
+        index.search()
+
+        assert len(calls) == 2
+
+    def test_refresco_en_segundo_plano_conserva_escrituras_locales(self):
+        catalog = [[_product("1", "Ibuprofeno")], [_product("1", "Ibuprofeno"), _product("2", "Otro worker")]]
+        index = ProductSearchIndex(loader=lambda: catalog.pop(0))
+        index.search()
+
+        # Escritura local mientras otra reconstrucción está en curso
+        index._refreshing = True
+        index.upsert(_product("3", "Escrito aquí"))
+        index._rebuild()
+
+        assert sorted(p["id"] for p in index.search()) == ["1", "2", "3"]
+
+    def test_error_en_la_carga_inicial_se_propaga(self):
+        def loader():
+            raise RuntimeError("DynamoDB caído")
+
+        index = ProductSearchIndex(loader=loader)
+
+        with pytest.raises(RuntimeError):
+            index.search()
+
+    def _wait_rebuild(self, index):
+        for _ in range(100):
+            if not index._refreshing:
+                return
+            time.sleep(0.01)
+
+    def test_cambio_de_version_reconstruye_en_segundo_plano(self):
+        catalog = [[_product("1", "A")], [_product("1", "A"), _product("2", "B")]]
+        versions = [1]
+        index = ProductSearchIndex(loader=lambda: catalog.pop(0), version_reader=lambda: versions[0], check_seconds=0)
+        index.search()
+
+        versions[0] = 2
+        index.search()  # Responde con los datos actuales y dispara la reconstrucción
+        self._wait_rebuild(index)
+
+        assert sorted(p["id"] for p in index.search()) == ["1", "2"]
+
+    def test_misma_version_no_reconstruye(self):
+        calls = []
+        index = ProductSearchIndex(
+            loader=lambda: calls.append(1) or [_product("1", "A")], version_reader=lambda: 1, check_seconds=0,
+        )
+
+        index.search()
+        index.search()
+        self._wait_rebuild(index)
+
+        assert len(calls) == 1
+
+    def test_version_solo_se_revisa_cada_check_seconds(self):
+        now = [0.0]
+        reads = []
+        index = ProductSearchIndex(
+            loader=lambda: [], version_reader=lambda: reads.append(1) or 1, check_seconds=5, clock=lambda: now[0],
+        )
+        index.search()  # Carga inicial: lee la versión una vez
+
+        now[0] = 4
+        index.search()
+        assert len(reads) == 1
+
+        now[0] = 6
+        index.search()
+        assert len(reads) == 2
+
+    def test_remove_durante_reconstruccion_no_revive(self):
+        catalog = [[_product("1", "A"), _product("2", "B")], [_product("1", "A"), _product("2", "B")]]
+        index = ProductSearchIndex(loader=lambda: catalog.pop(0))
+        index.search()
+
+        index._refreshing = True
+        index.remove("2")
+        index._rebuild()
+
+        assert [p["id"] for p in index.search()] == ["1"]
+
+    def test_remove_poda_postings_vacios(self):
+        index = ProductSearchIndex(loader=lambda: [_product("1", "Ibuprofeno", batch="L9")])
+        index.search()
+
+        index.remove("1")
+
+        assert not index._grams["name"]
+        assert not index._values["batch"]
+
+    def test_iter_search_entrega_resultados_uno_a_uno(self):
+        index = ProductSearchIndex(loader=lambda: [_product("2", "Beta"), _product("1", "Alfa")])
+
+        results = index.iter_search()
+
+        assert not isinstance(results, list)
+        assert next(results)["id"] == "1"
+        assert [p["id"] for p in results] == ["2"]
@@ -0,0 +1,77 @@
+import pytest
+from src.queries.search_products import SearchProductsQuery
+from src.queries.product_search_index import ProductSearchIndex
+from src.errors.errors import ParamError
+from src.utils.pagination import encode_cursor
+
+
+def _product(id, name, batch="L1", status="Disponible", warehouse_name="Bodega Norte"):
+    return {"id": id, "name": name, "batch": batch, "status": status, "warehouse_name": warehouse_name}
+
+
+@pytest.fixture
+def index():
+    products = [
+        _product("1", "Ibuprofeno 400mg"),
+        _product("2", "Acetaminofén", batch="L2", warehouse_name="Bodega Sur"),
+        _product("3", "Amoxicilina", status="Agotado"),
+    ]
+    return ProductSearchIndex(loader=lambda: iter(products))
+
+
+class TestSearchProductsQuery:
+
+    # ✅ Sin filtros: todo el catálogo ordenado por nombre
+    def test_execute_ordena_por_nombre(self, index):
+        result = SearchProductsQuery(index=index).execute()
+
+        assert [p["name"] for p in result] == ["Acetaminofén", "Amoxicilina", "Ibuprofeno 400mg"]
+
+    # 🔎 Filtros combinados
+    def test_execute_filtra(self, index):
+        result = SearchProductsQuery(product_name="A", status="disponible", index=index).execute()
+
+        assert [p["id"] for p in result] == ["2"]
+
+    # 📄 Con limit: una sola página y next_cursor
+    def test_execute_paginado(self, index):
+        first = SearchProductsQuery(limit="2", index=index).execute()
+
+        assert [p["id"] for p in first["items"]] == ["2", "3"]
+        assert first["next_cursor"] == encode_cursor({"name": "amoxicilina", "id": "3"})
+
+        second = SearchProductsQuery(limit="2", cursor=first["next_cursor"], index=index).execute()
+
+        assert [p["id"] for p in second["items"]] == ["1"]
+        assert second["next_cursor"] is None
+
+    # 🔁 Las escrituras entre páginas no saltan ni repiten productos
+    def test_execute_paginado_estable_ante_escrituras(self, index):
+        first = SearchProductsQuery(limit="2", index=index).execute()
+
+        # Se elimina un producto ya entregado y se agregan otros antes y después del cursor
+        index.remove("2")
+        index.upsert(_product("6", "Abacavir"))
+        index.upsert(_product("4", "Aspirina"))
+        index.upsert(_product("5", "Loratadina"))
+        second = SearchProductsQuery(limit="2", cursor=first["next_cursor"], index=index).execute()
+
+        assert [p["id"] for p in first["items"]] == ["2", "3"]
+        assert [p["id"] for p in second["items"]] == ["4", "1"]
+
+        third = SearchProductsQuery(limit="2", cursor=second["next_cursor"], index=index).execute()
+        assert [p["id"] for p in third["items"]] == ["5"]
+        assert third["next_cursor"] is None
+
+    # 🚫 Cursor inválido
+    @pytest.mark.parametrize("cursor", ["###", encode_cursor({"offset": 2}), encode_cursor({"id": "x"})])
+    def test_execute_cursor_invalido(self, index, cursor):
+        with pytest.raises(ParamError, match="cursor"):
+            SearchProductsQuery(cursor=cursor, index=index).execute()
+
+    # 📤 Streaming
+    def test_stream_recorre_resultados(self, index):
+        result = SearchProductsQuery(warehouse_name="sur", index=index).stream()
+
+        assert not isinstance(result, list)
+        assert [p["id"] for p in result] == ["2"]
@@ -0,0 +1,65 @@
+import json
+import time
+import pytest
+from unittest.mock import patch
+from src import startup
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(startup, "STATE_FILE", str(tmp_path / "ready.json"))
+    monkeypatch.setattr(startup, "_ready", False)
+    with patch("src.startup.init_db") as init_db, \
+            patch("src.startup.WarehouseModel.populate", return_value=True) as populate:
+        yield init_db, populate
+
+
+class TestEnsureReady:
+    """🧪 Pruebas unitarias del arranque compartido entre workers"""
+
+    def test_primer_worker_verifica_y_siembra(self, pipeline):
+        init_db, populate = pipeline
+
+        startup.ensure_ready()
+        startup.ensure_ready()
+
+        init_db.assert_called_once()
+        populate.assert_called_once()
+        with open(startup.STATE_FILE) as handle:
+            assert json.load(handle)["fingerprint"] == startup._fingerprint()
+
+    def test_otro_worker_reutiliza_el_resultado(self, pipeline, monkeypatch):
+        init_db, populate = pipeline
+        startup.ensure_ready()
+
+        # Un nuevo worker (o un reinicio en caliente) arranca con su propio estado en memoria
+        monkeypatch.setattr(startup, "_ready", False)
+        startup.ensure_ready()
+
+        init_db.assert_called_once()
+        populate.assert_called_once()
+
+    @pytest.mark.parametrize("state", [
+        {"fingerprint": "otro-endpoint", "checked_at": time.time()},
+        {"fingerprint": None, "checked_at": 0},
+    ])
+    def test_estado_vencido_o_de_otra_configuracion_se_verifica(self, pipeline, state):
+        init_db, _ = pipeline
+        if state["fingerprint"] is None:
+            state["fingerprint"] = startup._fingerprint()
+        with open(startup.STATE_FILE, "w") as handle:
+            json.dump(state, handle)
+
+        startup.ensure_ready()
+
+        init_db.assert_called_once()
+
+    def test_error_no_marca_el_arranque(self, pipeline):
+        init_db, _ = pipeline
+        init_db.side_effect = Exception('La tabla "Products" no existe')
+
+        with pytest.raises(Exception, match="no existe"):
+            startup.ensure_ready()
+
+        assert startup._read_state() is None
+        assert startup._ready is False
@@ -0,0 +1,34 @@
+import json
+from flask import Flask, request
+from src.utils.streaming import wants_ndjson, ndjson_response, NDJSON_MIMETYPE
+
+
+app = Flask(__name__)
+
+
+class TestStreaming:
+    # ✅ Solo se activa con el Accept explícito
+    def test_wants_ndjson_con_accept_explicito(self):
+        with app.test_request_context("/", headers={"Accept": NDJSON_MIMETYPE}):
+            assert wants_ndjson(request) is True
+
+    # ⚠️ */* o JSON mantienen la respuesta tradicional
+    def test_wants_ndjson_por_defecto(self):
+        with app.test_request_context("/", headers={"Accept": "*/*"}):
+            assert wants_ndjson(request) is False
+        with app.test_request_context("/", headers={"Accept": "application/json"}):
+            assert wants_ndjson(request) is False
+        with app.test_request_context("/"):
+            assert wants_ndjson(request) is False
+
+    # 📤 Un objeto JSON por línea
+    def test_ndjson_response_emite_una_linea_por_item(self):
+        items = ({"id": str(i)} for i in range(3))
+
+        with app.test_request_context("/"):
+            response = ndjson_response(items)
+            body = response.get_data(as_text=True)
+
+        assert response.mimetype == NDJSON_MIMETYPE
+        lines = body.strip().split("\n")
+        assert [json.loads(line) for line in lines] == [{"id": "0"}, {"id": "1"}, {"id": "2"}]
@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import patch
+from src.commands.update_stock_bulk import UpdateStockBulk
+from src.errors.errors import ParamError, ApiError
+
+
+class TestUpdateStockBulkCommand:
+    """🧪 Pruebas unitarias para UpdateStockBulk"""
+
+    @patch("src.commands.update_stock_bulk.ProductModel.batch_update_stock")
+    def test_execute_aplica_ajustes(self, mock_batch):
+        mock_batch.return_value = ({("W1", "S1"): 15}, [(("W1", "S2"), "Producto no encontrado")])
+
+        result = UpdateStockBulk([
+            {"warehouse": "W1", "sku": "S1", "amount": 5},
+            {"warehouse": "W1", "sku": "S2", "amount": -1},
+        ]).execute()
+
+        mock_batch.assert_called_once_with([("W1", "S1", 5), ("W1", "S2", -1)])
+        assert result == {
+            "updated": [{"warehouse": "W1", "sku": "S1", "stock": 15}],
+            "failed": [{"warehouse": "W1", "sku": "S2", "error": "Producto no encontrado"}],
+        }
+
+    @pytest.mark.parametrize("items, message", [
+        (None, "lista no vacía"),
+        ([], "lista no vacía"),
+        ([{"sku": "S1", "amount": 1}], "'warehouse' y 'sku' son obligatorios"),
+        ([{"warehouse": "W1", "sku": "S1", "amount": 0}], "entero distinto de cero"),
+        ([{"warehouse": "W1", "sku": "S1", "amount": "5"}], "entero distinto de cero"),
+        (["W1"], "'warehouse' y 'sku' son obligatorios"),
+    ])
+    def test_execute_valida_items(self, items, message):
+        with pytest.raises(ParamError, match=message):
+            UpdateStockBulk(items).execute()
+
+    @patch("src.commands.update_stock_bulk.ProductModel.batch_update_stock", side_effect=Exception("DynamoDB"))
+    def test_execute_error_interno(self, mock_batch):
+        with pytest.raises(ApiError, match="Error al actualizar stock"):
+            UpdateStockBulk([{"warehouse": "W1", "sku": "S1", "amount": 1}]).execute()
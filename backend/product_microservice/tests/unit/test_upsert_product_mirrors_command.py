@@ -0,0 +1,71 @@
+import pytest
+from unittest.mock import patch
+from src.commands.upsert_product_mirrors import UpsertProductMirrors
+from src.errors.errors import ParamError, ApiError
+
+
+def mirror_body(sku="S1", warehouse="W1", name="Producto", **overrides):
+    body = {
+        "sku": sku, "provider_nit": "1234567890", "name": name, "product_type": "Tipo",
+        "stock": 5, "expiration_date": "2030-01-01", "temperature_required": 4, "batch": "B1",
+        "status": "Disponible", "unit_value": 10, "storage_conditions": "Seco",
+        "warehouse": warehouse, "warehouse_name": "Bodega", "warehouse_address": "Calle 1",
+        "warehouse_country": "Colombia", "warehouse_city": "Bogotá",
+    }
+    body.update(overrides)
+    return body
+
+
+class TestUpsertProductMirrorsCommand:
+    """🧪 Pruebas unitarias para UpsertProductMirrors"""
+
+    @patch("src.commands.upsert_product_mirrors.search_index")
+    @patch("src.commands.upsert_product_mirrors.ProductMirrorModel.batch_upsert")
+    def test_execute_usa_ids_deterministas_y_deduplica(self, mock_batch, mock_index):
+        result = UpsertProductMirrors([
+            mirror_body("S1", name="Viejo"),
+            mirror_body("S2"),
+            mirror_body("S1", name="Nuevo"),
+        ]).execute()
+
+        assert result == {"upserted": 2, "ids": ["W1#S2", "W1#S1"]}
+        mirrors = mock_batch.call_args.args[0]
+        assert [(m.id, m.name) for m in mirrors] == [("W1#S2", "Producto"), ("W1#S1", "Nuevo")]
+        assert mock_index.upsert.call_count == 2
+
+    @patch("src.commands.upsert_product_mirrors.search_index")
+    @patch("src.commands.upsert_product_mirrors.ProductMirrorModel.batch_upsert")
+    def test_execute_completa_la_bodega_desde_la_cache(self, mock_batch, _, known_warehouse):
+        body = mirror_body(warehouse="1")
+        for field in ("warehouse_name", "warehouse_address", "warehouse_country", "warehouse_city"):
+            body.pop(field)
+
+        UpsertProductMirrors([body]).execute()
+
+        known_warehouse.assert_called_once_with("1")
+        mirror = mock_batch.call_args.args[0][0]
+        assert (mirror.warehouse_name, mirror.warehouse_city) == ("Bodega Principal", "Medellin")
+
+    def test_execute_bodega_desconocida_sin_datos(self, known_warehouse):
+        known_warehouse.return_value = None
+        body = mirror_body()
+        body.pop("warehouse_name")
+
+        with pytest.raises(ParamError, match="el campo 'warehouse_name' es obligatorio"):
+            UpsertProductMirrors([body]).execute()
+
+    @pytest.mark.parametrize("items, message", [
+        (None, "lista no vacía"),
+        ([], "lista no vacía"),
+        (["S1"], "debe ser un objeto"),
+        ([{"sku": "S1"}], "items\\[0\\]: el campo 'expiration_date' es obligatorio"),
+        ([mirror_body(expiration_date="01/01/2030")], "formato YYYY-MM-DD"),
+    ])
+    def test_execute_valida_items(self, items, message):
+        with pytest.raises(ParamError, match=message):
+            UpsertProductMirrors(items).execute()
+
+    @patch("src.commands.upsert_product_mirrors.ProductMirrorModel.batch_upsert", side_effect=Exception("DynamoDB"))
+    def test_execute_error_interno(self, _):
+        with pytest.raises(ApiError, match="Error al sincronizar espejos"):
+            UpsertProductMirrors([mirror_body()]).execute()
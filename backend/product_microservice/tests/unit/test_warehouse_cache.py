@@ -0,0 +1,80 @@
+from unittest.mock import patch
+from src.models.warehouse import WarehouseModel
+from src.queries.warehouse_cache import WarehouseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def warehouse(id, name="Bodega"):
+    return WarehouseModel(id=id, name=name, address="Calle 1", country="Colombia", city="Bogotá", capacity=10)
+
+
+@patch.object(WarehouseModel, "current_version", return_value=1)
+@patch.object(WarehouseModel, "get_all")
+class TestWarehouseCache:
+    """🧪 Pruebas unitarias de la caché de bodegas"""
+
+    def test_preload_y_lecturas_sin_ir_a_dynamodb(self, mock_get_all, mock_version):
+        mock_get_all.return_value = [warehouse("1"), warehouse("2")]
+        cache = WarehouseCache(ttl=60, clock=FakeClock())
+
+        cache.preload()
+
+        assert cache.get("1").id == "1"
+        assert [w.id for w in cache.all()] == ["1", "2"]
+        assert mock_get_all.call_count == 1
+        assert mock_version.call_count == 1
+
+    def test_ttl_vencido_con_misma_version_no_reescanea(self, mock_get_all, mock_version):
+        mock_get_all.return_value = [warehouse("1")]
+        clock = FakeClock()
+        cache = WarehouseCache(ttl=60, clock=clock)
+        cache.preload()
+
+        clock.now = 61
+        cache.get("1")
+        cache.get("1")
+
+        assert mock_get_all.call_count == 1
+        assert mock_version.call_count == 2
+
+    def test_version_nueva_recarga_las_bodegas(self, mock_get_all, mock_version):
+        mock_get_all.return_value = [warehouse("1", "Vieja")]
+        clock = FakeClock()
+        cache = WarehouseCache(ttl=60, clock=clock)
+        cache.preload()
+
+        mock_version.return_value = 2
+        mock_get_all.return_value = [warehouse("1", "Nueva")]
+        clock.now = 61
+
+        assert cache.get("1").name == "Nueva"
+        assert mock_get_all.call_count == 2
+
+    def test_id_desconocido_revisa_la_version(self, mock_get_all, mock_version):
+        mock_get_all.return_value = [warehouse("1")]
+        cache = WarehouseCache(ttl=60, clock=FakeClock())
+        cache.preload()
+
+        mock_version.return_value = 2
+        mock_get_all.return_value = [warehouse("1"), warehouse("2")]
+
+        assert cache.get("2").id == "2"
+        assert cache.get("3") is None
+        assert mock_get_all.call_count == 2
+
+    def test_invalidate_fuerza_recarga(self, mock_get_all, mock_version):
+        mock_get_all.return_value = [warehouse("1")]
+        cache = WarehouseCache(ttl=60, clock=FakeClock())
+        cache.preload()
+
+        cache.invalidate()
+        cache.all()
+
+        assert mock_get_all.call_count == 2
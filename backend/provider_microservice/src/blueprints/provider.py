@@ -2,9 +2,10 @@ from flask import jsonify, Blueprint, request
 from ..commands.ping import PingCommand
 from ..commands.create_provider import CreateProvider
 from ..commands.view_all import GetAllProviders
-from ..commands.create_providers_bulk import CreateProvidersBulk
+from ..commands.bulk_jobs import SubmitProvidersBulkJob, GetBulkJob
 from ..models.provider import NewProviderJsonSchema
-from ..errors.errors import ParamError, ApiError
+from ..errors.errors import ParamError, ApiError, NotFoundError
+from ..utils.streaming import wants_ndjson, ndjson_response
 from flask_cognito import cognito_auth_required
 
 providers_blueprint = Blueprint("provider", __name__)
@@ -53,6 +54,9 @@ def create_provider():
 @cognito_auth_required
 def get_all_providers():
     try:
+        if wants_ndjson(request):
+            return ndjson_response(GetAllProviders().stream())
+
         providers = GetAllProviders().execute()
         return jsonify(providers), 200
     except ApiError as e:
@@ -69,11 +73,23 @@ def bulk_upload_providers():
             return jsonify({"error": "No se adjuntó ningún archivo"}), 400
 
         file = request.files["file"]
-        command = CreateProvidersBulk(file.read(), file.filename)
-        result = command.execute()
-        return jsonify(result), 200
+        # El archivo se procesa en segundo plano; el progreso se consulta en /bulk/<job_id>
+        job = SubmitProvidersBulkJob(file).execute()
+        return jsonify(job), 202
 
     except ApiError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
+
+
+@providers_blueprint.get("/bulk/<string:job_id>")
+@cognito_auth_required
+def get_bulk_upload_job(job_id):
+    try:
+        return jsonify(GetBulkJob(job_id).execute()), 200
+
+    except NotFoundError as e:
+        return jsonify({"error": e.description}), 404
+    except ApiError as e:
+        return jsonify({"error": str(e)}), 500
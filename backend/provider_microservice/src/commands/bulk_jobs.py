@@ -0,0 +1,128 @@
+"""
+Cargas masivas en segundo plano dentro del worker web.
+
+Cada job se ejecuta a lo sumo una vez: un hilo del worker late por todos sus
+jobs en cola o en curso, y si el worker se reinicia o se despliega el latido se
+detiene y GET /bulk/<job_id> marca el job como FAILED. Los bloques ya reportados
+quedan guardados y el resto de filas no se reintenta.
+"""
+import os
+import time
+import shutil
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .base_command import BaseCommannd
+from .create_providers_bulk import CreateProvidersBulk
+from ..errors.errors import NotFoundError
+from ..models.bulk_job import BulkJob
+
+logger = logging.getLogger(__name__)
+
+# Hilos por worker que procesan cargas masivas en segundo plano
+BULK_JOB_WORKERS = int(os.getenv("BULK_JOB_WORKERS", "2"))
+# Filas que se validan y guardan antes de reportar progreso
+BULK_JOB_CHUNK_ROWS = int(os.getenv("BULK_JOB_CHUNK_ROWS", "500"))
+# Carpeta donde se guardan los archivos subidos mientras su job los procesa
+BULK_UPLOAD_DIR = os.getenv("BULK_UPLOAD_DIR") or tempfile.gettempdir()
+# Cada cuánto se renueva el latido de los jobs del worker (menor que BULK_JOB_STALE_SECONDS)
+BULK_JOB_HEARTBEAT_SECONDS = int(os.getenv("BULK_JOB_HEARTBEAT_SECONDS", "30"))
+UPLOAD_COPY_BYTES = 1024 * 1024
+
+_lock = threading.Lock()
+_executor = None
+_executor_pid = None
+_active_jobs = set()
+
+
+def get_executor():
+    """
+    Pool de hilos del worker; se crea al primer job y de nuevo si el proceso fue bifurcado,
+    junto con el hilo que late por los jobs activos.
+    """
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=BULK_JOB_WORKERS, thread_name_prefix="bulk-job")
+            _executor_pid = os.getpid()
+            _active_jobs.clear()
+            threading.Thread(target=_heartbeat_loop, name="bulk-job-heartbeat", daemon=True).start()
+        return _executor
+
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(BULK_JOB_HEARTBEAT_SECONDS)
+        beat_active_jobs()
+
+
+def beat_active_jobs():
+    """Renueva el latido de los jobs en cola o en curso de este worker."""
+    with _lock:
+        job_ids = list(_active_jobs)
+    for job_id in job_ids:
+        try:
+            BulkJob.beat(job_id)
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo renovar el latido de la carga masiva {job_id}: {e}")
+
+
+def spool_upload(file):
+    """Copia el archivo subido a disco de a 1 MB; el job lo lee por bloques y lo borra al terminar."""
+    handle, path = tempfile.mkstemp(prefix="bulk-", suffix=os.path.splitext(file.filename)[1], dir=BULK_UPLOAD_DIR)
+    with os.fdopen(handle, "wb") as target:
+        shutil.copyfileobj(file.stream, target, UPLOAD_COPY_BYTES)
+    return path
+
+
+def run_bulk_job(job: BulkJob, file_path, filename):
+    """Procesa el archivo por bloques y deja el progreso en la tabla de jobs."""
+    try:
+        job.start()
+        # El comando se crea en el hilo del job: los resources de boto3 no se comparten entre hilos
+        command = CreateProvidersBulk(None, filename, file_path=file_path)
+        command.execute_in_chunks(BULK_JOB_CHUNK_ROWS, job.record_chunk)
+        job.finish()
+        logger.info(f"✅ Carga masiva {job.job_id} completada")
+    except Exception as e:
+        logger.exception(f"❌ Carga masiva {job.job_id} fallida: {e}")
+        job.fail(str(e))
+    finally:
+        with _lock:
+            _active_jobs.discard(job.job_id)
+        os.remove(file_path)
+
+
+class SubmitProvidersBulkJob(BaseCommannd):
+    def __init__(self, file):
+        self.file = file
+        self.filename = file.filename
+
+    def execute(self):
+        # El formato se valida antes de encolar para responder 400 de inmediato
+        CreateProvidersBulk.check_upload(self.filename)
+        file_path = spool_upload(self.file)
+        try:
+            job = BulkJob.create(self.filename)
+            executor = get_executor()
+            with _lock:
+                _active_jobs.add(job.job_id)
+            executor.submit(run_bulk_job, job, file_path, self.filename)
+        except Exception:
+            os.remove(file_path)
+            raise
+        logger.info(f"📥 Carga masiva {job.job_id} encolada ({self.filename})")
+        return {"job_id": job.job_id, "status": job.status}
+
+
+class GetBulkJob(BaseCommannd):
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def execute(self):
+        job = BulkJob.find(self.job_id)
+        if job is None:
+            raise NotFoundError(f"La carga masiva {self.job_id} no existe.")
+        job.expire_if_stale()
+        return job.to_dict()
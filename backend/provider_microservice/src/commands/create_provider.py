@@ -1,4 +1,3 @@
-import boto3
 import uuid
 import re
 import hashlib
@@ -6,7 +5,7 @@ import logging
 from botocore.exceptions import ClientError
 from .base_command import BaseCommannd
 from ..errors.errors import ParamError, ApiError
-from ..models.db import REGION, DYNAMODB_ENDPOINT, TABLE_NAME
+from ..models.db import get_table
 
 
 # 🧩 Configuración del logger
@@ -29,21 +28,8 @@ class CreateProvider(BaseCommannd):
         self.provider_id = None
         self.nit_encrypted = None
 
-        # 🔗 Conexión a DynamoDB
-        if DYNAMODB_ENDPOINT:
-            logger.info(f"🔗 Conectando a DynamoDB local en {DYNAMODB_ENDPOINT}")
-            self.dynamodb = boto3.resource(
-                "dynamodb",
-                region_name=REGION,
-                endpoint_url=DYNAMODB_ENDPOINT,
-                aws_access_key_id="dummy",
-                aws_secret_access_key="dummy"
-            )
-        else:
-            logger.info(f"🌍 Conectando a DynamoDB real en AWS región {REGION}")
-            self.dynamodb = boto3.resource("dynamodb", region_name=REGION)
-
-        self.table = self.dynamodb.Table(TABLE_NAME)
+        # 🔗 Conexión a DynamoDB compartida por el worker
+        self.table = get_table()
 
     # ----------------------------------------------------------
     def execute(self):
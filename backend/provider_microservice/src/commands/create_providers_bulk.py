@@ -1,17 +1,26 @@
-import boto3
 import io
 import uuid
 import re
 import logging
-import pandas as pd
 import time
+from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
 from .base_command import BaseCommannd
 from ..errors.errors import ApiError
-from ..models.db import REGION, DYNAMODB_ENDPOINT, TABLE_NAME
+from ..models.db import TABLE_NAME, get_resource
+
+# pandas se importa al primer uso: los workers que no atienden /bulk no lo cargan
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+BATCH_GET_LIMIT = 100  # Máximo de llaves por BatchGetItem
+MAX_LOOKUP_WORKERS = 8
+MAX_LOOKUP_RETRIES = 5
+EXPECTED_COLUMNS = {"name", "country", "nit", "address", "email", "phone"}
+
 
 class CreateProvidersBulk(BaseCommannd):
     """
@@ -19,31 +28,24 @@ class CreateProvidersBulk(BaseCommannd):
     Basado en la HU: MS-76 - Registro masivo de proveedores.
     """
 
-    def __init__(self, file_bytes, filename):
+    def __init__(self, file_bytes, filename, file_path=None):
         self.file_bytes = file_bytes
         self.filename = filename
+        # Si el archivo se guardó en disco se lee desde ahí, sin cargarlo completo en memoria
+        self.file_path = file_path
 
-        # 🔗 Conexión a DynamoDB
-        if DYNAMODB_ENDPOINT:
-            logger.info(f"🔗 Conectando a DynamoDB local en {DYNAMODB_ENDPOINT}")
-            self.dynamodb = boto3.resource(
-                "dynamodb",
-                region_name=REGION,
-                endpoint_url=DYNAMODB_ENDPOINT,
-                aws_access_key_id="dummy",
-                aws_secret_access_key="dummy"
-            )
-        else:
-            logger.info(f"🌍 Conectando a DynamoDB real en AWS región {REGION}")
-            self.dynamodb = boto3.resource("dynamodb", region_name=REGION)
-
+        # 🔗 Conexión a DynamoDB compartida por el worker
+        self.dynamodb = get_resource("dynamodb")
         self.table = self.dynamodb.Table(TABLE_NAME)
+        # El cliente del resource es thread-safe y (de)serializa los valores como el Table
+        self.client = self.dynamodb.meta.client
 
     # ----------------------------------------------------------
     def execute(self):
         """Ejecuta el proceso completo de carga masiva."""
         start = time.time()
         try:
+            self.check_upload(self.filename)
             df = self._read_file()
             result = self._process(df)
             result["tiempo_seg"] = round(time.time() - start, 2)
@@ -52,21 +54,73 @@ class CreateProvidersBulk(BaseCommannd):
             logger.error(f"❌ Error en carga masiva: {e}")
             raise ApiError(str(e))
 
+    # ----------------------------------------------------------
+    @staticmethod
+    def check_upload(filename):
+        """Validación barata antes de aceptar la carga (formato del archivo)."""
+        if not filename.endswith((".csv", ".xlsx")):
+            raise ApiError("Formato de archivo no soportado. Usa CSV o XLSX.")
+
+    # ----------------------------------------------------------
+    def execute_in_chunks(self, chunk_rows, on_chunk):
+        """
+        Procesa el archivo por bloques de `chunk_rows` filas (validar y guardar) y
+        reporta cada bloque con on_chunk(total, procesados, exitosos, rechazados).
+        Cada bloque se guarda antes de leer el siguiente, así la memoria no crece con el archivo.
+        """
+        seen_nits = set()  # Los NIT repetidos se detectan en todo el archivo, no solo en el bloque
+        for total, chunk in self._read_chunks(chunk_rows):
+            result = self._process(chunk, seen_nits)
+            on_chunk(total, len(chunk), result["registros_exitosos"], result["rechazados"])
+
+    # ----------------------------------------------------------
+    def _source(self):
+        return self.file_path or io.BytesIO(self.file_bytes)
+
     # ----------------------------------------------------------
     def _read_file(self):
-        """Lee el archivo CSV o Excel usando Pandas."""
+        """Lee el archivo CSV o Excel usando Pandas (openpyxl lo carga pandas solo para XLSX)."""
+        import pandas as pd
+
         try:
             if self.filename.endswith(".csv"):
-                df = pd.read_csv(io.BytesIO(self.file_bytes))
+                df = pd.read_csv(self._source())
             elif self.filename.endswith(".xlsx"):
-                df = pd.read_excel(io.BytesIO(self.file_bytes))
+                df = pd.read_excel(self._source())
             else:
                 raise ApiError("Formato de archivo no soportado. Usa CSV o XLSX.")
         except Exception as e:
             raise ApiError(f"Error al leer el archivo: {e}")
 
-        expected = {"name", "country", "nit", "address", "email", "phone"}
-        missing = expected - set(df.columns.str.lower())
+        return self._normalize_columns(df)
+
+    # ----------------------------------------------------------
+    def _read_chunks(self, chunk_rows):
+        """
+        Genera (total, bloque) de a `chunk_rows` filas. El CSV se lee en streaming y su
+        total no se conoce hasta terminar (None); el XLSX (un zip) se lee completo.
+        """
+        import pandas as pd
+
+        if not self.filename.endswith(".csv"):
+            df = self._read_file()
+            for start in range(0, len(df), chunk_rows):
+                yield len(df), df.iloc[start:start + chunk_rows]
+            return
+
+        try:
+            reader = pd.read_csv(self._source(), chunksize=chunk_rows)
+        except Exception as e:
+            raise ApiError(f"Error al leer el archivo: {e}")
+
+        with reader:
+            for chunk in reader:
+                yield None, self._normalize_columns(chunk)
+
+    # ----------------------------------------------------------
+    @staticmethod
+    def _normalize_columns(df: "pd.DataFrame"):
+        missing = EXPECTED_COLUMNS - set(df.columns.str.lower())
         if missing:
             raise ApiError(f"Faltan columnas obligatorias: {', '.join(missing)}")
 
@@ -80,10 +134,11 @@ class CreateProvidersBulk(BaseCommannd):
         return df
 
     # ----------------------------------------------------------
-    def _process(self, df: pd.DataFrame):
+    def _process(self, df: "pd.DataFrame", seen_nits=None):
         """Valida y guarda los proveedores en DynamoDB."""
-        valid_records = []
+        candidates = []
         invalid_records = []
+        seen_nits = set() if seen_nits is None else seen_nits
 
         for _, row in df.iterrows():
             name = str(row.get("name", "")).strip()
@@ -110,18 +165,13 @@ class CreateProvidersBulk(BaseCommannd):
                 invalid_records.append({**row.to_dict(), "error": "Teléfono inválido (10 dígitos requeridos)"})
                 continue
 
-            # Duplicados en DynamoDB
-            try:
-                response = self.table.get_item(Key={"nit": nit})
-                if "Item" in response:
-                    invalid_records.append({**row.to_dict(), "error": "Duplicado (NIT ya existe)"})
-                    continue
-            except ClientError as e:
-                invalid_records.append({**row.to_dict(), "error": f"Error DynamoDB: {e}"})
+            # Duplicados dentro del mismo archivo
+            if nit in seen_nits:
+                invalid_records.append({**row.to_dict(), "error": "Duplicado (NIT repetido en el archivo)"})
                 continue
+            seen_nits.add(nit)
 
-            # Si pasa todas las validaciones
-            valid_records.append({
+            candidates.append((row, {
                 "provider_id": str(uuid.uuid4()),
                 "nit": nit,
                 "name": name,
@@ -129,7 +179,20 @@ class CreateProvidersBulk(BaseCommannd):
                 "address": address,
                 "email": email,
                 "phone": phone
-            })
+            }))
+
+        # Duplicados en DynamoDB (BatchGetItem concurrente)
+        existing, lookup_errors = self._find_existing_nits([item["nit"] for _, item in candidates])
+
+        valid_records = []
+        for row, item in candidates:
+            nit = item["nit"]
+            if nit in lookup_errors:
+                invalid_records.append({**row.to_dict(), "error": f"Error DynamoDB: {lookup_errors[nit]}"})
+            elif nit in existing:
+                invalid_records.append({**row.to_dict(), "error": "Duplicado (NIT ya existe)"})
+            else:
+                valid_records.append(item)
 
         # Guardar válidos en lote
         if valid_records:
@@ -153,3 +216,46 @@ class CreateProvidersBulk(BaseCommannd):
                 else "⚠️ Carga parcial: menos del 95% de registros válidos."
             ),
         }
+
+    # ----------------------------------------------------------
+    def _find_existing_nits(self, nits):
+        """
+        Consulta qué NITs ya existen usando BatchGetItem en bloques de 100 llaves,
+        ejecutados en paralelo con un pool acotado de hilos.
+        Retorna (NITs existentes, {nit: error} de los bloques que fallaron).
+        """
+        chunks = [nits[i:i + BATCH_GET_LIMIT] for i in range(0, len(nits), BATCH_GET_LIMIT)]
+        existing = set()
+        errors = {}
+        if not chunks:
+            return existing, errors
+
+        with ThreadPoolExecutor(max_workers=min(MAX_LOOKUP_WORKERS, len(chunks))) as executor:
+            for chunk, (found, error) in zip(chunks, executor.map(self._lookup_chunk, chunks)):
+                existing.update(found)
+                if error:
+                    errors.update({nit: error for nit in chunk if nit not in found})
+
+        return existing, errors
+
+    def _lookup_chunk(self, nits):
+        """Resuelve un bloque de NITs, reintentando `UnprocessedKeys` con backoff exponencial."""
+        found = set()
+        request = {TABLE_NAME: {"Keys": [{"nit": nit} for nit in nits], "ProjectionExpression": "nit"}}
+        attempt = 0
+
+        while request:
+            try:
+                response = self.client.batch_get_item(RequestItems=request)
+            except ClientError as e:
+                return found, str(e)
+
+            found.update(item["nit"] for item in response.get("Responses", {}).get(TABLE_NAME, []))
+            request = response.get("UnprocessedKeys") or {}
+            if request:
+                attempt += 1
+                if attempt > MAX_LOOKUP_RETRIES:
+                    return found, f"Llaves no procesadas tras {MAX_LOOKUP_RETRIES} reintentos"
+                time.sleep(0.05 * (2 ** (attempt - 1)))
+
+        return found, None
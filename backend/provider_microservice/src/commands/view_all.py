@@ -1,32 +1,33 @@
-import boto3
 from botocore.exceptions import ClientError
 from .base_command import BaseCommannd
 from ..errors.errors import ApiError
-from ..models.db import REGION, DYNAMODB_ENDPOINT, TABLE_NAME
+from ..models.db import get_table
 
 
 class GetAllProviders(BaseCommannd):
     """Comando para obtener todos los proveedores registrados en el sistema."""
 
     def __init__(self):
-        # 🧩 Conexión a DynamoDB (local o real según entorno)
-        if DYNAMODB_ENDPOINT:
-            self.dynamodb = boto3.resource(
-                "dynamodb",
-                region_name=REGION,
-                endpoint_url=DYNAMODB_ENDPOINT,
-                aws_access_key_id="dummy",
-                aws_secret_access_key="dummy"
-            )
-        else:
-            self.dynamodb = boto3.resource("dynamodb", region_name=REGION)
-
-        self.table = self.dynamodb.Table(TABLE_NAME)
+        # 🧩 Conexión a DynamoDB compartida por el worker (local o real según entorno)
+        self.table = get_table()
 
     def execute(self):
         """Ejecuta la obtención de todos los proveedores."""
         return self.fetch_all()
 
+    def stream(self):
+        """Recorre la tabla página a página, emitiendo un registro a la vez."""
+        try:
+            response = self.table.scan()
+            yield from response.get("Items", [])
+
+            while "LastEvaluatedKey" in response:
+                response = self.table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
+                yield from response.get("Items", [])
+
+        except ClientError as e:
+            raise ApiError(f"Error al exportar la lista de proveedores: {e.response['Error']['Message']}")
+
     def fetch_all(self):
         """Obtiene todos los proveedores registrados (con manejo de paginación)."""
         try:
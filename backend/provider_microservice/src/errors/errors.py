@@ -13,3 +13,9 @@ class ParamError(ApiError):
         (field, validations) = list(messages.items())[0]
         return ParamError(f"{field}: {validations[0]}")
 
+
+class NotFoundError(ApiError):
+    code = 404
+
+    def __init__(self, description):
+        self.description = description
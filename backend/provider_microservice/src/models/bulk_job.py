@@ -0,0 +1,182 @@
+import os
+import json
+import time
+from uuid import uuid4
+from datetime import datetime, timezone, timedelta
+from botocore.exceptions import ClientError
+from .db import get_table
+
+JOBS_TABLE_NAME = os.getenv("DYNAMODB_BULK_JOBS_TABLE", "ProviderBulkJobs")
+# Los jobs terminados se conservan una semana (DynamoDB borra el ítem al vencer el TTL)
+BULK_JOB_TTL_SECONDS = int(os.getenv("BULK_JOB_TTL_SECONDS", "604800"))
+# Filas rechazadas que se guardan con su motivo (el ítem de DynamoDB no puede pasar de 400 KB)
+MAX_STORED_REJECTED_ROWS = int(os.getenv("BULK_JOB_MAX_REJECTED_ROWS", "200"))
+# Un job sin latido por este tiempo quedó huérfano (el worker se reinició o se desplegó)
+BULK_JOB_STALE_SECONDS = int(os.getenv("BULK_JOB_STALE_SECONDS", "300"))
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class BulkJob:
+    """
+    Job de carga masiva de proveedores guardado en la tabla de jobs.
+    El único que escribe el progreso es el hilo que lo procesa, así que se
+    acumula en memoria y se guarda con un UpdateItem por bloque.
+
+    Los jobs corren dentro del worker web y se ejecutan a lo sumo una vez: si el
+    worker muere, el job deja de latir (`heartbeat_at`) y la consulta lo marca
+    FAILED. Las filas de los bloques ya reportados quedan guardadas; el resto
+    no se reintenta y hay que volver a subir el archivo con las filas faltantes.
+    """
+
+    def __init__(self, item):
+        self.item = item
+
+    @property
+    def job_id(self):
+        return self.item["job_id"]
+
+    @property
+    def status(self):
+        return self.item["status"]
+
+    @classmethod
+    def create(cls, filename):
+        now = _now()
+        item = {
+            "job_id": str(uuid4()),
+            "status": PENDING,
+            "filename": filename,
+            "processed": 0,
+            "succeeded": 0,
+            "rejected": 0,
+            "rejected_rows": "[]",
+            "rejected_truncated": False,
+            "created_at": now,
+            "updated_at": now,
+            "heartbeat_at": now,
+            "expires_at": int(time.time()) + BULK_JOB_TTL_SECONDS,
+        }
+        get_table(JOBS_TABLE_NAME).put_item(Item=item)
+        return cls(item)
+
+    @classmethod
+    def find(cls, job_id):
+        item = get_table(JOBS_TABLE_NAME).get_item(Key={"job_id": job_id}).get("Item")
+        return cls(item) if item else None
+
+    @classmethod
+    def beat(cls, job_id):
+        """Renueva el latido de un job en cola o en curso sin tocar su progreso."""
+        try:
+            get_table(JOBS_TABLE_NAME).update_item(
+                Key={"job_id": job_id},
+                UpdateExpression="SET #heartbeat_at = :now",
+                ConditionExpression="#status IN (:pending, :running)",
+                ExpressionAttributeNames={"#heartbeat_at": "heartbeat_at", "#status": "status"},
+                ExpressionAttributeValues={":now": _now(), ":pending": PENDING, ":running": RUNNING},
+            )
+        except ClientError as e:
+            # El job ya terminó o fue marcado como huérfano
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+
+    def expire_if_stale(self):
+        """Marca FAILED el job en cola o en curso cuyo worker dejó de latir."""
+        if self.status not in (PENDING, RUNNING):
+            return
+        now = _now()
+        # Las fechas ISO en UTC ordenan igual como texto que como fecha
+        cutoff = (datetime.fromisoformat(now) - timedelta(seconds=BULK_JOB_STALE_SECONDS)).isoformat()
+        if self.item.get("heartbeat_at", self.item["updated_at"]) >= cutoff:
+            return
+        values = {
+            "status": FAILED,
+            "error": "El worker que procesaba la carga se detuvo; vuelva a subir el archivo.",
+            "updated_at": now,
+            "finished_at": now,
+        }
+        table = get_table(JOBS_TABLE_NAME)
+        try:
+            table.update_item(
+                Key={"job_id": self.job_id},
+                UpdateExpression="SET " + ", ".join(f"#{key} = :{key}" for key in values),
+                # Un latido posterior a la lectura gana: el job sigue vivo
+                ConditionExpression=(
+                    "#status IN (:pending, :running) AND (#heartbeat_at < :cutoff"
+                    " OR (attribute_not_exists(#heartbeat_at) AND #updated_at < :cutoff))"
+                ),
+                ExpressionAttributeNames={**{f"#{key}": key for key in values}, "#heartbeat_at": "heartbeat_at"},
+                ExpressionAttributeValues={
+                    **{f":{key}": value for key, value in values.items()},
+                    ":pending": PENDING, ":running": RUNNING, ":cutoff": cutoff,
+                },
+            )
+            self.item.update(values)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            self.item = table.get_item(Key={"job_id": self.job_id})["Item"]
+
+    def _update(self, **values):
+        """Guarda los campos indicados y los refleja en memoria; cada escritura del job cuenta como latido."""
+        values["updated_at"] = values["heartbeat_at"] = _now()
+        names = {f"#{key}": key for key in values}
+        get_table(JOBS_TABLE_NAME).update_item(
+            Key={"job_id": self.job_id},
+            UpdateExpression="SET " + ", ".join(f"#{key} = :{key}" for key in values),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues={f":{key}": value for key, value in values.items()},
+        )
+        self.item.update(values)
+
+    def start(self):
+        self._update(status=RUNNING)
+
+    def record_chunk(self, total, processed, succeeded, rejected_rows):
+        """Suma el resultado de un bloque al progreso del job."""
+        stored = json.loads(self.item["rejected_rows"])
+        room = max(MAX_STORED_REJECTED_ROWS - len(stored), 0)
+        values = {
+            "processed": int(self.item["processed"]) + processed,
+            "succeeded": int(self.item["succeeded"]) + succeeded,
+            "rejected": int(self.item["rejected"]) + len(rejected_rows),
+            "rejected_rows": json.dumps(stored + rejected_rows[:room], default=str),
+            "rejected_truncated": bool(self.item["rejected_truncated"]) or len(rejected_rows) > room,
+        }
+        if total is not None:
+            values["total"] = total
+        self._update(**values)
+
+    def finish(self):
+        now = _now()
+        self._update(status=COMPLETED, total=int(self.item.get("total", self.item["processed"])), finished_at=now)
+
+    def fail(self, error):
+        self._update(status=FAILED, error=error, finished_at=_now())
+
+    def to_dict(self):
+        total = self.item.get("total")
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "filename": self.item["filename"],
+            "total_registros": int(total) if total is not None else None,
+            "procesados": int(self.item["processed"]),
+            "registros_exitosos": int(self.item["succeeded"]),
+            "registros_rechazados": int(self.item["rejected"]),
+            "rechazados": json.loads(self.item["rejected_rows"]),
+            "rechazados_truncados": bool(self.item["rejected_truncated"]),
+            "error": self.item.get("error"),
+            "created_at": self.item["created_at"],
+            "updated_at": self.item["updated_at"],
+            "finished_at": self.item.get("finished_at"),
+            "heartbeat_at": self.item.get("heartbeat_at"),
+        }
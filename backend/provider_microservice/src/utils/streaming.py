@@ -0,0 +1,27 @@
+import json
+import logging
+from flask import Response, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request):
+    """Indica si el cliente pidió explícitamente `Accept: application/x-ndjson`."""
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def ndjson_response(items):
+    """Construye una respuesta que emite un objeto JSON por línea a medida que se escanea."""
+    def generate():
+        try:
+            for item in items:
+                yield json.dumps(item, default=str) + "\n"
+        except Exception as e:
+            # Los encabezados ya se enviaron: solo queda registrar y cortar el stream
+            logger.error(f"❌ Error durante la exportación NDJSON: {e}")
+            raise
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -1,5 +1,6 @@
 import os
 import sys
+import pytest
 from dotenv import load_dotenv
 
 # --- Configuración de paths ---
@@ -10,3 +11,12 @@ sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, SRC_PATH)
 
 load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+
+@pytest.fixture(autouse=True)
+def reset_boto_connections():
+    """Cada prueba parte sin conexiones boto3 cacheadas (permite parchear boto3.client/resource)."""
+    from src.models.db import reset_connections
+    reset_connections()
+    yield
+    reset_connections()
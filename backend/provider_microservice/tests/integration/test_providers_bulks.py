@@ -1,7 +1,18 @@
 import io
+import time
 import pytest
 
 
+def wait_for_job(client, job_id, timeout=30):
+    """Consulta el job de carga masiva hasta que termine."""
+    deadline = time.time() + timeout
+    while True:
+        job = client.get(f"/bulk/{job_id}").get_json()
+        if job["status"] in ("COMPLETED", "FAILED") or time.time() > deadline:
+            return job
+        time.sleep(0.2)
+
+
 class TestBulkUploadProvidersWithLogic:
     @pytest.mark.usefixtures("client")
     def test_bulk_upload_csv_valido_y_erroneo(self, client):
@@ -15,10 +26,16 @@ class TestBulkUploadProvidersWithLogic:
         data = {"file": (file_data, "proveedores.csv")}
 
         response = client.post("/bulk", data=data, content_type="multipart/form-data")
-        result = response.get_json()
+        assert response.status_code == 202
 
-        assert response.status_code == 200
+        result = wait_for_job(client, response.get_json()["job_id"])
+        assert result["status"] == "COMPLETED"
         assert "total_registros" in result
         assert result["total_registros"] == 2
         assert result["registros_exitosos"] == 2
         assert result["registros_rechazados"] == 0
+
+    @pytest.mark.usefixtures("client")
+    def test_bulk_job_inexistente(self, client):
+        response = client.get("/bulk/no-existe")
+        assert response.status_code == 404
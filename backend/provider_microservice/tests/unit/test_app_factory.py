@@ -0,0 +1,25 @@
+import sys
+import subprocess
+from unittest.mock import patch
+
+
+class TestAppFactory:
+    """🧪 Pruebas unitarias de la app factory"""
+
+    @patch("src.models.db.init_db")
+    def test_create_app_registra_blueprints_y_verifica_la_tabla(self, mock_init_db, monkeypatch):
+        monkeypatch.setenv("APP_COGNITO_USER_POOL_ID", "pool")
+        from src.main import create_app
+        from src.utils.import_timing import IMPORT_TIMES
+
+        app = create_app()
+
+        mock_init_db.assert_called_once()
+        assert "provider" in app.blueprints
+        assert ".blueprints.provider" in IMPORT_TIMES
+        assert app.test_client().get("/health").get_json()["status"] == "up"
+
+    def test_importar_la_api_no_carga_pandas(self):
+        code = "import sys, src.main, src.blueprints.provider; print('pandas' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "False"
@@ -0,0 +1,242 @@
+import io
+import os
+import json
+import pytest
+import pandas as pd
+from datetime import datetime, timezone, timedelta
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError
+from werkzeug.datastructures import FileStorage
+from src.commands import bulk_jobs
+from src.commands.bulk_jobs import SubmitProvidersBulkJob, GetBulkJob, run_bulk_job, beat_active_jobs
+from src.commands.create_providers_bulk import CreateProvidersBulk
+from src.errors.errors import ApiError, NotFoundError
+from src.models.bulk_job import BulkJob
+
+
+def upload(content, filename):
+    return FileStorage(io.BytesIO(content), filename=filename)
+
+
+def ago(seconds):
+    return (datetime.now(timezone.utc) - timedelta(seconds=seconds)).isoformat()
+
+
+def condition_failed():
+    return ClientError({"Error": {"Code": "ConditionalCheckFailedException", "Message": "failed"}}, "UpdateItem")
+
+
+@pytest.fixture(autouse=True)
+def active_jobs():
+    with patch.object(bulk_jobs, "_active_jobs", set()) as jobs:
+        yield jobs
+
+
+@pytest.fixture(autouse=True)
+def upload_dir(tmp_path):
+    with patch("src.commands.bulk_jobs.BULK_UPLOAD_DIR", str(tmp_path)):
+        yield tmp_path
+
+
+def provider_row(nit, phone="3001234567"):
+    return {"name": f"Proveedor {nit}", "country": "CO", "nit": nit,
+            "address": "Calle 1", "email": "a@correo.com", "phone": phone}
+
+
+class TestSubmitProvidersBulkJob:
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJob")
+    def test_encola_el_job_y_responde_de_inmediato(self, mock_job, mock_get_executor):
+        job = MagicMock(job_id="job-1", status="PENDING")
+        mock_job.create.return_value = job
+
+        result = SubmitProvidersBulkJob(upload(b"nit\n1\n", "proveedores.csv")).execute()
+
+        assert result == {"job_id": "job-1", "status": "PENDING"}
+        run, submitted_job, file_path, filename = mock_get_executor.return_value.submit.call_args.args
+        assert (run, submitted_job, filename) == (run_bulk_job, job, "proveedores.csv")
+        # El archivo queda en disco para el job, no en memoria
+        with open(file_path, "rb") as spooled:
+            assert spooled.read() == b"nit\n1\n"
+
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJob")
+    def test_registra_el_job_para_el_latido(self, mock_job, mock_get_executor, active_jobs):
+        mock_job.create.return_value = MagicMock(job_id="job-1", status="PENDING")
+
+        SubmitProvidersBulkJob(upload(b"nit\n1\n", "proveedores.csv")).execute()
+
+        assert active_jobs == {"job-1"}
+
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJob")
+    def test_borra_el_archivo_si_no_se_puede_encolar(self, mock_job, mock_get_executor, upload_dir):
+        mock_job.create.side_effect = RuntimeError("DynamoDB no disponible")
+
+        with pytest.raises(RuntimeError):
+            SubmitProvidersBulkJob(upload(b"nit\n1\n", "proveedores.csv")).execute()
+
+        assert os.listdir(upload_dir) == []
+
+    @patch("src.commands.bulk_jobs.get_executor")
+    @patch("src.commands.bulk_jobs.BulkJob")
+    def test_formato_no_soportado_no_crea_job(self, mock_job, mock_get_executor):
+        with pytest.raises(ApiError, match="Formato de archivo no soportado"):
+            SubmitProvidersBulkJob(upload(b"bytes", "proveedores.txt")).execute()
+
+        mock_job.create.assert_not_called()
+        mock_get_executor.return_value.submit.assert_not_called()
+
+
+class TestRunBulkJob:
+    @patch("src.commands.bulk_jobs.BULK_JOB_CHUNK_ROWS", 2)
+    @patch("boto3.resource")
+    def test_csv_en_streaming_detecta_duplicados_entre_bloques(self, mock_dynamodb, upload_dir):
+        mock_client = mock_dynamodb.return_value.meta.client
+        mock_client.batch_get_item.return_value = {"Responses": {}}
+        path = upload_dir / "proveedores.csv"
+        rows = [provider_row("1234567890"), provider_row("1234567891"), provider_row("1234567890")]
+        pd.DataFrame(rows).to_csv(path, index=False)
+        job = MagicMock()
+
+        with patch.object(CreateProvidersBulk, "_read_file", side_effect=AssertionError("no debe leer todo")):
+            run_bulk_job(job, str(path), "proveedores.csv")
+
+        # El total del CSV no se conoce hasta terminar de leerlo
+        first, second = [c.args for c in job.record_chunk.call_args_list]
+        assert first[:3] == (None, 2, 2)
+        assert second[:3] == (None, 1, 0)
+        assert second[3][0]["error"] == "Duplicado (NIT repetido en el archivo)"
+        job.finish.assert_called_once()
+        assert not path.exists()
+
+    def test_error_al_leer_marca_el_job_como_fallido(self, upload_dir, active_jobs):
+        path = upload_dir / "proveedores.csv"
+        path.write_text("nombre,correo\nProveedor1,a@b.com\n")
+        job = MagicMock(job_id="job-1")
+        active_jobs.add("job-1")
+
+        with patch("boto3.resource"):
+            run_bulk_job(job, str(path), "proveedores.csv")
+
+        assert job.fail.call_args.args[0].startswith("Faltan columnas obligatorias:")
+        job.finish.assert_not_called()
+        assert not path.exists()
+        # Al terminar, el worker deja de latir por el job
+        assert active_jobs == set()
+
+
+class TestBeatActiveJobs:
+    @patch("src.commands.bulk_jobs.BulkJob")
+    def test_late_por_cada_job_activo_aunque_alguno_falle(self, mock_job, active_jobs):
+        active_jobs.update({"job-1", "job-2"})
+        mock_job.beat.side_effect = [RuntimeError("DynamoDB no disponible"), None]
+
+        beat_active_jobs()
+
+        assert sorted(c.args[0] for c in mock_job.beat.call_args_list) == ["job-1", "job-2"]
+
+
+class TestGetBulkJob:
+    @patch("src.commands.bulk_jobs.BulkJob")
+    def test_marca_los_jobs_huerfanos_antes_de_responder(self, mock_job):
+        mock_job.find.return_value.to_dict.return_value = {"job_id": "job-1", "status": "FAILED"}
+
+        assert GetBulkJob("job-1").execute() == {"job_id": "job-1", "status": "FAILED"}
+        mock_job.find.return_value.expire_if_stale.assert_called_once()
+
+    @patch("src.commands.bulk_jobs.BulkJob")
+    def test_job_inexistente(self, mock_job):
+        mock_job.find.return_value = None
+
+        with pytest.raises(NotFoundError, match="no existe"):
+            GetBulkJob("job-x").execute()
+
+
+class TestBulkJob:
+    def build_job(self, **item):
+        return BulkJob({
+            "job_id": "job-1", "status": "RUNNING", "filename": "proveedores.csv",
+            "processed": 0, "succeeded": 0, "rejected": 0, "rejected_rows": "[]",
+            "rejected_truncated": False, "created_at": "2030-01-01T00:00:00+00:00",
+            "updated_at": "2030-01-01T00:00:00+00:00", **item,
+        })
+
+    @patch("src.models.bulk_job.get_table")
+    def test_record_chunk_acumula_el_progreso(self, mock_get_table):
+        job = self.build_job(processed=2, succeeded=1, rejected=1)
+
+        job.record_chunk(4, 2, 2, [])
+
+        kwargs = mock_get_table.return_value.update_item.call_args.kwargs
+        assert kwargs["Key"] == {"job_id": "job-1"}
+        assert kwargs["ExpressionAttributeValues"][":processed"] == 4
+        assert kwargs["ExpressionAttributeValues"][":succeeded"] == 3
+        assert kwargs["ExpressionAttributeValues"][":total"] == 4
+        assert job.to_dict()["procesados"] == 4
+
+    @patch("src.models.bulk_job.MAX_STORED_REJECTED_ROWS", 1)
+    @patch("src.models.bulk_job.get_table")
+    def test_record_chunk_limita_las_filas_rechazadas_guardadas(self, mock_get_table):
+        job = self.build_job()
+
+        job.record_chunk(2, 2, 0, [{"nit": "1"}, {"nit": "2"}])
+
+        result = job.to_dict()
+        assert result["registros_rechazados"] == 2
+        assert result["rechazados"] == [{"nit": "1"}]
+        assert result["rechazados_truncados"] is True
+        values = mock_get_table.return_value.update_item.call_args.kwargs["ExpressionAttributeValues"]
+        assert json.loads(values[":rejected_rows"]) == [{"nit": "1"}]
+
+    @patch("src.models.bulk_job.get_table")
+    def test_record_chunk_renueva_el_latido(self, mock_get_table):
+        job = self.build_job(heartbeat_at=ago(600))
+
+        job.record_chunk(None, 1, 1, [])
+
+        assert job.item["heartbeat_at"] > ago(5)
+
+    @patch("src.models.bulk_job.BULK_JOB_STALE_SECONDS", 60)
+    @patch("src.models.bulk_job.get_table")
+    def test_expire_if_stale_marca_fallido_el_job_sin_latido(self, mock_get_table):
+        job = self.build_job(heartbeat_at=ago(120))
+
+        job.expire_if_stale()
+
+        kwargs = mock_get_table.return_value.update_item.call_args.kwargs
+        assert kwargs["ExpressionAttributeValues"][":status"] == "FAILED"
+        assert "#heartbeat_at < :cutoff" in kwargs["ConditionExpression"]
+        assert job.to_dict()["status"] == "FAILED"
+        assert "vuelva a subir el archivo" in job.to_dict()["error"]
+
+    @patch("src.models.bulk_job.BULK_JOB_STALE_SECONDS", 60)
+    @patch("src.models.bulk_job.get_table")
+    def test_expire_if_stale_respeta_jobs_vivos_y_terminados(self, mock_get_table):
+        self.build_job(heartbeat_at=ago(10)).expire_if_stale()
+        self.build_job(status="COMPLETED", heartbeat_at=ago(120)).expire_if_stale()
+
+        mock_get_table.return_value.update_item.assert_not_called()
+
+    @patch("src.models.bulk_job.BULK_JOB_STALE_SECONDS", 60)
+    @patch("src.models.bulk_job.get_table")
+    def test_expire_if_stale_recarga_si_llega_un_latido_a_tiempo(self, mock_get_table):
+        table = mock_get_table.return_value
+        table.update_item.side_effect = condition_failed()
+        table.get_item.return_value = {"Item": {**self.build_job().item, "heartbeat_at": ago(1)}}
+        job = self.build_job(heartbeat_at=ago(120))
+
+        job.expire_if_stale()
+
+        assert job.status == "RUNNING"
+        assert job.item["heartbeat_at"] > ago(30)
+
+    @patch("src.models.bulk_job.get_table")
+    def test_beat_ignora_jobs_terminados(self, mock_get_table):
+        mock_get_table.return_value.update_item.side_effect = condition_failed()
+
+        BulkJob.beat("job-1")
+
+        kwargs = mock_get_table.return_value.update_item.call_args.kwargs
+        assert kwargs["Key"] == {"job_id": "job-1"}
+        assert kwargs["ConditionExpression"] == "#status IN (:pending, :running)"
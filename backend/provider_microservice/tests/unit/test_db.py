@@ -0,0 +1,44 @@
+import threading
+from unittest.mock import patch
+from src.models import db
+
+
+class TestConnectionRegistry:
+
+    @patch("boto3.client")
+    def test_get_client_reutiliza_el_cliente(self, mock_client):
+        first = db.get_client("dynamodb")
+        second = db.get_client("dynamodb")
+
+        assert first is second
+        mock_client.assert_called_once()
+        config = mock_client.call_args.kwargs["config"]
+        assert config.max_pool_connections == db.MAX_POOL_CONNECTIONS
+        assert config.tcp_keepalive == db.TCP_KEEPALIVE
+        assert config.retries == {"mode": db.RETRY_MODE, "max_attempts": db.MAX_ATTEMPTS}
+
+    @patch("boto3.resource")
+    def test_get_resource_uno_por_hilo(self, mock_resource):
+        mock_resource.side_effect = lambda *args, **kwargs: object()
+        main = db.get_resource("dynamodb")
+        other = []
+        thread = threading.Thread(target=lambda: other.append(db.get_resource("dynamodb")))
+        thread.start()
+        thread.join()
+
+        assert db.get_resource("dynamodb") is main
+        assert other[0] is not main
+        assert mock_resource.call_count == 2
+
+    @patch("boto3.client")
+    def test_reset_y_fork_descartan_conexiones(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: object()
+        first = db.get_client("dynamodb")
+
+        db.reset_connections()
+        second = db.get_client("dynamodb")
+        assert second is not first
+
+        with patch.object(db, "_owner_pid", -1):
+            third = db.get_client("dynamodb")
+        assert third is not second
@@ -1,9 +1,11 @@
 import pytest
 import pandas as pd
 from unittest.mock import MagicMock, patch
+from botocore.stub import Stubber
 from botocore.exceptions import ClientError
 from src.commands.create_providers_bulk import CreateProvidersBulk
 from src.errors.errors import ApiError
+from src.models.db import TABLE_NAME
 
 
 class TestCreateProvidersBulkCommand:
@@ -15,6 +17,8 @@ class TestCreateProvidersBulkCommand:
         mock_dynamodb.return_value.Table.return_value = mock_table
         mock_batch = MagicMock()
         mock_table.batch_writer.return_value.__enter__.return_value = mock_batch
+        mock_client = mock_dynamodb.return_value.meta.client
+        mock_client.batch_get_item.return_value = {"Responses": {}}
 
         # Crear un DataFrame con registros válidos
         df = pd.DataFrame([
@@ -32,6 +36,9 @@ class TestCreateProvidersBulkCommand:
         assert result["registros_exitosos"] == 2
         assert result["registros_rechazados"] == 0
         assert "✅ Carga masiva exitosa" in result["mensaje"]
+        # Una sola consulta BatchGetItem para ambos NITs, sin GetItem por fila
+        mock_client.batch_get_item.assert_called_once()
+        mock_table.get_item.assert_not_called()
 
     # ⚙️ Test: archivo con formato incorrecto
     def test_read_file_formato_no_soportado(self):
@@ -103,7 +110,9 @@ class TestCreateProvidersBulkCommand:
     def test_process_duplicado_existente(self, mock_dynamodb):
         mock_table = MagicMock()
         mock_dynamodb.return_value.Table.return_value = mock_table
-        mock_table.get_item.return_value = {"Item": {"nit": "1234567890"}}
+        mock_dynamodb.return_value.meta.client.batch_get_item.return_value = {
+            "Responses": {TABLE_NAME: [{"nit": "1234567890"}]}
+        }
 
         df = pd.DataFrame([{
             "name": "Proveedor", "country": "CO", "nit": "1234567890",
@@ -121,8 +130,8 @@ class TestCreateProvidersBulkCommand:
     def test_process_error_dynamodb(self, mock_dynamodb):
         mock_table = MagicMock()
         mock_dynamodb.return_value.Table.return_value = mock_table
-        mock_table.get_item.side_effect = ClientError(
-            {"Error": {"Message": "Falla de red"}}, "GetItem"
+        mock_dynamodb.return_value.meta.client.batch_get_item.side_effect = ClientError(
+            {"Error": {"Message": "Falla de red"}}, "BatchGetItem"
         )
 
         df = pd.DataFrame([{
@@ -141,6 +150,7 @@ class TestCreateProvidersBulkCommand:
     def test_process_carga_parcial(self, mock_dynamodb):
         mock_table = MagicMock()
         mock_dynamodb.return_value.Table.return_value = mock_table
+        mock_dynamodb.return_value.meta.client.batch_get_item.return_value = {"Responses": {}}
 
         df = pd.DataFrame([
             {"name": "Proveedor A", "country": "CO", "nit": "1234567890",
@@ -154,3 +164,85 @@ class TestCreateProvidersBulkCommand:
         result = cmd._process(df)
         assert "⚠️ Carga parcial" in result["mensaje"]
         assert result["registros_rechazados"] == 1
+
+    # ⚠️ Test: NIT repetido dentro del archivo
+    @patch("boto3.resource")
+    def test_process_duplicado_en_archivo(self, mock_dynamodb):
+        mock_client = mock_dynamodb.return_value.meta.client
+        mock_client.batch_get_item.return_value = {"Responses": {}}
+
+        df = pd.DataFrame([
+            {"name": "Proveedor A", "country": "CO", "nit": "1234567890",
+             "address": "Calle 1", "email": "a@b.com", "phone": "3001234567"},
+            {"name": "Proveedor A bis", "country": "CO", "nit": "1234567890",
+             "address": "Calle 9", "email": "c@b.com", "phone": "3001234567"},
+        ])
+
+        cmd = CreateProvidersBulk(b"", "proveedores.csv")
+        result = cmd._process(df)
+
+        assert result["registros_exitosos"] == 1
+        assert result["registros_rechazados"] == 1
+        assert result["rechazados"][0]["name"] == "Proveedor A bis"
+        assert "repetido en el archivo" in result["rechazados"][0]["error"]
+        keys = mock_client.batch_get_item.call_args.kwargs["RequestItems"][TABLE_NAME]["Keys"]
+        assert keys == [{"nit": "1234567890"}]
+
+    # 🚀 Test: consultas en bloques de 100 llaves
+    @patch("boto3.resource")
+    def test_find_existing_nits_en_bloques(self, mock_dynamodb):
+        mock_client = mock_dynamodb.return_value.meta.client
+
+        def batch_get_item(RequestItems):
+            keys = RequestItems[TABLE_NAME]["Keys"]
+            return {"Responses": {TABLE_NAME: [k for k in keys if k["nit"].endswith("7")]}}
+
+        mock_client.batch_get_item.side_effect = batch_get_item
+        nits = [f"{i:010d}" for i in range(250)]
+
+        cmd = CreateProvidersBulk(b"", "proveedores.csv")
+        existing, errors = cmd._find_existing_nits(nits)
+
+        sizes = sorted(len(c.kwargs["RequestItems"][TABLE_NAME]["Keys"]) for c in mock_client.batch_get_item.call_args_list)
+        assert sizes == [50, 100, 100]
+        assert existing == {nit for nit in nits if nit.endswith("7")}
+        assert errors == {}
+
+    # 🔁 Test: reintento de llaves no procesadas
+    @patch("src.commands.create_providers_bulk.time.sleep")
+    @patch("boto3.resource")
+    def test_lookup_reintenta_unprocessed_keys(self, mock_dynamodb, mock_sleep):
+        mock_client = mock_dynamodb.return_value.meta.client
+        pending = {TABLE_NAME: {"Keys": [{"nit": "2222222222"}], "ProjectionExpression": "nit"}}
+        mock_client.batch_get_item.side_effect = [
+            {"Responses": {TABLE_NAME: [{"nit": "1111111111"}]}, "UnprocessedKeys": pending},
+            {"Responses": {TABLE_NAME: [{"nit": "2222222222"}]}, "UnprocessedKeys": {}},
+        ]
+
+        cmd = CreateProvidersBulk(b"", "proveedores.csv")
+        found, error = cmd._lookup_chunk(["1111111111", "2222222222"])
+
+        assert found == {"1111111111", "2222222222"}
+        assert error is None
+        assert mock_client.batch_get_item.call_args.kwargs["RequestItems"] == pending
+        mock_sleep.assert_called_once()
+
+    # 🔌 Test: la consulta pasa por la (de)serialización real del cliente del resource
+    def test_lookup_chunk_serializa_con_el_cliente_del_resource(self, monkeypatch):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "dummy")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "dummy")
+        cmd = CreateProvidersBulk(b"", "proveedores.csv")
+
+        with Stubber(cmd.client) as stubber:
+            stubber.add_response(
+                "batch_get_item",
+                {"Responses": {TABLE_NAME: [{"nit": {"S": "1111111111"}}]}},
+                {"RequestItems": {TABLE_NAME: {
+                    "Keys": [{"nit": "1111111111"}, {"nit": "2222222222"}],
+                    "ProjectionExpression": "nit",
+                }}},
+            )
+            found, error = cmd._lookup_chunk(["1111111111", "2222222222"])
+
+        assert found == {"1111111111"}
+        assert error is None
@@ -1,8 +1,8 @@
 import logging
 import os
-import boto3
 from .base_command import BaseCommannd
 from ..errors.errors import ParamError, ApiError
+from ..models.db import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -10,16 +10,15 @@ ALLOWED_ROLES = {"admin", "manager", "client", "seller"}
 
 class CreateCognitoUser(BaseCommannd):
 
-    def __init__(self, email, role):
+    def __init__(self, email, role, throttle=None):
         self.email = email.strip()
         self.role = role.strip().lower()
+        # Opcional: controla la tasa y los reintentos de las llamadas a Cognito (carga masiva)
+        self.throttle = throttle
 
-        self.client = boto3.client(
-            "cognito-idp",
-            region_name=os.getenv("AWS_REGION", "us-east-1"),
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-        )
+        # Cliente Cognito compartido por el worker; con throttle los reintentos
+        # los hace el throttle (pasando por el limitador), no botocore
+        self.client = get_client("cognito-idp", max_attempts=1) if throttle else get_client("cognito-idp")
 
         self.user_pool_id = os.getenv("APP_COGNITO_USER_POOL_ID")
 
@@ -46,10 +45,17 @@ class CreateCognitoUser(BaseCommannd):
         if not self.user_pool_id:
             raise ApiError("Falta configuración: APP_COGNITO_USER_POOL_ID")
 
+    def _call(self, operation, method, **kwargs):
+        if self.throttle is None:
+            return method(**kwargs)
+        return self.throttle.call(operation, method, **kwargs)
+
     def create_user(self):
         try:
             # 1. Crear usuario SIN contraseña temporal
-            response = self.client.admin_create_user(
+            response = self._call(
+                "create",
+                self.client.admin_create_user,
                 UserPoolId=self.user_pool_id,
                 Username=self.email,
                 MessageAction="SUPPRESS",
@@ -63,7 +69,9 @@ class CreateCognitoUser(BaseCommannd):
             cognito_id = response["User"]["Username"]
 
             # 2. Establecer contraseña permanente
-            self.client.admin_set_user_password(
+            self._call(
+                "update",
+                self.client.admin_set_user_password,
                 UserPoolId=self.user_pool_id,
                 Username=self.email,
                 Password="secret123",
@@ -1,48 +1,124 @@
+import os
+import time
+import random
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
 from .create_user import CreateCognitoUser
 from ..errors.errors import ParamError
+from ..utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
+# ⚙️ Cuotas por defecto de Cognito: UserCreation = 50 RPS, UserUpdate = 25 RPS.
+# Dejamos ~20% de margen para el resto del tráfico del user pool.
+# Las tasas son del servicio completo: se reparten entre los workers de gunicorn.
+BULK_WORKERS = int(os.getenv("COGNITO_BULK_WORKERS", "10"))
+CREATE_RPS = float(os.getenv("COGNITO_CREATE_RPS", "40"))
+UPDATE_RPS = float(os.getenv("COGNITO_UPDATE_RPS", "20"))
+# Workers de gunicorn que comparten la cuota (gunicorn lee el mismo WEB_CONCURRENCY)
+API_PROCESSES = max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+MAX_RETRIES = int(os.getenv("COGNITO_MAX_RETRIES", "5"))
+BASE_DELAY = 0.2
+
+THROTTLING_ERRORS = {"TooManyRequestsException", "ThrottlingException"}
+
+
+class CognitoThrottle:
+    """
+    Aplica el limitador por categoría de API y reintenta cuando Cognito responde con throttling.
+    Es la única capa de reintentos: CreateCognitoUser usa un cliente sin reintentos de botocore
+    cuando recibe un throttle, así cada reintento vuelve a pasar por el token bucket.
+    """
+
+    def __init__(self, create_rps=CREATE_RPS, update_rps=UPDATE_RPS, max_retries=MAX_RETRIES, base_delay=BASE_DELAY):
+        self.buckets = {"create": TokenBucket(create_rps), "update": TokenBucket(update_rps)}
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+    def call(self, operation, method, **kwargs):
+        attempt = 0
+        while True:
+            self.buckets[operation].acquire()
+            try:
+                return method(**kwargs)
+            except ClientError as err:
+                code = err.response.get("Error", {}).get("Code")
+                if code not in THROTTLING_ERRORS or attempt >= self.max_retries:
+                    raise
+                delay = self.base_delay * (2 ** attempt) * random.uniform(1, 2)
+                attempt += 1
+                logger.warning(f"⏳ Throttling de Cognito ({code}), reintento {attempt} en {delay:.2f}s")
+                time.sleep(delay)
+
+
+_lock = threading.Lock()
+_throttle = None
+_throttle_pid = None
+
+
+def get_throttle():
+    """
+    Throttle compartido por todas las cargas masivas del worker, con su parte de la cuota.
+    Se crea al primer uso y de nuevo si el proceso fue bifurcado.
+    """
+    global _throttle, _throttle_pid
+    with _lock:
+        if _throttle is None or _throttle_pid != os.getpid():
+            _throttle = CognitoThrottle(CREATE_RPS / API_PROCESSES, UPDATE_RPS / API_PROCESSES)
+            _throttle_pid = os.getpid()
+        return _throttle
+
+
 class CreateCognitoUserBulk:
 
-    def __init__(self, users_payload: list):
+    def __init__(self, users_payload: list, max_workers: int = BULK_WORKERS, throttle: CognitoThrottle = None):
         if not isinstance(users_payload, list):
             raise ParamError("The 'users' field must be a list.")
 
         self.users_payload = users_payload
+        self.max_workers = max_workers
+        self.throttle = throttle or get_throttle()
 
     def execute(self):
 
         results_created = []
         results_failed = []
 
-        for record in self.users_payload:
-
-            email = record.get("email")
-            role = record.get("role")
-
-            if not email or not role:
-                results_failed.append({
-                    "email": email,
-                    "role": role,
-                    "reason": "Missing email or role"
-                })
-                continue
-
-            try:
-                created = CreateCognitoUser(email, role).execute()
-                results_created.append(created)
+        if not self.users_payload:
+            return {"created": results_created, "failed": results_failed}
 
-            except Exception as err:
-                logger.error(f"❌ Error creating {email}: {str(err)}")
-                results_failed.append({
-                    "email": email,
-                    "role": role,
-                    "reason": str(err)
-                })
+        # El pool acotado procesa en paralelo; map conserva el orden de entrada
+        workers = min(self.max_workers, len(self.users_payload))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for created, result in executor.map(self._provision, self.users_payload):
+                (results_created if created else results_failed).append(result)
 
         return {
             "created": results_created,
             "failed": results_failed
         }
+
+    def _provision(self, record):
+        """Crea un usuario y retorna (creado, resultado) sin propagar errores."""
+        email = record.get("email")
+        role = record.get("role")
+
+        if not email or not role:
+            return False, {
+                "email": email,
+                "role": role,
+                "reason": "Missing email or role"
+            }
+
+        try:
+            return True, CreateCognitoUser(email, role, throttle=self.throttle).execute()
+
+        except Exception as err:
+            logger.error(f"❌ Error creating {email}: {str(err)}")
+            return False, {
+                "email": email,
+                "role": role,
+                "reason": str(err)
+            }
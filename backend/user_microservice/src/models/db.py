@@ -0,0 +1,74 @@
+import boto3
+import os
+import logging
+import threading
+from botocore.config import Config
+
+# 🧩 Configuración del logger
+logger = logging.getLogger(__name__)
+
+REGION = os.getenv("AWS_REGION", "us-east-1")
+
+
+# ⚙️ Configuración del pool de conexiones (por worker)
+MAX_POOL_CONNECTIONS = int(os.getenv("BOTO_MAX_POOL_CONNECTIONS", "50"))
+TCP_KEEPALIVE = os.getenv("BOTO_TCP_KEEPALIVE", "true").lower() == "true"
+RETRY_MODE = os.getenv("BOTO_RETRY_MODE", "standard")
+MAX_ATTEMPTS = int(os.getenv("BOTO_MAX_ATTEMPTS", "3"))
+
+_lock = threading.Lock()
+_clients = {}
+_owner_pid = os.getpid()
+
+
+def _boto_config(max_attempts=MAX_ATTEMPTS):
+    return Config(
+        region_name=REGION,
+        max_pool_connections=MAX_POOL_CONNECTIONS,
+        tcp_keepalive=TCP_KEEPALIVE,
+        retries={"mode": RETRY_MODE, "max_attempts": max_attempts},
+    )
+
+
+def _connection_kwargs(service, max_attempts=MAX_ATTEMPTS):
+    """Parámetros de conexión; sin llaves explícitas boto3 usa la cadena de credenciales por defecto."""
+    return {
+        "region_name": REGION,
+        "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
+        "aws_secret_access_key": os.getenv("AWS_SECRET_ACCESS_KEY"),
+        "config": _boto_config(max_attempts),
+    }
+
+
+def _check_fork():
+    """Descarta las conexiones heredadas si el proceso fue bifurcado (p. ej. gunicorn --preload)."""
+    global _owner_pid
+    if _owner_pid != os.getpid():
+        reset_connections()
+        _owner_pid = os.getpid()
+
+
+def get_client(service="cognito-idp", max_attempts=MAX_ATTEMPTS):
+    """
+    Retorna el cliente boto3 compartido del worker (los clientes son thread-safe).
+    `max_attempts=1` entrega un cliente sin reintentos de botocore, para quien
+    ya reintenta por su cuenta.
+    """
+    _check_fork()
+    key = (service, max_attempts)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                logger.info(f"🔌 Creando cliente boto3 compartido para {service} (max_attempts={max_attempts})")
+                client = boto3.client(service, **_connection_kwargs(service, max_attempts))
+                _clients[key] = client
+    return client
+
+
+def reset_connections():
+    """Descarta todas las conexiones cacheadas (útil en pruebas)."""
+    with _lock:
+        _clients.clear()
+
@@ -1,6 +1,10 @@
+import time
 import pytest
 from unittest.mock import patch, MagicMock
-from src.commands.create_user_bulk import CreateCognitoUserBulk
+from botocore.exceptions import ClientError
+from src.commands import create_user_bulk
+from src.commands.create_user_bulk import CreateCognitoUserBulk, CognitoThrottle, get_throttle
+from src.utils.rate_limiter import TokenBucket
 from src.errors.errors import ParamError
 from src.commands.create_user import CreateCognitoUser
 
@@ -45,12 +49,15 @@ def test_bulk_success(mock_execute):
     assert len(result["failed"]) == 0
 
 
-@patch.object(CreateCognitoUser, "execute")
+@patch.object(CreateCognitoUser, "execute", autospec=True)
 def test_bulk_partial_fail(mock_execute):
-    mock_execute.side_effect = [
-        mock_create_user_success("good@test.com", "admin"),
-        Exception("User already exists"),
-    ]
+    # Los usuarios se procesan en paralelo: el resultado depende del usuario, no del orden de llamada
+    def execute(self):
+        if self.email == "bad@test.com":
+            raise Exception("User already exists")
+        return mock_create_user_success(self.email, self.role)
+
+    mock_execute.side_effect = execute
 
     cmd = CreateCognitoUserBulk([
         {"email": "good@test.com", "role": "admin"},
@@ -75,3 +82,107 @@ def test_bulk_missing_fields():
     assert len(result["created"]) == 0
     assert len(result["failed"]) == 2
     assert result["failed"][0]["reason"] == "Missing email or role"
+
+
+@patch.object(CreateCognitoUser, "execute", autospec=True)
+def test_bulk_conserva_orden_de_entrada(mock_execute):
+    # Los primeros usuarios tardan más, así que terminan después que los últimos
+    def execute(self):
+        index = int(self.email.split("@")[0][1:])
+        time.sleep((20 - index) * 0.002)
+        if index % 3 == 0:
+            raise Exception(f"fail {index}")
+        return mock_create_user_success(self.email, self.role)
+
+    mock_execute.side_effect = execute
+    users = [{"email": f"u{i}@test.com", "role": "admin"} for i in range(20)]
+
+    result = CreateCognitoUserBulk(users, max_workers=8).execute()
+
+    assert [u["email"] for u in result["created"]] == [f"u{i}@test.com" for i in range(20) if i % 3]
+    assert [u["email"] for u in result["failed"]] == [f"u{i}@test.com" for i in range(20) if i % 3 == 0]
+
+
+@patch.object(CreateCognitoUser, "execute", autospec=True)
+def test_bulk_comparte_throttle(mock_execute):
+    throttles = []
+    mock_execute.side_effect = lambda self: throttles.append(self.throttle) or {}
+
+    cmd = CreateCognitoUserBulk([{"email": f"u{i}@test.com", "role": "admin"} for i in range(5)])
+    cmd.execute()
+
+    assert len(throttles) == 5
+    assert all(t is cmd.throttle for t in throttles)
+
+
+@patch.object(create_user_bulk, "_throttle", None)
+@patch.object(create_user_bulk, "API_PROCESSES", 4)
+def test_cargas_concurrentes_comparten_la_cuota_del_worker():
+    first = CreateCognitoUserBulk([])
+    second = CreateCognitoUserBulk([])
+
+    assert first.throttle is second.throttle is get_throttle()
+    # La cuota del servicio se reparte entre los workers de gunicorn
+    assert first.throttle.buckets["create"].rate == create_user_bulk.CREATE_RPS / 4
+    assert first.throttle.buckets["update"].rate == create_user_bulk.UPDATE_RPS / 4
+
+
+@patch.object(create_user_bulk, "_throttle", None)
+def test_throttle_se_recrea_en_el_proceso_hijo():
+    parent = get_throttle()
+
+    with patch("src.commands.create_user_bulk.os.getpid", return_value=-1):
+        child = get_throttle()
+
+    assert child is not parent
+
+
+def throttling_error():
+    return ClientError({"Error": {"Code": "TooManyRequestsException", "Message": "Rate exceeded"}}, "AdminCreateUser")
+
+
+@patch("src.commands.create_user_bulk.time.sleep")
+def test_throttle_reintenta_throttling(mock_sleep):
+    method = MagicMock(side_effect=[throttling_error(), throttling_error(), {"ok": True}])
+    throttle = CognitoThrottle(create_rps=1000, update_rps=1000, max_retries=3, base_delay=0.1)
+
+    assert throttle.call("create", method, Username="a") == {"ok": True}
+    assert method.call_count == 3
+    delays = [c.args[0] for c in mock_sleep.call_args_list]
+    assert 0.1 <= delays[0] <= 0.2 and 0.2 <= delays[1] <= 0.4
+
+
+@patch("src.commands.create_user_bulk.time.sleep")
+def test_throttle_no_reintenta_otros_errores(mock_sleep):
+    error = ClientError({"Error": {"Code": "UsernameExistsException", "Message": "exists"}}, "AdminCreateUser")
+    method = MagicMock(side_effect=error)
+    throttle = CognitoThrottle(create_rps=1000, update_rps=1000)
+
+    with pytest.raises(ClientError):
+        throttle.call("create", method)
+    assert method.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+@patch("src.commands.create_user_bulk.time.sleep")
+def test_throttle_agota_reintentos(mock_sleep):
+    method = MagicMock(side_effect=throttling_error())
+    throttle = CognitoThrottle(create_rps=1000, update_rps=1000, max_retries=2)
+
+    with pytest.raises(ClientError):
+        throttle.call("update", method)
+    assert method.call_count == 3
+
+
+def test_token_bucket_limita_la_tasa():
+    bucket = TokenBucket(rate=100, capacity=1)
+    start = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    # 1 permiso inmediato + 10 a 100 por segundo ≈ 0.1s
+    assert time.monotonic() - start >= 0.09
+
+
+def test_token_bucket_rate_invalido():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
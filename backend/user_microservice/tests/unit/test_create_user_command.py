@@ -83,3 +83,27 @@ def test_create_user_unexpected_error(mock_boto_client):
 
     with pytest.raises(ApiError):
         cmd.execute()
+
+
+# ------------------------------------------------------------
+# Llamadas a Cognito a través del throttle (carga masiva)
+# ------------------------------------------------------------
+@patch("boto3.client")
+def test_create_user_usa_throttle(mock_boto_client):
+    mock_client = MagicMock()
+    mock_boto_client.return_value = mock_client
+    throttle = MagicMock()
+    throttle.call.side_effect = lambda operation, method, **kwargs: {"User": {"Username": "abc"}}
+
+    cmd = CreateCognitoUser("test@test.com", "admin", throttle=throttle)
+    cmd.user_pool_id = "pool"
+    result = cmd.create_user()
+
+    assert result["cognito_id"] == "abc"
+    operations = [(c.args[0], c.args[1]) for c in throttle.call.call_args_list]
+    assert operations == [
+        ("create", mock_client.admin_create_user),
+        ("update", mock_client.admin_set_user_password),
+    ]
+    # Con throttle, botocore no reintenta: solo el throttle lo hace
+    assert mock_boto_client.call_args.kwargs["config"].retries["max_attempts"] == 1
@@ -0,0 +1,40 @@
+from unittest.mock import patch
+from src.models import db
+
+
+class TestConnectionRegistry:
+
+    @patch("boto3.client")
+    def test_get_client_reutiliza_el_cliente(self, mock_client):
+        first = db.get_client("cognito-idp")
+        second = db.get_client("cognito-idp")
+
+        assert first is second
+        mock_client.assert_called_once()
+        config = mock_client.call_args.kwargs["config"]
+        assert config.max_pool_connections == db.MAX_POOL_CONNECTIONS
+        assert config.tcp_keepalive == db.TCP_KEEPALIVE
+        assert config.retries == {"mode": db.RETRY_MODE, "max_attempts": db.MAX_ATTEMPTS}
+
+    @patch("boto3.client")
+    def test_get_client_sin_reintentos_es_otro_cliente(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: object()
+        default = db.get_client("cognito-idp")
+        no_retries = db.get_client("cognito-idp", max_attempts=1)
+
+        assert no_retries is not default
+        assert db.get_client("cognito-idp", max_attempts=1) is no_retries
+        assert mock_client.call_args.kwargs["config"].retries["max_attempts"] == 1
+
+    @patch("boto3.client")
+    def test_reset_y_fork_descartan_conexiones(self, mock_client):
+        mock_client.side_effect = lambda *args, **kwargs: object()
+        first = db.get_client("cognito-idp")
+
+        db.reset_connections()
+        second = db.get_client("cognito-idp")
+        assert second is not first
+
+        with patch.object(db, "_owner_pid", -1):
+            third = db.get_client("cognito-idp")
+        assert third is not second
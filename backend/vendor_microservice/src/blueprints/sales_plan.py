@@ -6,6 +6,7 @@ from ..commands.create_sales_plan import CreateSalesPlan
 from ..commands.view_all_sales_plans import GetAllSalesPlans
 from ..commands.view_report_vendor import ViewReportVendor
 from ..models.sales_plan import NewSalesPlanJsonSchema
+from ..utils.streaming import wants_ndjson, ndjson_response
 
 sales_blueprint = Blueprint("sales_plan", __name__, url_prefix="/sales_plan")
 
@@ -37,6 +38,9 @@ def create_sales_plan():
 @cognito_auth_required
 def get_all_sales_plans():
     try:
+        if wants_ndjson(request):
+            return ndjson_response(GetAllSalesPlans().stream())
+
         response = GetAllSalesPlans().execute()
         return jsonify(response), 200
     except ApiError as e:
@@ -7,6 +7,7 @@ from flask_cognito import cognito_auth_required
 from ..models.vendor import NewVendorJsonSchema
 from ..errors.errors import ParamError, ApiError
 from ..queries.get_vendor_clients import GetVendorClients
+from ..utils.streaming import wants_ndjson, ndjson_response
 
 
 vendors_blueprint = Blueprint("vendor", __name__)
@@ -39,8 +40,16 @@ def create_vendor():
 @cognito_auth_required
 def list_vendors():
     try:
-        result = GetAllVendors().execute()
+        if wants_ndjson(request):
+            return ndjson_response(GetAllVendors().stream())
+
+        result = GetAllVendors(
+            limit=request.args.get("limit"),
+            cursor=request.args.get("cursor"),
+        ).execute()
         return jsonify(result), 200
+    except ParamError as e:
+        return jsonify({"error": str(e)}), 400
     except ApiError as e:
         return jsonify({"error": str(e)}), 500
     except Exception as e:
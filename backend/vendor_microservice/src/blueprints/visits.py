@@ -33,9 +33,16 @@ def create_visit():
 def list_visits():
     try:
         vendor_id = current_cognito_jwt.get("sub")
-        response = ListVisits(vendor_id).execute()
+        response = ListVisits(
+            vendor_id,
+            since=request.args.get("since"),
+            until=request.args.get("until"),
+            limit=request.args.get("limit"),
+        ).execute()
         return jsonify(response), 200
 
+    except ParamError as e:
+        return jsonify({"error": str(e)}), 400
     except ApiError as e:
         return jsonify({"error": str(e)}), 500
     except Exception as e:
@@ -52,12 +52,8 @@ class CreateSalesPlan(BaseCommannd):
                 for p in products
             ]
 
-            # ---------------------- Check duplicates ----------------------
-            existing_plan = SalesPlanModel.find_existing_plan(vendor_id, period)
-            if existing_plan:
-                raise ParamError("The vendor already has an active plan for this period.")
-
             # ---------------------- Create the new plan ----------------------
+            # SalesPlanModel.create rejects duplicates (vendor & period): GSI lookup + conditional put
             plan = SalesPlanModel.create(
                 vendor_id=vendor_id,
                 period=period,
@@ -1,3 +1,4 @@
+import re
 import logging
 from .base_command import BaseCommannd
 from ..errors.errors import ApiError, ParamError
@@ -5,11 +6,17 @@ from ..models.visit import VisitModel
 
 logger = logging.getLogger(__name__)
 
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+MAX_LIMIT = 500
+
 
 class ListVisits(BaseCommannd):
 
-    def __init__(self, vendor_id: str):
+    def __init__(self, vendor_id: str, since: str = None, until: str = None, limit=None):
         self.vendor_id = vendor_id
+        self.since = since
+        self.until = until
+        self.limit = limit
 
     def execute(self):
         try:
@@ -19,8 +26,19 @@ class ListVisits(BaseCommannd):
             if not self.vendor_id:
                 raise ParamError("vendor_id es obligatorio (token inválido).")
 
-            # Consulta en DynamoDB
-            visits = VisitModel.get_by_vendor(self.vendor_id)
+            for name, value in (("since", self.since), ("until", self.until)):
+                if value and not ISO_DATE.match(value):
+                    raise ParamError(f"El parámetro '{name}' debe estar en formato ISO 8601.")
+            if self.since and self.until and self.since > self.until:
+                raise ParamError("El parámetro 'since' no puede ser posterior a 'until'.")
+
+            # Consulta por rango sobre el GSI vendor_id + visit_datetime (más recientes primero)
+            visits = VisitModel.get_by_vendor(
+                self.vendor_id,
+                since=self.since or None,
+                until=self.until or None,
+                limit=self._parse_limit(),
+            )
 
             logger.info(f"📦 Se encontraron {len(visits)} visitas para el vendor {self.vendor_id}")
 
@@ -33,3 +51,15 @@ class ListVisits(BaseCommannd):
         except Exception as e:
             logger.error(f"❌ Error al obtener visitas: {e}")
             raise ApiError(f"Error al obtener visitas: {str(e)}")
+
+    def _parse_limit(self):
+        """Sin `limit` se retorna toda la línea de tiempo."""
+        if self.limit is None or self.limit == "":
+            return None
+        try:
+            value = int(self.limit)
+        except (TypeError, ValueError):
+            raise ParamError("El parámetro 'limit' debe ser un número entero.")
+        if value < 1 or value > MAX_LIMIT:
+            raise ParamError(f"El parámetro 'limit' debe estar entre 1 y {MAX_LIMIT}.")
+        return value
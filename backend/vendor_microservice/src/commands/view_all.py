@@ -1,18 +1,27 @@
 import logging
 from .base_command import BaseCommannd
-from ..errors.errors import ApiError
+from ..errors.errors import ApiError, ParamError
 from ..models.vendor import VendorModel
+from ..utils.pagination import parse_limit, encode_cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
 
 
 class GetAllVendors(BaseCommannd):
     """
-    Obtiene todos los vendedores almacenados en DynamoDB.
+    Obtiene los vendedores almacenados en DynamoDB.
+    Si se envía `limit` o `cursor`, devuelve una sola página con `next_cursor`.
     """
 
+    def __init__(self, limit=None, cursor=None):
+        self.limit = limit
+        self.cursor = cursor
+
     def execute(self):
         try:
+            if self.limit is not None or self.cursor is not None:
+                return self.fetch_page()
+
             logger.info("📦 Obteniendo lista de vendedores...")
 
             # Llamada directa al modelo
@@ -25,6 +34,26 @@ class GetAllVendors(BaseCommannd):
 
             return vendors
 
+        except ParamError:
+            raise
         except Exception as e:
             logger.error(f"❌ Error al obtener vendedores: {e}")
             raise ApiError(f"Error al obtener la lista de vendedores: {str(e)}")
+
+    def stream(self):
+        """Recorre la tabla de vendedores página a página sin materializarla."""
+        logger.info("📤 Exportando vendedores en streaming...")
+        return (vendor.to_dict() for vendor in VendorModel.scan())
+
+    def fetch_page(self):
+        """Obtiene una página de vendedores a partir del cursor recibido."""
+        limit = parse_limit(self.limit)
+        start_key = decode_cursor(self.cursor)
+
+        logger.info(f"📦 Obteniendo página de vendedores (limit={limit})...")
+        vendors, last_key = VendorModel.get_page(limit, start_key)
+
+        return {
+            "items": vendors,
+            "next_cursor": encode_cursor(last_key),
+        }
@@ -24,3 +24,8 @@ class GetAllSalesPlans(BaseCommannd):
         except Exception as e:
             logger.error(f"❌ Error retrieving Sales Plans: {e}")
             raise ApiError(f"Error retrieving Sales Plans: {str(e)}")
+
+    def stream(self):
+        """Iterates the SalesPlans table page by page without materializing it."""
+        logger.info("📤 Streaming Sales Plans export...")
+        return (plan.to_dict() for plan in SalesPlanModel.scan())
@@ -1,9 +1,8 @@
 import logging
-from collections import defaultdict
 from .base_command import BaseCommannd
 from ..errors.errors import ApiError
 from ..models.sales_plan import SalesPlanModel
-from ..models.order import OrderModel
+from ..models.vendor_sales_rollup import VendorSalesRollupModel
 
 logger = logging.getLogger(__name__)
 
@@ -16,45 +15,26 @@ class ViewReportVendor(BaseCommannd):
         try:
             logger.info(f"Generating report for vendor={self.vendor_id}")
 
-            # Obtener planes del vendedor
-            plans = SalesPlanModel.get_by_vendor(self.vendor_id)
-            logger.info(f"Found {len(plans)} sales plans: {plans}")
-
-            total_target_value = sum(
-                sum(p.get("target_value", 0) for p in plan.get("products", []))
-                for plan in plans
-            )
-
-            total_target_units = sum(
-                sum(p.get("target_units", 0) for p in plan.get("products", []))
-                for plan in plans
+            # Metas del vendedor (GSI vendor_id, solo `products`)
+            total_target_value = 0.0
+            total_target_units = 0
+            for target in SalesPlanModel.iter_targets_by_vendor(self.vendor_id):
+                total_target_value += target.target_value or 0
+                total_target_units += target.target_units or 0
+
+            # Acumulados del vendedor (un solo GetItem sobre VendorSalesRollup)
+            summary = VendorSalesRollupModel.get_summary(self.vendor_id)
+            ordered_products = summary["order_count"]
+            customers_served = summary["customers"]
+            total_sales = summary["total_value"]
+            total_units_sold = summary["total_units"]
+            sold_products = summary["products"]
+
+            logger.info(
+                f"Report for vendor={self.vendor_id}: {ordered_products} orders, "
+                f"{customers_served} customers, {len(sold_products)} products"
             )
 
-            # Obtener órdenes del vendedor
-            orders = OrderModel.get_by_vendor(self.vendor_id)
-            logger.info(f"Found {len(orders)} orders: {orders}")
-
-            ordered_products = len(orders)
-            customers_served = len(set(order.get("id_client") for order in orders if order.get("id_client")))
-
-            sold_products = defaultdict(lambda: {"name": "", "quantity": 0})
-            total_sales = 0.0
-            total_units_sold = 0
-
-            # Consolidar productos vendidos
-            for order in orders:
-                for product in order.get("products", []):
-                    pid = product.get("id")
-                    name = product.get("name", "")
-                    qty = product.get("amount", 0)
-                    price = product.get("unit_price", 0)
-
-                    sold_products[pid]["name"] = name
-                    sold_products[pid]["quantity"] += qty
-
-                    total_units_sold += qty
-                    total_sales += qty * price
-
             # Calcular métricas
             sales_percentage = (total_sales / total_target_value * 100) if total_target_value > 0 else 0
             remaining_to_goal = max(total_target_value - total_sales, 0.0)
@@ -74,9 +54,9 @@ class ViewReportVendor(BaseCommannd):
                     {
                         "id": pid,
                         "name": data["name"],
-                        "quantity": data["quantity"]
+                        "quantity": data["units"]
                     }
-                    for pid, data in sold_products.items()
+                    for pid, data in sorted(sold_products.items())
                 ],
             }
             return response
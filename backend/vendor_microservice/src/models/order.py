@@ -5,6 +5,7 @@ from pynamodb.models import Model
 from uuid import uuid4
 from marshmallow import Schema, fields, validate
 from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute, ListAttribute
+from .db import MAX_POOL_CONNECTIONS
 
 
 
@@ -58,9 +59,10 @@ class OrderModel(Model):
     Modelo PynamoDB para la tabla Orders
     """
     class Meta:
-        table_name = os.getenv("DYNAMODB_TABLE", "Orders")
+        table_name = os.getenv("DYNAMODB_TABLE_ORDERS", "Orders")
         region = os.getenv("AWS_REGION", "us-east-1")
         host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
             aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
@@ -87,16 +89,6 @@ class OrderModel(Model):
     updated_at = UTCDateTimeAttribute(null=True)
 
 
-    @classmethod
-    def get_by_vendor(cls, vendor_id: str):
-        """Return all orders for a given vendor_id as dicts."""
-        try:
-            orders = list(cls.scan(cls.id_vendor == vendor_id))
-            return [order.to_dict() for order in orders]
-        except Exception as e:
-            raise Exception(f"Error retrieving orders for vendor {vendor_id}: {str(e)}")
-
-
     def to_dict(self):
         return {
             "id": self.id,
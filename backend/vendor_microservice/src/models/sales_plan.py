@@ -1,10 +1,12 @@
 import os
 import datetime
-from uuid import uuid4
 from pynamodb.models import Model
+from pynamodb.exceptions import PutError
+from pynamodb.indexes import GlobalSecondaryIndex, IncludeProjection
 from pynamodb.attributes import UnicodeAttribute, ListAttribute, UTCDateTimeAttribute, MapAttribute, NumberAttribute
 from marshmallow import Schema, fields, validate, ValidationError
 from ..errors.errors import ParamError
+from .db import MAX_POOL_CONNECTIONS
 
 
 # ---------------------- SCHEMA DE VALIDACIÓN ----------------------
@@ -71,6 +73,19 @@ class ProductTargetMap(MapAttribute):
     target_value = NumberAttribute()
 
 
+class VendorPeriodIndex(GlobalSecondaryIndex):
+    """🔎 GSI vendor_id + period, projecting only the product goals."""
+
+    class Meta:
+        index_name = "vendor_id-period-index"
+        projection = IncludeProjection(["products"])
+        read_capacity_units = 5
+        write_capacity_units = 5
+
+    vendor_id = UnicodeAttribute(hash_key=True)
+    period = UnicodeAttribute(range_key=True)
+
+
 class SalesPlanModel(Model):
     """
     📊 PynamoDB Model for the SalesPlans table
@@ -80,12 +95,13 @@ class SalesPlanModel(Model):
         table_name = os.getenv("DYNAMODB_TABLE_SALES_PLANS", "SalesPlans")
         region = os.getenv("AWS_REGION", "us-east-1")
         host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
             aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
             aws_session_token = os.getenv("AWS_SESSION_TOKEN", None)
 
-    # Primary Key
+    # Primary Key: deterministic "vendor_id#period", so each vendor has at most one plan per period
     plan_id = UnicodeAttribute(hash_key=True)
 
     # Attributes
@@ -98,13 +114,24 @@ class SalesPlanModel(Model):
     created_at = UTCDateTimeAttribute(null=True)
     updated_at = UTCDateTimeAttribute(null=True)
 
+    # Indexes
+    vendor_index = VendorPeriodIndex()
+
     # ---------------------- MÉTODOS ----------------------
 
+    @staticmethod
+    def plan_key(vendor_id: str, period: str) -> str:
+        """🔑 Builds the plan id that makes (vendor_id, period) unique."""
+        return f"{vendor_id}#{period}"
+
     @classmethod
     def find_existing_plan(cls, vendor_id: str, period: str):
-        """🔎 Checks if a vendor already has an active plan for the same period."""
+        """
+        🔎 Checks if a vendor already has an active plan for the same period.
+        Queries the vendor_id + period GSI, so plans stored with a UUID id are found too.
+        """
         try:
-            for plan in cls.scan((cls.vendor_id == vendor_id) & (cls.period == period)):
+            for plan in cls.vendor_index.query(vendor_id, cls.period == period, limit=1):
                 return plan
             return None
         except Exception as e:
@@ -128,25 +155,34 @@ class SalesPlanModel(Model):
         except Exception as e:
             raise Exception(f"Error retrieving sales plans for vendor {vendor_id}: {str(e)}")
 
+    @classmethod
+    def iter_targets_by_vendor(cls, vendor_id: str):
+        """Yield every product goal of a vendor's plans, reading only the projected attributes."""
+        plans = cls.vendor_index.query(vendor_id, attributes_to_get=["products"])
+        for plan in plans:
+            yield from plan.products or []
+
     @classmethod
     def create(cls, **kwargs):
         """Creates a new sales plan, ensuring one per vendor per period."""
-        vendor_id = kwargs.get("vendor_id")
-        period = kwargs.get("period")
-
-        # Prevent duplicate plans for same vendor & period
-        existing = cls.find_existing_plan(vendor_id, period)
-        if existing:
+        # Plans stored before the vendor#period key have UUID ids: the conditional put can't see them
+        if cls.find_existing_plan(kwargs.get("vendor_id"), kwargs.get("period")):
             raise ParamError("The vendor already has an active plan for this period.")
 
         plan = SalesPlanModel(**kwargs)
-        plan.plan_id = str(uuid4())
+        plan.plan_id = cls.plan_key(plan.vendor_id, plan.period)
 
         # Always store timestamps in UTC
         now_utc = datetime.datetime.now(datetime.timezone.utc)
         plan.created_at = plan.updated_at = now_utc
 
-        plan.save()
+        # Conditional put: concurrent submissions for the same vendor & period cannot both win
+        try:
+            plan.save(condition=cls.plan_id.does_not_exist())
+        except PutError as e:
+            if e.cause_response_code == "ConditionalCheckFailedException":
+                raise ParamError("The vendor already has an active plan for this period.")
+            raise
         return plan
 
     def to_dict(self):
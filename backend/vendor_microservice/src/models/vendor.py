@@ -2,13 +2,21 @@ import os
 import logging
 import datetime
 from pynamodb.models import Model
+from pynamodb.indexes import GlobalSecondaryIndex, IncludeProjection
 from pynamodb.attributes import UnicodeAttribute, ListAttribute, UTCDateTimeAttribute
 from marshmallow import Schema, fields, validate, ValidationError
 from ..errors.errors import EntityNotFoundError, ParamError
+from ..utils.ttl_cache import TTLCache
+from .db import MAX_POOL_CONNECTIONS
 
 
 logger = logging.getLogger(__name__)
 
+# 🧠 Caché por worker de get_by_id (la consulta de clientes de la app móvil)
+VENDOR_CACHE_TTL_SECONDS = int(os.getenv("VENDOR_CACHE_TTL_SECONDS", "60"))
+VENDOR_CACHE_MAX_SIZE = int(os.getenv("VENDOR_CACHE_MAX_SIZE", "1024"))
+vendor_cache = TTLCache(maxsize=VENDOR_CACHE_MAX_SIZE, ttl=VENDOR_CACHE_TTL_SECONDS)
+
 
 class InstitutionSchema(Schema):
     client_id = fields.String()
@@ -53,6 +61,18 @@ class NewVendorJsonSchema(Schema):
             raise ParamError.first_from(exception.messages)
 
 
+class VendorIdIndex(GlobalSecondaryIndex):
+    """GSI vendor_id con las llaves y las instituciones del vendedor"""
+
+    class Meta:
+        index_name = "vendor_id-index"
+        projection = IncludeProjection(["institutions"])
+        read_capacity_units = 5
+        write_capacity_units = 5
+
+    vendor_id = UnicodeAttribute(hash_key=True)
+
+
 class VendorModel(Model):
     """
     Modelo PynamoDB para la tabla Vendors
@@ -64,6 +84,7 @@ class VendorModel(Model):
         host = (
             os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
         )
+        max_pool_connections = MAX_POOL_CONNECTIONS
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
             aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
@@ -81,6 +102,9 @@ class VendorModel(Model):
     created_at = UTCDateTimeAttribute(null=True)
     updated_at = UTCDateTimeAttribute(null=True)
 
+    # Índices
+    vendor_id_index = VendorIdIndex()
+
     # ------------------- MÉTODOS -------------------
 
     @classmethod
@@ -93,10 +117,17 @@ class VendorModel(Model):
 
     @classmethod
     def get_by_id(cls, vendor_id: str):
-        """Busca un vendedor por vendor_id (no es clave primaria)."""
+        """
+        Busca un vendedor por vendor_id usando el GSI vendor_id-index.
+        Solo trae email, vendor_id e institutions; el resultado se cachea por worker.
+        """
+        vendor = vendor_cache.get(vendor_id)
+        if vendor is not None:
+            return vendor
+
         try:
-            results = cls.scan(cls.vendor_id == vendor_id)
-            for vendor in results:
+            for vendor in cls.vendor_id_index.query(vendor_id, limit=1):
+                vendor_cache.set(vendor_id, vendor)
                 return vendor
             return None
         except Exception as e:
@@ -112,6 +143,16 @@ class VendorModel(Model):
         except Exception as e:
             raise Exception(f"Error al obtener vendedores: {str(e)}")
 
+    @classmethod
+    def get_page(cls, limit: int, last_evaluated_key: dict = None):
+        """Retorna una página de vendedores y la llave para continuar el escaneo."""
+        try:
+            results = cls.scan(limit=limit, last_evaluated_key=last_evaluated_key)
+            vendors = [v.to_dict() for v in results]
+            return vendors, results.last_evaluated_key
+        except Exception as e:
+            raise Exception(f"Error al obtener vendedores: {str(e)}")
+
     @classmethod
     def create(cls, **kwargs):
         """Crea un nuevo vendedor (email único)."""
@@ -124,6 +165,7 @@ class VendorModel(Model):
             datetime.timezone.utc
         )
         vendor.save()
+        vendor_cache.pop(vendor.vendor_id)
         return vendor
 
     def to_dict(self):
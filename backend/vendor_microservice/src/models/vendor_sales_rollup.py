@@ -0,0 +1,69 @@
+import os
+from pynamodb.models import Model
+from pynamodb.attributes import UnicodeAttribute, NumberAttribute, UTCDateTimeAttribute
+from .db import MAX_POOL_CONNECTIONS
+
+# Periodo acumulado histórico
+ALL_TIME = "ALL"
+
+# Prefijos de los contadores por producto que escribe el servicio de órdenes
+UNITS_PREFIX = "units#"
+VALUE_PREFIX = "value#"
+NAME_PREFIX = "name#"
+
+
+def _number(raw):
+    text = raw["N"]
+    return float(text) if any(c in text for c in ".eE") else int(text)
+
+
+class VendorSalesRollupModel(Model):
+    """
+    Read model for the VendorSalesRollup table.
+    The order microservice keeps one totals item per vendor and period ("ALL" and
+    "YYYY-MM") with order, unit, value and distinct-client (`customers`) counters plus
+    per-product counters, all updated atomically on every new order.
+    """
+
+    class Meta:
+        table_name = os.getenv("DYNAMODB_TABLE_VENDOR_SALES_ROLLUP", "VendorSalesRollup")
+        region = os.getenv("AWS_REGION", "us-east-1")
+        host = os.getenv("DYNAMODB_ENDPOINT") if os.getenv("DYNAMODB_ENDPOINT") else None
+        max_pool_connections = MAX_POOL_CONNECTIONS
+        if os.getenv("APP_ENV") != "PROD":
+            aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
+            aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY", "dummy")
+            aws_session_token = os.getenv("AWS_SESSION_TOKEN", None)
+
+    id_vendor = UnicodeAttribute(hash_key=True)
+    period = UnicodeAttribute(range_key=True)
+
+    order_count = NumberAttribute(null=True)
+    customers = NumberAttribute(null=True)
+    total_units = NumberAttribute(null=True)
+    total_value = NumberAttribute(null=True)
+
+    updated_at = UTCDateTimeAttribute(null=True)
+
+    @classmethod
+    def get_summary(cls, vendor_id: str, period: str = ALL_TIME):
+        """
+        Return the vendor totals for a period with a single GetItem.
+        Per-product counters are dynamic attributes, so the raw item is parsed here.
+        """
+        item = cls._get_connection().get_item(vendor_id, range_key=period).get("Item") or {}
+
+        products = {}
+        for name, raw in item.items():
+            for prefix, field in ((UNITS_PREFIX, "units"), (VALUE_PREFIX, "value"), (NAME_PREFIX, "name")):
+                if name.startswith(prefix):
+                    product = products.setdefault(name[len(prefix):], {"name": "", "units": 0, "value": 0.0})
+                    product[field] = raw["S"] if field == "name" else _number(raw)
+
+        return {
+            "order_count": _number(item["order_count"]) if "order_count" in item else 0,
+            "customers": _number(item["customers"]) if "customers" in item else 0,
+            "total_units": _number(item["total_units"]) if "total_units" in item else 0,
+            "total_value": float(_number(item["total_value"])) if "total_value" in item else 0.0,
+            "products": products,
+        }
@@ -3,6 +3,7 @@ import logging
 import datetime
 from uuid import uuid4
 from pynamodb.models import Model
+from pynamodb.indexes import GlobalSecondaryIndex, AllProjection
 from pynamodb.attributes import (
     UnicodeAttribute,
     ListAttribute,
@@ -10,6 +11,7 @@ from pynamodb.attributes import (
 )
 from marshmallow import Schema, fields, validate, ValidationError
 from ..errors.errors import ParamError
+from .db import MAX_POOL_CONNECTIONS
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,23 @@ class NewVisitJsonSchema(Schema):
 
 # ---------------------- MODEL ----------------------
 
+# Cota superior para que `until` incluya todo lo que empiece por ese valor (p. ej. un día completo)
+_UNTIL_SUFFIX = "\uffff"
+
+
+class VendorVisitsIndex(GlobalSecondaryIndex):
+    """GSI vendor_id + visit_datetime para la línea de tiempo de visitas de un vendedor"""
+
+    class Meta:
+        index_name = "vendor_id-visit_datetime-index"
+        projection = AllProjection()
+        read_capacity_units = 5
+        write_capacity_units = 5
+
+    vendor_id = UnicodeAttribute(hash_key=True)
+    visit_datetime = UnicodeAttribute(range_key=True)
+
+
 class VisitModel(Model):
     """
     Modelo DynamoDB para registrar visitas comerciales.
@@ -49,6 +68,7 @@ class VisitModel(Model):
         table_name = os.getenv("DYNAMODB_TABLE_VISITS", "Visits")
         region = os.getenv("AWS_REGION", "us-east-1")
         host = os.getenv("DYNAMODB_ENDPOINT") or None
+        max_pool_connections = MAX_POOL_CONNECTIONS
 
         if os.getenv("APP_ENV") != "PROD":
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID", "dummy")
@@ -73,6 +93,9 @@ class VisitModel(Model):
     created_at = UTCDateTimeAttribute(null=True)
     updated_at = UTCDateTimeAttribute(null=True)
 
+    # Índices
+    vendor_index = VendorVisitsIndex()
+
     # ---------------- Métodos ----------------
 
     @classmethod
@@ -103,8 +126,26 @@ class VisitModel(Model):
             return None
 
     @classmethod
-    def get_by_vendor(cls, vendor_id):
-        items = list(cls.scan(cls.vendor_id == vendor_id))
+    def get_by_vendor(cls, vendor_id, since=None, until=None, limit=None):
+        """
+        Visitas de un vendedor de la más reciente a la más antigua.
+        `since` y `until` (ISO 8601) acotan visit_datetime; `until` incluye su prefijo completo.
+        """
+        if since and until:
+            range_condition = cls.visit_datetime.between(since, until + _UNTIL_SUFFIX)
+        elif since:
+            range_condition = cls.visit_datetime >= since
+        elif until:
+            range_condition = cls.visit_datetime <= until + _UNTIL_SUFFIX
+        else:
+            range_condition = None
+
+        items = cls.vendor_index.query(
+            vendor_id,
+            range_key_condition=range_condition,
+            scan_index_forward=False,
+            limit=limit,
+        )
         return [v.to_dict() for v in items]
 
 
@@ -2,6 +2,8 @@ import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone
 from src.models.sales_plan import SalesPlanModel, ProductTargetMap
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import PutError
 from src.errors.errors import ParamError
 
 
@@ -11,27 +13,31 @@ from src.errors.errors import ParamError
 class TestFindExistingPlan:
     """🧪 Pruebas unitarias para find_existing_plan()"""
 
-    @patch.object(SalesPlanModel, "scan")
-    def test_should_find_plan_by_vendor_and_period(self, mock_scan):
-        """✅ Debe devolver un plan existente si hay coincidencia"""
+    @patch.object(SalesPlanModel.vendor_index, "query")
+    def test_should_find_plan_by_vendor_and_period(self, mock_query):
+        """✅ Debe devolver un plan existente consultando el GSI vendor_id + period"""
         mock_plan = MagicMock()
-        mock_scan.return_value = [mock_plan]
+        mock_query.return_value = iter([mock_plan])
 
         result = SalesPlanModel.find_existing_plan("v123", "2025-Q1")
 
-        mock_scan.assert_called_once()
+        assert mock_query.call_args.args[0] == "v123"
+        assert mock_query.call_args.kwargs["limit"] == 1
+        names, values = {}, {}
+        assert mock_query.call_args.args[1].serialize(names, values) == "#0 = :0"
+        assert names == {"period": "#0"} and values == {":0": {"S": "2025-Q1"}}
         assert result == mock_plan
 
-    @patch.object(SalesPlanModel, "scan", return_value=[])
-    def test_should_return_none_if_not_found(self, mock_scan):
+    @patch.object(SalesPlanModel.vendor_index, "query", return_value=iter([]))
+    def test_should_return_none_if_not_found(self, mock_query):
         """❌ Debe retornar None si no hay plan existente"""
         result = SalesPlanModel.find_existing_plan("v999", "2025-Q2")
-        mock_scan.assert_called_once()
+        assert mock_query.call_args.args[0] == "v999"
         assert result is None
 
-    @patch.object(SalesPlanModel, "scan", side_effect=Exception("DB error"))
-    def test_should_raise_exception_on_failure(self, mock_scan):
-        """❌ Debe lanzar excepción si scan falla"""
+    @patch.object(SalesPlanModel.vendor_index, "query", side_effect=Exception("DB error"))
+    def test_should_raise_exception_on_failure(self, mock_query):
+        """❌ Debe lanzar excepción si la lectura falla"""
         with pytest.raises(Exception, match="Error checking existing sales plan"):
             SalesPlanModel.find_existing_plan("v123", "2025-Q1")
 
@@ -71,9 +77,9 @@ class TestGetAllSalesPlans:
 class TestCreateSalesPlan:
     """🧪 Pruebas unitarias para create()"""
 
-    @patch.object(SalesPlanModel, "save")
     @patch.object(SalesPlanModel, "find_existing_plan", return_value=None)
-    def test_should_create_sales_plan_correctly(self, mock_find, mock_save):
+    @patch.object(SalesPlanModel, "save")
+    def test_should_create_sales_plan_correctly(self, mock_save, mock_find):
         """✅ Debe crear un plan y asignar campos automáticos"""
         products = [
             ProductTargetMap(
@@ -88,24 +94,34 @@ class TestCreateSalesPlan:
             products=products,
         )
 
-        assert plan.plan_id is not None
-        assert isinstance(plan.plan_id, str)
+        assert plan.plan_id == "v123#2025-Q1"
         assert plan.created_at is not None
         assert plan.updated_at is not None
         assert plan.vendor_id == "v123"
         mock_save.assert_called_once()
 
-    @patch.object(SalesPlanModel, "find_existing_plan", return_value=True)
-    def test_should_raise_paramerror_if_plan_exists(self, mock_find):
+        # 🔒 El put es condicional sobre la llave determinística
+        condition = mock_save.call_args.kwargs["condition"]
+        names, values = {}, {}
+        assert condition.serialize(names, values) == "attribute_not_exists (#0)"
+        assert names == {"plan_id": "#0"}
+
+    @patch.object(SalesPlanModel, "find_existing_plan", return_value=None)
+    @patch.object(SalesPlanModel, "save")
+    def test_should_raise_paramerror_if_plan_exists(self, mock_save, mock_find):
         """❌ Debe lanzar ParamError si ya existe un plan para ese periodo"""
+        mock_save.side_effect = PutError(cause=ClientError(
+            {"Error": {"Code": "ConditionalCheckFailedException", "Message": "The conditional request failed"}},
+            "PutItem",
+        ))
         with pytest.raises(ParamError, match="already has an active plan"):
             SalesPlanModel.create(
                 vendor_id="v123", period="2025-Q1", region="Norte", products=[]
             )
 
-    @patch.object(SalesPlanModel, "save", side_effect=Exception("Dynamo Error"))
     @patch.object(SalesPlanModel, "find_existing_plan", return_value=None)
-    def test_should_raise_exception_if_save_fails(self, mock_find, mock_save):
+    @patch.object(SalesPlanModel, "save", side_effect=Exception("Dynamo Error"))
+    def test_should_raise_exception_if_save_fails(self, mock_save, mock_find):
         """❌ Debe propagar error si save falla"""
         with pytest.raises(Exception, match="Dynamo Error"):
             SalesPlanModel.create(
@@ -113,6 +129,19 @@ class TestCreateSalesPlan:
             )
 
 
+    @patch.object(SalesPlanModel, "find_existing_plan")
+    @patch.object(SalesPlanModel, "save")
+    def test_should_reject_legacy_plan_for_same_period(self, mock_save, mock_find):
+        """❌ Un plan previo con id UUID para el mismo vendedor y periodo también bloquea"""
+        mock_find.return_value = SalesPlanModel("7f0c2a9e-uuid", vendor_id="v123", period="2025-Q1")
+
+        with pytest.raises(ParamError, match="already has an active plan"):
+            SalesPlanModel.create(vendor_id="v123", period="2025-Q1", region="Norte", products=[])
+
+        mock_find.assert_called_once_with("v123", "2025-Q1")
+        mock_save.assert_not_called()
+
+
 # ============================================================
 # 🧾 Tests para to_dict()
 # ============================================================
@@ -146,3 +175,22 @@ class TestToDict:
         assert result["products"][0]["name"] == "Producto 1"
         assert "created_at" in result
         assert "updated_at" in result
+
+
+# ============================================================
+# 🎯 Tests para iter_targets_by_vendor()
+# ============================================================
+class TestIterTargetsByVendor:
+    """🧪 Pruebas para iter_targets_by_vendor()"""
+
+    @patch.object(SalesPlanModel, "vendor_index")
+    def test_should_query_vendor_index_projecting_products(self, mock_index):
+        """✅ Consulta el GSI y recorre las metas de todos los planes"""
+        target_a = ProductTargetMap(product_id="P1", name="A", target_units=1, target_value=10.0)
+        target_b = ProductTargetMap(product_id="P2", name="B", target_units=2, target_value=20.0)
+        mock_index.query.return_value = [MagicMock(products=[target_a]), MagicMock(products=[target_b]), MagicMock(products=None)]
+
+        result = list(SalesPlanModel.iter_targets_by_vendor("v1"))
+
+        assert result == [target_a, target_b]
+        mock_index.query.assert_called_once_with("v1", attributes_to_get=["products"])
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timezone
-from src.models.vendor import VendorModel
+from src.models.vendor import VendorModel, vendor_cache
 from src.errors.errors import ParamError
 
 
@@ -60,6 +60,50 @@ class TestGetAllVendors:
             VendorModel.get_all()
 
 
+# ============================================================
+# 🆔 Tests para get_by_id()
+# ============================================================
+class TestGetById:
+    """🧪 Pruebas unitarias para get_by_id()"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        vendor_cache.clear()
+        yield
+        vendor_cache.clear()
+
+    @patch.object(VendorModel, "vendor_id_index")
+    def test_should_query_index_and_cache_vendor(self, mock_index):
+        """✅ Consulta el GSI vendor_id una sola vez y sirve las siguientes desde la caché"""
+        mock_vendor = MagicMock(institutions=["c1"])
+        mock_index.query.return_value = iter([mock_vendor])
+
+        assert VendorModel.get_by_id("V1") is mock_vendor
+        assert VendorModel.get_by_id("V1") is mock_vendor
+
+        mock_index.query.assert_called_once_with("V1", limit=1)
+
+    @patch.object(VendorModel, "vendor_id_index")
+    def test_should_not_cache_missing_vendor(self, mock_index):
+        """⚠️ Retorna None sin cachear si el vendedor no existe"""
+        mock_index.query.side_effect = lambda *args, **kwargs: iter([])
+
+        assert VendorModel.get_by_id("V404") is None
+        assert VendorModel.get_by_id("V404") is None
+        assert mock_index.query.call_count == 2
+
+    @patch.object(VendorModel, "save")
+    @patch.object(VendorModel, "find_existing_vendor", return_value=None)
+    @patch.object(VendorModel, "vendor_id_index")
+    def test_create_should_invalidate_cached_vendor(self, mock_index, mock_find, mock_save):
+        """🧹 Crear un vendedor invalida su entrada en la caché"""
+        vendor_cache.set("V1", MagicMock())
+
+        VendorModel.create(email="new@example.com", vendor_id="V1", name="New", institutions=[])
+
+        assert vendor_cache.get("V1") is None
+
+
 # ============================================================
 # 🧱 Tests para create()
 # ============================================================
@@ -0,0 +1,53 @@
+from unittest.mock import patch
+from src.models.vendor_sales_rollup import VendorSalesRollupModel
+
+
+# ============================================================
+# 📊 Tests para get_summary()
+# ============================================================
+class TestGetSummary:
+    """🧪 Pruebas para get_summary()"""
+
+    @patch.object(VendorSalesRollupModel, "_get_connection")
+    def test_should_parse_counters_and_products(self, mock_connection):
+        """✅ Lee el ítem del periodo con un GetItem y arma totales, clientes y productos"""
+        get_item = mock_connection.return_value.get_item
+        get_item.return_value = {
+            "Item": {
+                "id_vendor": {"S": "V1"},
+                "period": {"S": "ALL"},
+                "order_count": {"N": "3"},
+                "customers": {"N": "2"},
+                "total_units": {"N": "5"},
+                "total_value": {"N": "120.5"},
+                "units#P1": {"N": "4"},
+                "value#P1": {"N": "100.5"},
+                "name#P1": {"S": "Mouse"},
+                "units#P2": {"N": "1"},
+                "value#P2": {"N": "20"},
+                "name#P2": {"S": "Keyboard"},
+            }
+        }
+
+        result = VendorSalesRollupModel.get_summary("V1")
+
+        get_item.assert_called_once_with("V1", range_key="ALL")
+        assert result["order_count"] == 3
+        assert result["customers"] == 2
+        assert result["total_units"] == 5
+        assert result["total_value"] == 120.5
+        assert result["products"] == {
+            "P1": {"name": "Mouse", "units": 4, "value": 100.5},
+            "P2": {"name": "Keyboard", "units": 1, "value": 20},
+        }
+
+    @patch.object(VendorSalesRollupModel, "_get_connection")
+    def test_should_return_zeros_when_vendor_has_no_orders(self, mock_connection):
+        """⚠️ Sin ítem retorna contadores en cero"""
+        get_item = mock_connection.return_value.get_item
+        get_item.return_value = {}
+
+        result = VendorSalesRollupModel.get_summary("V1", period="2025-11")
+
+        get_item.assert_called_once_with("V1", range_key="2025-11")
+        assert result == {"order_count": 0, "customers": 0, "total_units": 0, "total_value": 0.0, "products": {}}
@@ -69,23 +69,48 @@ class TestGetById:
 class TestGetByVendor:
     """🧪 Pruebas para get_by_vendor()"""
 
-    @patch.object(VisitModel, "scan")
-    def test_should_return_list_of_visits(self, mock_scan):
+    @patch.object(VisitModel, "vendor_index")
+    def test_should_return_list_of_visits(self, mock_index):
+        """✅ Consulta el GSI en orden descendente sin acotar el rango"""
         mock_v1 = MagicMock()
-        mock_v1.to_dict.return_value = {"visit_id": "1", "vendor_id": "V1"}
+        mock_v1.to_dict.return_value = {"visit_id": "2", "vendor_id": "V1"}
         mock_v2 = MagicMock()
-        mock_v2.to_dict.return_value = {"visit_id": "2", "vendor_id": "V1"}
+        mock_v2.to_dict.return_value = {"visit_id": "1", "vendor_id": "V1"}
 
-        mock_scan.return_value = [mock_v1, mock_v2]
+        mock_index.query.return_value = [mock_v1, mock_v2]
 
         result = VisitModel.get_by_vendor("V1")
 
-        mock_scan.assert_called_once()
+        mock_index.query.assert_called_once_with(
+            "V1", range_key_condition=None, scan_index_forward=False, limit=None
+        )
         assert len(result) == 2
-        assert result[0]["vendor_id"] == "V1"
-
-    @patch.object(VisitModel, "scan", side_effect=Exception("Scan failed"))
-    def test_should_raise_if_scan_fails(self, mock_scan):
+        assert result[0]["visit_id"] == "2"
+
+    @pytest.mark.parametrize("since, until, expected", [
+        ("2025-11-01", "2025-11-30", "#0 BETWEEN :0 AND :1"),
+        ("2025-11-01", None, "#0 >= :0"),
+        (None, "2025-11-30", "#0 <= :0"),
+    ])
+    @patch.object(VisitModel, "vendor_index")
+    def test_should_bound_visit_datetime(self, mock_index, since, until, expected):
+        """✅ Traduce since/until a una condición sobre la llave de rango"""
+        mock_index.query.return_value = []
+
+        VisitModel.get_by_vendor("V1", since=since, until=until, limit=10)
+
+        kwargs = mock_index.query.call_args.kwargs
+        names, values = {}, {}
+        assert kwargs["range_key_condition"].serialize(names, values) == expected
+        assert names == {"visit_datetime": "#0"}
+        assert kwargs["limit"] == 10
+        if until:
+            # `until` incluye todas las visitas de ese día
+            assert values[":1" if since else ":0"]["S"] > "2025-11-30T23:59:59"
+
+    @patch.object(VisitModel, "vendor_index")
+    def test_should_raise_if_query_fails(self, mock_index):
+        mock_index.query.side_effect = Exception("Query failed")
         with pytest.raises(Exception):
             VisitModel.get_by_vendor("V1")
 
@@ -10,8 +10,7 @@ class TestCreateSalesPlanCommand:
 
     # ✅ Successful creation
     @patch.object(SalesPlanModel, "create")
-    @patch.object(SalesPlanModel, "find_existing_plan", return_value=None)
-    def test_execute_creates_sales_plan_successfully(self, mock_find, mock_create):
+    def test_execute_creates_sales_plan_successfully(self, mock_create):
         """✅ Should create a sales plan successfully"""
         mock_plan = MagicMock()
         mock_plan.to_dict.return_value = {
@@ -43,7 +42,6 @@ class TestCreateSalesPlanCommand:
         assert result["plan"]["period"] == "Q1-2025"
         assert len(result["plan"]["products"]) == 1
 
-        mock_find.assert_called_once_with("VENDOR-123", "Q1-2025")
         mock_create.assert_called_once()
 
     # 🚫 Missing vendor_id
@@ -104,10 +102,10 @@ class TestCreateSalesPlanCommand:
             command.execute()
 
     # 🚫 Duplicate plan for same period
-    @patch.object(SalesPlanModel, "find_existing_plan")
-    def test_duplicate_plan_same_period(self, mock_find):
+    @patch.object(SalesPlanModel, "create")
+    def test_duplicate_plan_same_period(self, mock_create):
         """❌ Should not allow duplicate plan for same vendor/period"""
-        mock_find.return_value = MagicMock()
+        mock_create.side_effect = ParamError("The vendor already has an active plan for this period.")
         body = {
             "vendor_id": "VENDOR-1",
             "period": "Q1-2025",
@@ -121,9 +119,8 @@ class TestCreateSalesPlanCommand:
             command.execute()
 
     # ⚡ Unexpected internal error
-    @patch.object(SalesPlanModel, "find_existing_plan", return_value=None)
     @patch.object(SalesPlanModel, "create", side_effect=Exception("DynamoDB failure"))
-    def test_unexpected_internal_error(self, mock_create, mock_find):
+    def test_unexpected_internal_error(self, mock_create):
         """❌ Should raise ApiError on unexpected failure"""
         body = {
             "vendor_id": "VENDOR-1",
@@ -2,44 +2,32 @@ import pytest
 from unittest.mock import patch
 from src.commands.view_report_vendor import ViewReportVendor
 from src.errors.errors import ApiError
-from collections import defaultdict
+from src.models.sales_plan import ProductTargetMap
 
 
 class TestViewReportVendorCommand:
     """🧪 Pruebas unitarias para ViewReportVendor"""
 
     # ✅ Caso exitoso con datos simulados
-    @patch("src.commands.view_report_vendor.SalesPlanModel.get_by_vendor")
-    @patch("src.commands.view_report_vendor.OrderModel.get_by_vendor")
-    def test_execute_exitoso(self, mock_get_orders, mock_get_plans):
+    @patch("src.commands.view_report_vendor.SalesPlanModel.iter_targets_by_vendor")
+    @patch("src.commands.view_report_vendor.VendorSalesRollupModel.get_summary")
+    def test_execute_exitoso(self, mock_get_summary, mock_get_plans):
         """✅ Genera correctamente el reporte del vendedor"""
         # --- Mock data ---
-        mock_get_plans.return_value = [
-            {
-                "vendor_id": "VENDOR-123",
-                "products": [
-                    {"product_id": "P-001", "target_units": 100, "target_value": 25000.0},
-                    {"product_id": "P-002", "target_units": 200, "target_value": 15000.0},
-                ],
-            }
-        ]
-        mock_get_orders.return_value = [
-            {
-                "id": "ORDER-1",
-                "id_client": "CLIENT-1",
-                "products": [
-                    {"id": "P-1001", "name": "Mouse", "amount": 2, "unit_price": 100},
-                    {"id": "P-2002", "name": "Keyboard", "amount": 1, "unit_price": 200},
-                ],
-            },
-            {
-                "id": "ORDER-2",
-                "id_client": "CLIENT-1",
-                "products": [
-                    {"id": "P-1001", "name": "Mouse", "amount": 1, "unit_price": 100},
-                ],
+        mock_get_plans.return_value = iter([
+            ProductTargetMap(product_id="P-001", name="A", target_units=100, target_value=25000.0),
+            ProductTargetMap(product_id="P-002", name="B", target_units=200, target_value=15000.0),
+        ])
+        mock_get_summary.return_value = {
+            "order_count": 2,
+            "customers": 1,
+            "total_units": 4,
+            "total_value": 500.0,
+            "products": {
+                "P-2002": {"name": "Keyboard", "units": 1, "value": 200.0},
+                "P-1001": {"name": "Mouse", "units": 3, "value": 300.0},
             },
-        ]
+        }
 
         # --- Ejecutar comando ---
         command = ViewReportVendor("VENDOR-123")
@@ -53,17 +41,23 @@ class TestViewReportVendorCommand:
         assert result["total_units_sold"] == 4  # 3 mouse + 1 keyboard
         assert result["total_sales"] == 500.0
         assert result["target_value"] == 40000.0
+        assert result["target_units"] == 300
         assert result["sales_percentage"] == pytest.approx(1.25, 0.01)  # 500 / 40000 * 100
-        assert len(result["sold_products"]) == 2
+        assert result["sold_products"] == [
+            {"id": "P-1001", "name": "Mouse", "quantity": 3},
+            {"id": "P-2002", "name": "Keyboard", "quantity": 1},
+        ]
 
         mock_get_plans.assert_called_once_with("VENDOR-123")
-        mock_get_orders.assert_called_once_with("VENDOR-123")
+        mock_get_summary.assert_called_once_with("VENDOR-123")
 
     # ⚠️ Caso sin planes ni órdenes
-    @patch("src.commands.view_report_vendor.SalesPlanModel.get_by_vendor", return_value=[])
-    @patch("src.commands.view_report_vendor.OrderModel.get_by_vendor", return_value=[])
-    def test_execute_sin_datos(self, mock_get_orders, mock_get_plans):
+    @patch("src.commands.view_report_vendor.SalesPlanModel.iter_targets_by_vendor", return_value=iter([]))
+    @patch("src.commands.view_report_vendor.VendorSalesRollupModel._get_connection")
+    def test_execute_sin_datos(self, mock_connection, mock_get_plans):
         """⚠️ Retorna métricas vacías si no hay datos"""
+        mock_connection.return_value.get_item.return_value = {}
+
         command = ViewReportVendor("VENDOR-999")
         result = command.execute()
 
@@ -74,7 +68,7 @@ class TestViewReportVendorCommand:
         assert result["sold_products"] == []
 
     # ❌ Error inesperado durante ejecución
-    @patch("src.commands.view_report_vendor.SalesPlanModel.get_by_vendor", side_effect=Exception("DB error"))
+    @patch("src.commands.view_report_vendor.SalesPlanModel.iter_targets_by_vendor", side_effect=Exception("DB error"))
     def test_execute_error_interno(self, mock_get_plans):
         """❌ Debe lanzar ApiError si ocurre un error inesperado"""
         command = ViewReportVendor("VENDOR-123")
@@ -82,3 +76,11 @@ class TestViewReportVendorCommand:
             command.execute()
 
         mock_get_plans.assert_called_once()
+
+    # ❌ Error al leer los acumulados
+    @patch("src.commands.view_report_vendor.SalesPlanModel.iter_targets_by_vendor", return_value=iter([]))
+    @patch("src.commands.view_report_vendor.VendorSalesRollupModel.get_summary", side_effect=Exception("DB error"))
+    def test_execute_error_acumulados(self, mock_get_summary, mock_get_plans):
+        """❌ Debe lanzar ApiError si falla la lectura de VendorSalesRollup"""
+        with pytest.raises(ApiError, match="Error while generating vendor report"):
+            ViewReportVendor("VENDOR-1").execute()
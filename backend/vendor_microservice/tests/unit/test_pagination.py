@@ -0,0 +1,41 @@
+import pytest
+from src.errors.errors import ParamError
+from src.utils.pagination import (
+    parse_limit, encode_cursor, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+)
+
+
+class TestPagination:
+    # ✅ limit por defecto
+    def test_parse_limit_por_defecto(self):
+        assert parse_limit(None) == DEFAULT_PAGE_SIZE
+        assert parse_limit("") == DEFAULT_PAGE_SIZE
+
+    # ✅ limit válido como string
+    def test_parse_limit_valido(self):
+        assert parse_limit("25") == 25
+
+    # 🚫 limit fuera de rango o no numérico
+    @pytest.mark.parametrize("value", ["0", "-1", str(MAX_PAGE_SIZE + 1), "abc"])
+    def test_parse_limit_invalido(self, value):
+        with pytest.raises(ParamError, match="limit"):
+            parse_limit(value)
+
+    # 🔁 El cursor es reversible
+    def test_cursor_ida_y_vuelta(self):
+        key = {"email": {"S": "a@example.com"}}
+        cursor = encode_cursor(key)
+
+        assert isinstance(cursor, str)
+        assert decode_cursor(cursor) == key
+
+    # ⚠️ Sin llave no hay cursor
+    def test_encode_cursor_vacio(self):
+        assert encode_cursor(None) is None
+        assert decode_cursor(None) is None
+
+    # 🚫 Cursor corrupto
+    @pytest.mark.parametrize("cursor", ["no-es-base64!!", encode_cursor({"a": 1})[:-4] + "####", "WzFd"])
+    def test_decode_cursor_invalido(self, cursor):
+        with pytest.raises(ParamError, match="cursor"):
+            decode_cursor(cursor)
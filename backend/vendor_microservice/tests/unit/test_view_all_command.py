@@ -1,7 +1,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from src.commands.view_all import GetAllVendors
-from src.errors.errors import ApiError
+from src.errors.errors import ApiError, ParamError
+from src.utils.pagination import encode_cursor
 from src.models.vendor import VendorModel
 
 
@@ -66,3 +67,35 @@ class TestGetAllVendorsCommand:
 
         nombres = [v["name"] for v in result]
         assert nombres == ["Ana", "Beatriz", "Carlos"]
+
+    # 📄 Caso paginado
+    @patch.object(VendorModel, "get_page")
+    def test_execute_paginado(self, mock_get_page):
+        """📄 Retorna una página de vendedores con next_cursor"""
+        last_key = {"email": {"S": "a@example.com"}}
+        mock_get_page.return_value = ([{"name": "Vendor A"}], last_key)
+
+        result = GetAllVendors(limit="1").execute()
+
+        assert result["items"] == [{"name": "Vendor A"}]
+        assert result["next_cursor"] == encode_cursor(last_key)
+        mock_get_page.assert_called_once_with(1, None)
+
+    # 🚫 Cursor inválido
+    def test_execute_cursor_invalido(self):
+        """🚫 Debe lanzar ParamError si el cursor no es válido"""
+        with pytest.raises(ParamError, match="cursor"):
+            GetAllVendors(cursor="###").execute()
+
+    # 📤 Exportación en streaming
+    @patch.object(VendorModel, "scan")
+    def test_stream_recorre_scan(self, mock_scan):
+        """📤 stream() debe emitir los vendedores sin construir una lista"""
+        mock_vendor = MagicMock()
+        mock_vendor.to_dict.return_value = {"name": "Vendor A"}
+        mock_scan.return_value = iter([mock_vendor])
+
+        result = GetAllVendors().stream()
+
+        assert not isinstance(result, list)
+        assert list(result) == [{"name": "Vendor A"}]
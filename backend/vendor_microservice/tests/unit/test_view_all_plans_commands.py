@@ -51,3 +51,15 @@ class TestGetAllSalesPlansCommand:
         with pytest.raises(ApiError, match="Custom API Error"):
             command.execute()
         mock_get_all.assert_called_once()
+
+    @patch.object(SalesPlanModel, "scan")
+    def test_stream_yields_plans_lazily(self, mock_scan):
+        """📤 stream() should yield plans without building a list"""
+        mock_plan = MagicMock()
+        mock_plan.to_dict.return_value = {"plan_id": "PLAN-1"}
+        mock_scan.return_value = iter([mock_plan])
+
+        result = GetAllSalesPlans().stream()
+
+        assert not isinstance(result, list)
+        assert list(result) == [{"plan_id": "PLAN-1"}]
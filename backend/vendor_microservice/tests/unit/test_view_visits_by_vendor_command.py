@@ -42,7 +42,7 @@ class TestListVisitsCommand:
 
         assert len(result) == 2
         assert result[0]["vendor_id"] == "VENDOR-01"
-        mock_get.assert_called_once_with("VENDOR-01")
+        mock_get.assert_called_once_with("VENDOR-01", since=None, until=None, limit=None)
 
     # ============================================
     # 🚫 vendor_id faltante
@@ -61,7 +61,31 @@ class TestListVisitsCommand:
         result = command.execute()
 
         assert result == []
-        mock_get.assert_called_once_with("VENDOR-01")
+        mock_get.assert_called_once_with("VENDOR-01", since=None, until=None, limit=None)
+
+    # ============================================
+    # 📅 Filtros de rango y límite
+    # ============================================
+    @patch.object(VisitModel, "get_by_vendor", return_value=[])
+    def test_filtros_rango_y_limite(self, mock_get):
+        ListVisits("VENDOR-01", since="2025-11-01", until="2025-11-30T23:00:00", limit="20").execute()
+
+        mock_get.assert_called_once_with(
+            "VENDOR-01", since="2025-11-01", until="2025-11-30T23:00:00", limit=20
+        )
+
+    @pytest.mark.parametrize("kwargs, message", [
+        ({"since": "ayer"}, "'since' debe estar en formato ISO 8601"),
+        ({"until": "11/30/2025"}, "'until' debe estar en formato ISO 8601"),
+        ({"since": "2025-12-01", "until": "2025-11-01"}, "'since' no puede ser posterior"),
+        ({"limit": "abc"}, "'limit' debe ser un número entero"),
+        ({"limit": "0"}, "'limit' debe estar entre 1 y 500"),
+    ])
+    @patch.object(VisitModel, "get_by_vendor")
+    def test_parametros_invalidos(self, mock_get, kwargs, message):
+        with pytest.raises(ParamError, match=message):
+            ListVisits("VENDOR-01", **kwargs).execute()
+        mock_get.assert_not_called()
 
     # ============================================
     # ⚡ Error interno al obtener visitas